@@ -10,6 +10,11 @@ from sqlalchemy import create_engine
 from alembic import context
 from app.models import user  
 from app.models import task
+from app.models import task_counter
+from app.models import change_version
+from app.models import task_tombstone
+from app.models import refresh_token
+from app.models import revoked_token
 
 
 # this is the Alembic Config object, which provides
@@ -64,6 +69,18 @@ def run_migrations_online() -> None:
     and associate a connection with the context.
 
     """
+    # Handed a connection by app.core.startup (in-process, at app start):
+    # migrate on it, inside the advisory lock it holds
+    connection = config.attributes.get("connection")
+    if connection is not None:
+        context.configure(
+            connection=connection, target_metadata=target_metadata
+        )
+
+        with context.begin_transaction():
+            context.run_migrations()
+        return
+
     connectable = create_engine(
         f"postgresql://{settings.DB_USER}:{settings.DB_PASSWORD}"
         f"@{settings.DB_HOST}:{settings.DB_PORT}/{settings.DB_NAME}"
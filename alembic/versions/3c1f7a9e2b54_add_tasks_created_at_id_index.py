@@ -0,0 +1,43 @@
+"""add tasks created_at id index
+
+Revision ID: 3c1f7a9e2b54
+Revises: 28959e726033
+Create Date: 2026-10-18 10:12:41.318207
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3c1f7a9e2b54'
+down_revision: Union[str, Sequence[str], None] = '28959e726033'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Backs keyset pagination on (created_at, id) for GET /tasks. Built
+    # CONCURRENTLY so the tasks table stays writable, outside the
+    # migration transaction.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_tasks_created_at_id',
+            'tasks',
+            ['created_at', 'id'],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_tasks_created_at_id',
+            table_name='tasks',
+            postgresql_concurrently=True,
+        )
@@ -0,0 +1,90 @@
+"""add task search indexes
+
+Revision ID: 5a9d3f0b7c12
+Revises: 8e4b2d6c1a07
+Create Date: 2026-10-18 12:27:53.871440
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5a9d3f0b7c12'
+down_revision: Union[str, Sequence[str], None] = '8e4b2d6c1a07'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    # Generated column: Postgres keeps it current on every insert/update.
+    # Adding it rewrites the table once.
+    op.add_column(
+        'tasks',
+        sa.Column(
+            'search_vector',
+            postgresql.TSVECTOR(),
+            sa.Computed(
+                "to_tsvector('english', "
+                "coalesce(title, '') || ' ' || coalesce(description, ''))",
+                persisted=True,
+            ),
+            nullable=True,
+        )
+    )
+
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_tasks_search_vector',
+            'tasks',
+            ['search_vector'],
+            unique=False,
+            postgresql_using='gin',
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_tasks_title_trgm',
+            'tasks',
+            ['title'],
+            unique=False,
+            postgresql_using='gin',
+            postgresql_ops={'title': 'gin_trgm_ops'},
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_tasks_description_trgm',
+            'tasks',
+            ['description'],
+            unique=False,
+            postgresql_using='gin',
+            postgresql_ops={'description': 'gin_trgm_ops'},
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_tasks_description_trgm',
+            table_name='tasks',
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            'ix_tasks_title_trgm',
+            table_name='tasks',
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            'ix_tasks_search_vector',
+            table_name='tasks',
+            postgresql_concurrently=True,
+        )
+    op.drop_column('tasks', 'search_vector')
+    # pg_trgm is left installed; other objects may depend on it
@@ -0,0 +1,83 @@
+"""add tasks filter indexes
+
+Revision ID: 8e4b2d6c1a07
+Revises: 3c1f7a9e2b54
+Create Date: 2026-10-18 11:02:19.604511
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8e4b2d6c1a07'
+down_revision: Union[str, Sequence[str], None] = '3c1f7a9e2b54'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Built CONCURRENTLY so large tasks tables stay writable; that cannot
+    # run inside the migration transaction, hence the autocommit block.
+    with op.get_context().autocommit_block():
+        # EMPLOYEE scope / assigned=me, newest first
+        op.create_index(
+            'ix_tasks_assigned_to_id_created_at_id',
+            'tasks',
+            ['assigned_to_id', 'created_at', 'id'],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        # EMPLOYEE scope / assigned=me combined with a status filter
+        op.create_index(
+            'ix_tasks_assigned_to_id_status_created_at_id',
+            'tasks',
+            ['assigned_to_id', 'status', 'created_at', 'id'],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        # ADMIN / MANAGER status filter
+        op.create_index(
+            'ix_tasks_status_created_at_id',
+            'tasks',
+            ['status', 'created_at', 'id'],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        # assigned=unassigned: only covers the (usually small) unassigned set
+        op.create_index(
+            'ix_tasks_unassigned_created_at_id',
+            'tasks',
+            ['created_at', 'id'],
+            unique=False,
+            postgresql_where=sa.text('assigned_to_id IS NULL'),
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_tasks_unassigned_created_at_id',
+            table_name='tasks',
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            'ix_tasks_status_created_at_id',
+            table_name='tasks',
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            'ix_tasks_assigned_to_id_status_created_at_id',
+            table_name='tasks',
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            'ix_tasks_assigned_to_id_created_at_id',
+            table_name='tasks',
+            postgresql_concurrently=True,
+        )
@@ -0,0 +1,49 @@
+"""create task counters table
+
+Revision ID: c7e2a4f9d318
+Revises: 5a9d3f0b7c12
+Create Date: 2026-10-18 14:41:06.218935
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c7e2a4f9d318'
+down_revision: Union[str, Sequence[str], None] = '5a9d3f0b7c12'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('task_counters',
+    sa.Column('dimension', sa.String(), nullable=False),
+    sa.Column('key', sa.String(), nullable=False),
+    sa.Column(
+        'status',
+        postgresql.ENUM(name='task_status_enum', create_type=False),
+        nullable=False
+    ),
+    sa.Column('count', sa.BigInteger(), nullable=False),
+    sa.PrimaryKeyConstraint('dimension', 'key', 'status')
+    )
+
+    # Backfill from existing tasks
+    op.execute(
+        "INSERT INTO task_counters (dimension, key, status, count) "
+        "SELECT 'assignee', coalesce(assigned_to_id::text, ''), status, count(*) "
+        "FROM tasks GROUP BY 2, 3 "
+        "UNION ALL "
+        "SELECT 'creator', created_by_id::text, status, count(*) "
+        "FROM tasks GROUP BY 2, 3"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('task_counters')
@@ -0,0 +1,75 @@
+"""add task delta sync index and tombstones
+
+Revision ID: d4f8a2c6e913
+Revises: 9b3e6d1f4a25
+Create Date: 2026-10-18 20:11:32.847120
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4f8a2c6e913'
+down_revision: Union[str, Sequence[str], None] = '9b3e6d1f4a25'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('task_tombstones',
+    sa.Column('id', sa.BigInteger(), autoincrement=True, nullable=False),
+    sa.Column('task_id', postgresql.UUID(as_uuid=True), nullable=False),
+    sa.Column('assigned_to_id', postgresql.UUID(as_uuid=True), nullable=True),
+    sa.Column('reason', sa.String(), nullable=False),
+    sa.Column(
+        'removed_at',
+        sa.DateTime(timezone=True),
+        server_default=sa.text('now()'),
+        nullable=False
+    ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(
+        'ix_task_tombstones_removed_at_task_id',
+        'task_tombstones',
+        ['removed_at', 'task_id'],
+        unique=False
+    )
+    op.create_index(
+        'ix_task_tombstones_assigned_to_id_removed_at_task_id',
+        'task_tombstones',
+        ['assigned_to_id', 'removed_at', 'task_id'],
+        unique=False
+    )
+
+    # CONCURRENTLY so large tasks tables stay writable (autocommit block,
+    # as in 8e4b2d6c1a07)
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_tasks_updated_at_id',
+            'tasks',
+            ['updated_at', 'id'],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_tasks_updated_at_id',
+            table_name='tasks',
+            postgresql_concurrently=True,
+        )
+    op.drop_index(
+        'ix_task_tombstones_assigned_to_id_removed_at_task_id',
+        table_name='task_tombstones'
+    )
+    op.drop_index('ix_task_tombstones_removed_at_task_id', table_name='task_tombstones')
+    op.drop_table('task_tombstones')
@@ -0,0 +1,54 @@
+"""
+Change versions per data scope (the change_versions table).
+
+Bumped inside the writing transaction, read with one small indexed query
+before a response is built, so unchanged data can be answered with 304
+without running the main query.
+"""
+from typing import Iterable
+
+from sqlalchemy import and_, func, or_, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.change_version import ChangeVersion
+
+TASKS = "tasks"
+USERS = "users"
+
+
+async def bump_versions(db: AsyncSession, kind: str, keys: Iterable[str]) -> None:
+    # One row per key rather than one global row, so writers on different
+    # assignees do not queue on the same row lock; sorted to keep the lock
+    # order consistent between concurrent writers
+    rows = [{"kind": kind, "key": key, "version": 1} for key in sorted(set(keys))]
+    if not rows:
+        return
+
+    stmt = insert(ChangeVersion).values(rows)
+    await db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[ChangeVersion.kind, ChangeVersion.key],
+            set_={"version": ChangeVersion.version + 1},
+        )
+    )
+
+
+async def read_versions(db: AsyncSession, scopes: dict[str, str | None]) -> dict[str, int]:
+    """
+    Current version of each requested kind. A key of None means every
+    key of that kind: versions only grow, so their sum changes whenever
+    any of them does.
+    """
+    conditions = [
+        ChangeVersion.kind == kind if key is None
+        else and_(ChangeVersion.kind == kind, ChangeVersion.key == key)
+        for kind, key in scopes.items()
+    ]
+    result = await db.execute(
+        select(ChangeVersion.kind, func.sum(ChangeVersion.version))
+        .where(or_(*conditions))
+        .group_by(ChangeVersion.kind)
+    )
+    versions = {kind: int(version) for kind, version in result}
+    return {kind: versions.get(kind, 0) for kind in scopes}
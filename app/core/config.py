@@ -7,9 +7,100 @@ class Settings(BaseSettings):
     DB_USER: str
     DB_PASSWORD: str
 
+    # Connection pool (per worker process)
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT_SECONDS: float = 30.0
+    DB_POOL_RECYCLE_SECONDS: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    DB_STATEMENT_TIMEOUT_MS: int = 30000
+
     JWT_SECRET_KEY: str
     JWT_ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    # Put the user's role in access tokens and trust it for authorization.
+    # Saves the principal lookup, except for users whose role / active flag
+    # changed within the token lifetime: their tokens are checked against
+    # the database until then.
+    JWT_EMBED_ROLE_CLAIMS: bool = False
+    # Token verification (app/core/tokens.py): "builtin" (HMAC on
+    # hashlib), "jose" or "pyjwt" (needs PyJWT installed); verified
+    # tokens are cached per process until they expire (0 disables)
+    JWT_BACKEND: str = "builtin"
+    TOKEN_CACHE_SIZE: int = 10000
+    # Refresh tokens (app/core/sessions.py): single use, each exchange
+    # issues the next one with a fresh lifetime
+    REFRESH_TOKEN_EXPIRE_DAYS: int = 14
+
+    # In-process cache of (id, role, is_active) used by get_current_user
+    PRINCIPAL_CACHE_SIZE: int = 10000
+    PRINCIPAL_CACHE_TTL_SECONDS: float = 60.0
+
+    # Dedicated bcrypt process pool; beyond MAX_PENDING queued hashes,
+    # login / signup answer 503 with Retry-After. 0 workers: no pool,
+    # bcrypt runs on the event loop's default thread pool
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_PENDING: int = 32
+    PASSWORD_HASH_RETRY_AFTER_SECONDS: int = 1
+
+    # Backend behind GET /tasks?q=: "ilike", "trigram" or "fulltext".
+    # ilike stays the default: at 1M tasks fulltext's p95 was ~100x worse
+    # (rare terms walk the created_at index instead of the GIN index) and
+    # trigram has not been measured yet
+    TASK_SEARCH_BACKEND: str = "ilike"
+
+    # Exact totals for GET /tasks?count=exact, cached per (filters, scope)
+    TASK_COUNT_CACHE_SIZE: int = 1000
+    TASK_COUNT_CACHE_TTL_SECONDS: float = 10.0
+
+    # Serialized GET /tasks responses: "memory" (per process), "redis"
+    # (shared, at RESPONSE_CACHE_URL) or "none"
+    RESPONSE_CACHE_BACKEND: str = "memory"
+    RESPONSE_CACHE_URL: str = "redis://localhost:6379/0"
+    RESPONSE_CACHE_SIZE: int = 1000
+    RESPONSE_CACHE_TTL_SECONDS: float = 60.0
+
+    # GET /tasks/events: per-stream queue bound, events kept per worker for
+    # Last-Event-ID resume, idle keepalive interval, client reconnect delay
+    TASK_EVENTS_QUEUE_SIZE: int = 100
+    TASK_EVENTS_BUFFER_SIZE: int = 1000
+    TASK_EVENTS_HEARTBEAT_SECONDS: float = 15.0
+    TASK_EVENTS_RETRY_MS: int = 3000
+
+    # GET /tasks/changes: watermarks stay behind the oldest open
+    # transaction of the app's database role, and at least this far
+    # behind now(). The lag alone covers writes made under other roles
+    # (see app/core/task_sync.py), so it must exceed their longest
+    # transaction. Tombstones (and so watermarks) are kept this long
+    TASK_CHANGES_SAFETY_LAG_SECONDS: float = 10.0
+    TASK_TOMBSTONE_RETENTION_DAYS: int = 30
+
+    # Instrumentation (app/core/instrumentation.py): per-route latency,
+    # per-request SQL counts / time, slow-query log and GET /metrics.
+    # Nothing is hooked in while disabled
+    METRICS_ENABLED: bool = False
+    # Statements at least this slow are logged as normalized SQL (0: off)
+    SLOW_QUERY_MS: float = 500.0
+    # With metrics on, requests sending "X-Server-Timing: 1" get a
+    # Server-Timing header (DB vs. total time); exposes timings to clients
+    SERVER_TIMING_ENABLED: bool = False
+
+    # Token-bucket admission control (app/core/rate_limit.py), per user
+    # (valid bearer token) or client IP: bursts of up to CAPACITY tokens,
+    # refilled at REFILL_PER_SECOND; login / search / exports cost more.
+    # Backend: "memory" (per process) or "redis" (shared, at RATE_LIMIT_URL)
+    RATE_LIMIT_ENABLED: bool = False
+    RATE_LIMIT_BACKEND: str = "memory"
+    RATE_LIMIT_URL: str = "redis://localhost:6379/0"
+    RATE_LIMIT_CAPACITY: float = 60.0
+    RATE_LIMIT_REFILL_PER_SECOND: float = 10.0
+
+    # Worker startup (app/core/startup.py): apply migrations in-process
+    # under an advisory lock, pre-open the pool and load the principals of
+    # users with live sessions, print per-step startup timings
+    RUN_MIGRATIONS: bool = False
+    STARTUP_WARMUP: bool = True
+    STARTUP_PROFILE: bool = False
 
     class Config:
         env_file = ".env"
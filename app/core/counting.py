@@ -0,0 +1,55 @@
+import json
+from typing import Hashable
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import ClauseElement, Executable
+
+from app.core.config import settings
+from app.core.ttl_cache import TTLCache
+
+# Exact totals keyed by (filters, role scope). Short-lived: flipping
+# through pages should not rerun the COUNT, but totals must not lag long.
+count_cache = TTLCache(
+    maxsize=settings.TASK_COUNT_CACHE_SIZE,
+    ttl=settings.TASK_COUNT_CACHE_TTL_SECONDS,
+)
+
+
+class _ExplainJSON(Executable, ClauseElement):
+    """EXPLAIN (FORMAT JSON) <select>, with the select's bind parameters."""
+
+    inherit_cache = False
+
+    def __init__(self, statement):
+        self.statement = statement
+
+
+@compiles(_ExplainJSON, "postgresql")
+def _compile_explain(element, compiler, **kw):
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.statement, **kw)
+
+
+async def exact_count(db: AsyncSession, query, cache_key: Hashable) -> int:
+    count = count_cache.get(cache_key)
+    if count is None:
+        result = await db.execute(
+            select(func.count()).select_from(query.order_by(None).subquery())
+        )
+        count = result.scalar_one()
+        count_cache.set(cache_key, count)
+    return count
+
+
+async def estimated_count(db: AsyncSession, query) -> int:
+    """
+    The planner's row estimate for `query`, from EXPLAIN without running
+    it. Cost is independent of the number of matching rows; accuracy is
+    that of the table statistics (ANALYZE).
+    """
+    result = await db.execute(_ExplainJSON(query.order_by(None)))
+    plan = result.scalar_one()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
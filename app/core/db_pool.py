@@ -0,0 +1,60 @@
+import time
+
+from sqlalchemy import event, exc
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from app.core.metrics import Histogram
+
+# Postgres SQLSTATE for "canceling statement due to statement timeout"
+QUERY_CANCELED = "57014"
+
+
+class PoolStats:
+    def __init__(self):
+        self.checkout_latency = Histogram()
+        self.checkout_timeouts = 0
+        self.statement_timeouts = 0
+
+
+pool_stats = PoolStats()
+
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    """
+    Queue pool that records how long callers wait for a connection and
+    how often they give up (pool_timeout).
+    """
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            pool_stats.checkout_timeouts += 1
+            raise
+        finally:
+            pool_stats.checkout_latency.observe(time.perf_counter() - start)
+        return connection
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    @event.listens_for(engine.sync_engine, "handle_error")
+    def _count_statement_timeouts(context) -> None:
+        original = context.original_exception
+        if getattr(original, "sqlstate", None) == QUERY_CANCELED:
+            pool_stats.statement_timeouts += 1
+
+
+def pool_status(engine: AsyncEngine) -> dict:
+    pool = engine.pool
+    return {
+        "size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "checked_in": pool.checkedin(),
+        # QueuePool counts from -pool_size while the pool is still filling
+        "overflow": max(pool.overflow(), 0),
+        "checkout_timeouts": pool_stats.checkout_timeouts,
+        "statement_timeouts": pool_stats.statement_timeouts,
+        "checkout_latency_seconds": pool_stats.checkout_latency.snapshot(),
+    }
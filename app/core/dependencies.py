@@ -1,38 +1,76 @@
-from fastapi import Depends, HTTPException, status
-from jose import jwt, JWTError
-from sqlalchemy.orm import Session
+from uuid import UUID
+
+from fastapi import Depends, HTTPException, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
+from app.core.principals import Principal, load_principal
+from app.core.revocation import claims_id, revocation_list
+from app.core.tokens import InvalidToken, verify_access_token
 from app.database import get_db
-from app.models.user import User
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 
 security = HTTPBearer()
+optional_security = HTTPBearer(auto_error=False)
 
 
-def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
-) -> User:
-    token = credentials.credentials
-
+async def principal_from_token(token: str, db: AsyncSession) -> Principal:
     try:
-        payload = jwt.decode(
-            token,
-            settings.JWT_SECRET_KEY,
-            algorithms=[settings.JWT_ALGORITHM],
-        )
+        payload = verify_access_token(token)
         user_id: str | None = payload.get("sub")
         if not user_id:
             raise HTTPException(status_code=401, detail="Invalid token")
-    except JWTError:
+        user_id = UUID(user_id)
+    except (InvalidToken, ValueError):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Could not validate token",
         )
 
-    user = db.query(User).filter(User.id == user_id).first()
-    if not user:
+    # In-memory denylist: no query, even for revoked tokens
+    if revocation_list.is_revoked(payload.get("sid"), payload.get("jti")):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token has been revoked",
+        )
+
+    # Role embedded at login: authorization needs no lookup at all, unless
+    # the role or active flag changed since the token may have been issued
+    role = payload.get("role")
+    if settings.JWT_EMBED_ROLE_CLAIMS and role and not revocation_list.is_revoked(claims_id(user_id)):
+        return Principal(id=user_id, role=role, is_active=True)
+
+    principal = await load_principal(db, user_id)
+    if not principal:
         raise HTTPException(status_code=404, detail="User not found")
 
-    return user
+    if not principal.is_active:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="User is inactive",
+        )
+
+    return principal
+
+
+async def get_current_user(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: AsyncSession = Depends(get_db)
+) -> Principal:
+    return await principal_from_token(credentials.credentials, db)
+
+
+async def get_stream_user(
+    credentials: HTTPAuthorizationCredentials | None = Depends(optional_security),
+    access_token: str | None = Query(None),
+    db: AsyncSession = Depends(get_db),
+) -> Principal:
+    # Browser EventSource cannot send headers, so streams also accept
+    # the token as ?access_token=
+    token = credentials.credentials if credentials else access_token
+    if not token:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Not authenticated",
+        )
+    return await principal_from_token(token, db)
@@ -0,0 +1,76 @@
+import csv
+import enum
+import io
+import json
+from datetime import datetime
+from uuid import UUID
+
+from app.models.task import Task
+from app.models.user import User
+
+# Rows fetched per server-side cursor round trip; also the unit of output
+EXPORT_BATCH_SIZE = 1000
+
+EXPORT_COLUMNS = (
+    Task.id,
+    Task.title,
+    Task.description,
+    Task.status,
+    Task.created_by_id,
+    Task.assigned_to_id,
+    User.email.label("assigned_to_email"),
+    User.full_name.label("assigned_to_name"),
+    Task.created_at,
+    Task.updated_at,
+)
+
+EXPORT_FIELDS = tuple(column.key for column in EXPORT_COLUMNS)
+
+EXPORT_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+
+def _plain(value):
+    # Cheap, explicit conversions instead of per-row Pydantic models
+    if value is None:
+        return value
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, str):
+        return value
+    if isinstance(value, UUID):
+        return str(value)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def encode_ndjson(rows) -> bytes:
+    lines = [
+        json.dumps(dict(zip(EXPORT_FIELDS, map(_plain, row))), ensure_ascii=False)
+        for row in rows
+    ]
+    lines.append("")
+    return "\n".join(lines).encode("utf-8")
+
+
+def encode_csv(rows, header: bool = False) -> bytes:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if header:
+        writer.writerow(EXPORT_FIELDS)
+    writer.writerows(
+        ["" if value is None else _plain(value) for value in row] for row in rows
+    )
+    return buffer.getvalue().encode("utf-8")
+
+
+async def stream_export(result, fmt: str):
+    """Encode a streamed (server-side cursor) result batch by batch."""
+    if fmt == "csv":
+        yield encode_csv((), header=True)
+
+    async for rows in result.partitions():
+        yield encode_csv(rows) if fmt == "csv" else encode_ndjson(rows)
@@ -0,0 +1,233 @@
+"""
+Request and SQL instrumentation, enabled by METRICS_ENABLED.
+
+RequestMetricsMiddleware times each HTTP request by route template and
+opens a RequestStats in a context variable; engine event hooks add every
+statement's count and duration to it (and to process-wide totals), and
+log slow statements as normalized SQL. GET /metrics renders everything
+in the Prometheus text format.
+
+While disabled neither the middleware nor the hooks are installed, so
+requests and statements run exactly as before.
+"""
+import logging
+import re
+import time
+from contextvars import ContextVar
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.datastructures import MutableHeaders
+
+from app.core.config import settings
+from app.core.counting import count_cache
+from app.core.db_pool import pool_stats
+from app.core.metrics import Histogram, LabeledHistogram, PrometheusText
+from app.core.principals import principal_cache
+from app.core.response_cache import MemoryResponseCache, get_response_cache
+from app.core.task_events import task_event_broker
+
+logger = logging.getLogger("app.sql")
+
+# Requests nobody routed (404s, CORS preflights): one label, not one per path
+UNMATCHED = "unmatched"
+
+STATEMENT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+
+class RequestStats:
+    """SQL work done on behalf of one request."""
+
+    __slots__ = ("scope", "statements", "db_seconds")
+
+    def __init__(self, scope):
+        self.scope = scope
+        self.statements = 0
+        self.db_seconds = 0.0
+
+    @property
+    def route(self) -> str:
+        # FastAPI stores the matched route in the (shared) scope
+        route = self.scope.get("route")
+        return getattr(route, "path", None) or UNMATCHED
+
+    def server_timing(self, total_seconds: float) -> str:
+        return (
+            f'db;dur={self.db_seconds * 1000:.1f};desc="{self.statements} queries", '
+            f"total;dur={total_seconds * 1000:.1f}"
+        )
+
+
+_request_stats: ContextVar[RequestStats | None] = ContextVar("request_stats", default=None)
+
+
+class Metrics:
+    def __init__(self):
+        self.request_latency = LabeledHistogram(("method", "route", "status"))
+        self.request_statements = LabeledHistogram(("method", "route"), STATEMENT_BUCKETS)
+        self.request_db_time = LabeledHistogram(("method", "route"))
+        self.statement_latency = Histogram()
+        self.slow_statements = 0
+
+
+metrics = Metrics()
+
+
+_PLACEHOLDER = re.compile(r"\$\d+|%\(\w+\)s|\?")
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"(?<![\w$.])\d+(?:\.\d+)?\b")
+_LIST = re.compile(r"\(\?(?:, \?)+\)")
+_ROWS = re.compile(r"(\(\.\.\.\))(?:, \(\.\.\.\))+")
+_SPACE = re.compile(r"\s+")
+
+
+def normalize_sql(statement: str) -> str:
+    """
+    Statement text with literals and placeholders as "?" and lists as
+    "(...)", so one query shape reads the same however it was called.
+    """
+    sql = _SPACE.sub(" ", statement).strip()
+    sql = _STRING.sub("?", sql)
+    sql = _PLACEHOLDER.sub("?", sql)
+    sql = _NUMBER.sub("?", sql)
+    sql = _LIST.sub("(...)", sql)
+    return _ROWS.sub(r"\1, ...", sql)
+
+
+def instrument_queries(engine: AsyncEngine) -> None:
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def _start(conn, cursor, statement, parameters, context, executemany) -> None:
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine.sync_engine, "after_cursor_execute")
+    def _finish(conn, cursor, statement, parameters, context, executemany) -> None:
+        elapsed = time.perf_counter() - conn.info["query_start"].pop()
+        metrics.statement_latency.observe(elapsed)
+
+        stats = _request_stats.get()
+        if stats is not None:
+            stats.statements += 1
+            stats.db_seconds += elapsed
+
+        if settings.SLOW_QUERY_MS and elapsed * 1000 >= settings.SLOW_QUERY_MS:
+            metrics.slow_statements += 1
+            logger.warning(
+                "slow query %.1f ms (%s): %s",
+                elapsed * 1000,
+                stats.route if stats is not None else "-",
+                normalize_sql(statement),
+            )
+
+    @event.listens_for(engine.sync_engine, "handle_error")
+    def _failed(context) -> None:
+        # after_cursor_execute does not run for a failed statement
+        starts = context.connection.info.get("query_start") if context.connection else None
+        if starts:
+            starts.pop()
+
+
+class RequestMetricsMiddleware:
+    """Pure ASGI (no extra task per request, streaming untouched)."""
+
+    def __init__(self, app, server_timing: bool = False):
+        self.app = app
+        self.server_timing = server_timing
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        stats = RequestStats(scope)
+        token = _request_stats.set(stats)
+        status_code = 500
+        timing = self.server_timing and (b"x-server-timing", b"1") in scope["headers"]
+
+        async def send_with_metrics(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                if timing:
+                    MutableHeaders(scope=message).append(
+                        "Server-Timing", stats.server_timing(time.perf_counter() - start)
+                    )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_metrics)
+        finally:
+            _request_stats.reset(token)
+            elapsed = time.perf_counter() - start
+            route = stats.route
+            method = scope["method"]
+            metrics.request_latency.observe((method, route, str(status_code)), elapsed)
+            metrics.request_statements.observe((method, route), stats.statements)
+            metrics.request_db_time.observe((method, route), stats.db_seconds)
+
+
+def _cache_gauges(text: PrometheusText, cache: str, stats: dict) -> None:
+    labels = {"cache": cache}
+    text.gauge("cache_entries", "Entries held by an in-process cache.", stats["size"], labels)
+    text.gauge("cache_max_entries", "Capacity of an in-process cache.", stats["maxsize"], labels)
+    text.counter("cache_hits_total", "In-process cache hits.", stats["hits"], labels)
+    text.counter("cache_misses_total", "In-process cache misses.", stats["misses"], labels)
+
+
+def render_metrics(engine: AsyncEngine) -> str:
+    text = PrometheusText()
+
+    for labels, snapshot in metrics.request_latency.snapshots():
+        text.histogram(
+            "http_request_duration_seconds", "HTTP request latency by route template.",
+            snapshot, labels,
+        )
+    for labels, snapshot in metrics.request_statements.snapshots():
+        text.histogram(
+            "http_request_db_statements", "SQL statements executed per HTTP request.",
+            snapshot, labels,
+        )
+    for labels, snapshot in metrics.request_db_time.snapshots():
+        text.histogram(
+            "http_request_db_seconds", "Time spent in SQL statements per HTTP request.",
+            snapshot, labels,
+        )
+
+    text.histogram(
+        "db_statement_duration_seconds", "SQL statement latency.",
+        metrics.statement_latency.snapshot(),
+    )
+    text.counter(
+        "db_slow_statements_total", "SQL statements slower than SLOW_QUERY_MS.",
+        metrics.slow_statements,
+    )
+
+    pool = engine.pool
+    text.gauge("db_pool_size", "Connections the pool keeps open.", pool.size())
+    text.gauge("db_pool_checked_out", "Connections currently in use.", pool.checkedout())
+    text.gauge("db_pool_checked_in", "Idle connections in the pool.", pool.checkedin())
+    text.gauge("db_pool_overflow", "Connections open beyond the pool size.", max(pool.overflow(), 0))
+    text.counter(
+        "db_pool_checkout_timeouts_total", "Checkouts that gave up after pool_timeout.",
+        pool_stats.checkout_timeouts,
+    )
+    text.counter(
+        "db_statement_timeouts_total", "Statements cancelled by statement_timeout.",
+        pool_stats.statement_timeouts,
+    )
+    text.histogram(
+        "db_pool_checkout_seconds", "Time spent waiting for a pooled connection.",
+        pool_stats.checkout_latency.snapshot(),
+    )
+
+    _cache_gauges(text, "principals", principal_cache.stats())
+    _cache_gauges(text, "task_counts", count_cache.stats())
+    response_cache = get_response_cache()
+    if isinstance(response_cache, MemoryResponseCache):
+        _cache_gauges(text, "responses", response_cache.entries.stats())
+
+    text.gauge(
+        "task_event_subscribers", "Open GET /tasks/events streams.",
+        len(task_event_broker.subscribers),
+    )
+    return text.render()
@@ -1,15 +1,24 @@
+import secrets
 from datetime import datetime, timedelta
 from jose import jwt
 from app.core.config import settings
 
-def create_access_token(subject: str) -> str:
+def create_access_token(
+    subject: str, role: str | None = None, session_id: str | None = None
+) -> str:
     expire = datetime.utcnow() + timedelta(
         minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES
     )
     payload = {
         "sub": subject,
-        "exp": expire
+        "exp": expire,
+        # Revocable individually (jti) or with their session (sid)
+        "jti": secrets.token_urlsafe(12),
     }
+    if session_id:
+        payload["sid"] = session_id
+    if role and settings.JWT_EMBED_ROLE_CLAIMS:
+        payload["role"] = role
     return jwt.encode(
         payload,
         settings.JWT_SECRET_KEY,
@@ -0,0 +1,29 @@
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
+
+from app.models.task import Task
+
+# TaskResponse embeds the assignee, so every task query that feeds a
+# response must pull `assigned_to` in the same round trip. Otherwise each
+# row fires its own lazy SELECT on users (N+1), and under AsyncSession an
+# implicit lazy load raises MissingGreenlet outright.
+TASK_RESPONSE_OPTIONS = (joinedload(Task.assigned_to),)
+
+
+def task_select():
+    return select(Task).options(*TASK_RESPONSE_OPTIONS)
+
+
+async def load_task(db: AsyncSession, task_id: UUID) -> Task | None:
+    # populate_existing refreshes an instance already in the identity map
+    # (e.g. after a commit) together with its assignee in one query,
+    # replacing db.refresh() + a lazy load.
+    result = await db.execute(
+        task_select()
+        .where(Task.id == task_id)
+        .execution_options(populate_existing=True)
+    )
+    return result.scalars().first()
@@ -0,0 +1,107 @@
+import threading
+from bisect import bisect_left
+
+# Seconds; tuned for DB waits and request latencies alike
+DEFAULT_LATENCY_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+
+class Histogram:
+    """Fixed-bucket histogram with Prometheus-style cumulative snapshots."""
+
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_LATENCY_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self._counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            self._counts[index] += 1
+            self.count += 1
+            self.sum += value
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            counts = list(self._counts)
+            total, total_sum = self.count, self.sum
+
+        cumulative = {}
+        running = 0
+        for bound, bucket_count in zip(self.buckets, counts):
+            running += bucket_count
+            cumulative[str(bound)] = running
+        cumulative["+Inf"] = total
+
+        return {"buckets": cumulative, "count": total, "sum": total_sum}
+
+
+class LabeledHistogram:
+    """One Histogram per label combination, created on first use."""
+
+    def __init__(self, label_names: tuple[str, ...], buckets: tuple[float, ...] = DEFAULT_LATENCY_BUCKETS):
+        self.label_names = label_names
+        self.buckets = buckets
+        self._children: dict[tuple[str, ...], Histogram] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, labels: tuple[str, ...], value: float) -> None:
+        child = self._children.get(labels)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(labels, Histogram(self.buckets))
+        child.observe(value)
+
+    def snapshots(self):
+        with self._lock:
+            children = list(self._children.items())
+        for labels, child in children:
+            yield dict(zip(self.label_names, labels)), child.snapshot()
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: dict | None) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + "}"
+
+
+class PrometheusText:
+    """Builds a scrape in the Prometheus text exposition format (0.0.4)."""
+
+    CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+    def __init__(self):
+        self._lines: list[str] = []
+        self._declared: set[str] = set()
+
+    def _declare(self, name: str, kind: str, help_text: str) -> None:
+        if name not in self._declared:
+            self._declared.add(name)
+            self._lines.append(f"# HELP {name} {help_text}")
+            self._lines.append(f"# TYPE {name} {kind}")
+
+    def counter(self, name: str, help_text: str, value: float, labels: dict | None = None) -> None:
+        self._declare(name, "counter", help_text)
+        self._lines.append(f"{name}{_format_labels(labels)} {value}")
+
+    def gauge(self, name: str, help_text: str, value: float, labels: dict | None = None) -> None:
+        self._declare(name, "gauge", help_text)
+        self._lines.append(f"{name}{_format_labels(labels)} {value}")
+
+    def histogram(self, name: str, help_text: str, snapshot: dict, labels: dict | None = None) -> None:
+        self._declare(name, "histogram", help_text)
+        labels = labels or {}
+        for bound, count in snapshot["buckets"].items():
+            self._lines.append(f"{name}_bucket{_format_labels({**labels, 'le': bound})} {count}")
+        self._lines.append(f"{name}_sum{_format_labels(labels)} {snapshot['sum']}")
+        self._lines.append(f"{name}_count{_format_labels(labels)} {snapshot['count']}")
+
+    def render(self) -> str:
+        return "\n".join(self._lines) + "\n"
@@ -0,0 +1,49 @@
+import base64
+import json
+from datetime import datetime
+from uuid import UUID
+
+
+def _encode(values: list) -> str:
+    raw = json.dumps(values)
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def _decode(token: str) -> list:
+    padded = token + "=" * (-len(token) % 4)
+    return json.loads(base64.urlsafe_b64decode(padded))
+
+
+def encode_cursor(created_at: datetime, task_id: UUID) -> str:
+    return _encode([created_at.isoformat(), str(task_id)])
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, UUID]:
+    """
+    Decode an opaque keyset cursor back into (created_at, id).
+
+    Raises ValueError for anything that was not produced by encode_cursor.
+    """
+    try:
+        created_at, task_id = _decode(cursor)
+        return datetime.fromisoformat(created_at), UUID(task_id)
+    except (TypeError, ValueError) as exc:
+        raise ValueError("Invalid cursor") from exc
+
+
+def encode_watermark(changed_at: datetime, task_id: UUID, issued_at: datetime) -> str:
+    return _encode([changed_at.isoformat(), str(task_id), issued_at.isoformat()])
+
+
+def decode_watermark(watermark: str) -> tuple[tuple[datetime, UUID], datetime]:
+    """
+    Decode a delta sync watermark into ((changed_at, id), issued_at).
+
+    Raises ValueError for anything that was not produced by encode_watermark.
+    """
+    try:
+        changed_at, task_id, issued_at = _decode(watermark)
+        position = (datetime.fromisoformat(changed_at), UUID(task_id))
+        return position, datetime.fromisoformat(issued_at)
+    except (TypeError, ValueError) as exc:
+        raise ValueError("Invalid watermark") from exc
@@ -1,12 +1,12 @@
 from fastapi import Depends, HTTPException, status
-from app.models.user import User
 from app.core.dependencies import get_current_user
+from app.core.principals import Principal
 
 
 def require_roles(*allowed_roles: str):
-    def role_checker(
-        current_user: User = Depends(get_current_user)
-    ) -> User:
+    async def role_checker(
+        current_user: Principal = Depends(get_current_user)
+    ) -> Principal:
         if current_user.role not in allowed_roles:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
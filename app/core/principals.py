@@ -0,0 +1,129 @@
+from dataclasses import dataclass
+from uuid import UUID
+
+from sqlalchemy import event, func, inspect, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, object_session
+
+from app.core.config import settings
+from app.core.revocation import claims_id, revocation_list, revoke_claims
+from app.core.ttl_cache import TTLCache
+from app.models.refresh_token import RefreshToken
+from app.models.user import User
+
+
+@dataclass(frozen=True, slots=True)
+class Principal:
+    """The authenticated caller: only what authorization decisions need."""
+
+    id: UUID
+    role: str
+    is_active: bool
+
+
+# Per-process cache of principals keyed by user id. A role / active flag
+# change made through the ORM drops the entry when it commits: at once in
+# the writing process, through the revocation listener (the user's
+# claims are revoked) in the others. The TTL bounds staleness for changes
+# made outside the ORM.
+principal_cache = TTLCache(
+    maxsize=settings.PRINCIPAL_CACHE_SIZE,
+    ttl=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+)
+
+
+def principal_from_user(user: User) -> Principal:
+    # is_active is nullable in the schema; only an explicit False disables
+    return Principal(id=user.id, role=user.role, is_active=user.is_active is not False)
+
+
+async def load_principal(db: AsyncSession, user_id: UUID) -> Principal | None:
+    principal = principal_cache.get(user_id)
+    if principal is not None:
+        return principal
+
+    result = await db.execute(
+        select(User.id, User.role, User.is_active).where(User.id == user_id)
+    )
+    row = result.first()
+    if row is None:
+        return None
+
+    principal = principal_from_user(row)
+    principal_cache.set(user_id, principal)
+    return principal
+
+
+async def warm_principal_cache(db: AsyncSession, limit: int) -> int:
+    """
+    Cache the principals of users holding a live refresh token, latest
+    login first: the callers likely to be back soon. Returns the count.
+    """
+    sessions = (
+        select(RefreshToken.user_id, func.max(RefreshToken.created_at).label("last_seen"))
+        .where(
+            RefreshToken.used_at.is_(None),
+            RefreshToken.revoked_at.is_(None),
+            RefreshToken.expires_at > func.now(),
+        )
+        .group_by(RefreshToken.user_id)
+        .subquery()
+    )
+    result = await db.execute(
+        select(User.id, User.role, User.is_active)
+        .join(sessions, sessions.c.user_id == User.id)
+        .order_by(sessions.c.last_seen.desc())
+        .limit(limit)
+    )
+    rows = result.all()
+    for row in rows:
+        principal_cache.set(row.id, principal_from_user(row))
+    return len(rows)
+
+
+def invalidate_principal(user_id: UUID) -> None:
+    principal_cache.pop(user_id)
+
+
+# Session.info key: ids of users whose principal changed in a flush of the
+# current transaction, with the expiry of their claims revocation
+_PENDING_KEY = "invalidated_principals"
+
+
+def _invalidate_after_commit(connection, target: User) -> None:
+    # Dropping the entry at flush is not enough: until the commit, other
+    # sessions still read the old row and would cache it again
+    invalidate_principal(target.id)
+    # Other workers, and tokens embedding the old role, once committed
+    expires_at = revoke_claims(connection, target.id)
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault(_PENDING_KEY, {})[target.id] = expires_at
+
+
+@event.listens_for(User, "after_update")
+def _invalidate_on_update(mapper, connection, target: User) -> None:
+    state = inspect(target)
+    if (
+        state.attrs.role.history.has_changes()
+        or state.attrs.is_active.history.has_changes()
+    ):
+        _invalidate_after_commit(connection, target)
+
+
+@event.listens_for(User, "after_delete")
+def _invalidate_on_delete(mapper, connection, target: User) -> None:
+    _invalidate_after_commit(connection, target)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed(session: Session) -> None:
+    for user_id, expires_at in session.info.pop(_PENDING_KEY, {}).items():
+        invalidate_principal(user_id)
+        # This worker at once; the others when the notification arrives
+        revocation_list.add(claims_id(user_id), expires_at)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_rolled_back(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
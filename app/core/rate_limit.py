@@ -0,0 +1,232 @@
+"""
+Admission control: token buckets per caller, enabled by RATE_LIMIT_ENABLED.
+
+Each caller has a bucket of RATE_LIMIT_CAPACITY tokens refilled at
+RATE_LIMIT_REFILL_PER_SECOND. Callers are keyed by the user id of a
+valid bearer token (checked through the token cache, no query), or else
+by client IP. Behind a proxy, run uvicorn with --proxy-headers so that
+IP is the real client's. Requests cost 1 token, more for expensive
+routes (request_cost). A request the bucket cannot pay for gets a 429
+with Retry-After.
+
+Backends (RATE_LIMIT_BACKEND): "memory" (per process) or "redis"
+(shared by every worker, at RATE_LIMIT_URL; any Redis-compatible server
+with Lua scripting).
+"""
+import math
+import re
+import time
+from collections import OrderedDict
+
+import redis.asyncio
+from fastapi.responses import JSONResponse
+from redis.exceptions import RedisError
+
+from app.core.config import settings
+from app.core.tokens import InvalidToken, verify_access_token
+
+# Tokens per request where it is not the default of 1
+ROUTE_COSTS = {
+    ("POST", "/auth/login"): 10,  # bcrypt
+    ("POST", "/users"): 10,  # bcrypt
+    ("POST", "/auth/refresh"): 2,
+    ("POST", "/tasks/import"): 20,
+    ("GET", "/tasks/export"): 10,
+    ("POST", "/tasks/batch"): 5,
+    ("PATCH", "/tasks/batch/status"): 5,
+    ("PATCH", "/tasks/batch/assign"): 5,
+}
+# GET /tasks: searches cost SEARCH_COST; offset pages past DEEP_PAGE add
+# one token per further DEEP_PAGE pages
+SEARCH_COST = 5
+DEEP_PAGE = 10
+
+# Cheap, and must keep answering while a client is throttled
+EXEMPT_PATHS = frozenset({"/health", "/health/pool", "/metrics"})
+
+
+_SEARCH = re.compile(rb"(?:^|&)q=[^&]")
+_PAGE = re.compile(rb"(?:^|&)page=(\d+)")
+
+
+def request_cost(method: str, path: str, query_string: bytes) -> int:
+    route = path.rstrip("/") or "/"
+    if route == "/tasks" and method == "GET" and query_string:
+        # Byte regexes: parse_qsl would cost more than the limiter itself
+        cost = SEARCH_COST if _SEARCH.search(query_string) else 1
+        page = _PAGE.search(query_string)
+        if page and int(page[1]) > DEEP_PAGE:
+            cost += int(page[1]) // DEEP_PAGE
+        return cost
+    return ROUTE_COSTS.get((method, route), 1)
+
+
+def client_key(scope) -> str:
+    for name, value in scope["headers"]:
+        if name == b"authorization":
+            scheme, _, token = value.decode("latin-1").partition(" ")
+            if scheme.lower() == "bearer" and token:
+                try:
+                    subject = verify_access_token(token).get("sub")
+                except InvalidToken:
+                    break
+                if subject:
+                    return f"user:{subject}"
+            break
+    client = scope.get("client")
+    return f"ip:{client[0] if client else 'unknown'}"
+
+
+class RateLimiter:
+    """Backend interface: take `cost` tokens from `key`'s bucket."""
+
+    name: str = ""
+
+    def __init__(self, capacity: float, refill_per_second: float):
+        self.capacity = capacity
+        self.rate = refill_per_second
+
+    async def acquire(self, key: str, cost: float) -> float:
+        """0 if allowed, else seconds until the bucket could pay `cost`."""
+        raise NotImplementedError
+
+    async def close(self) -> None:
+        pass
+
+
+class MemoryRateLimiter(RateLimiter):
+    """
+    Buckets in an LRU OrderedDict: [tokens, last update]. Only touched
+    from the event loop, so no lock. Past `maxsize` keys the least
+    recently seen bucket is dropped; a caller seen again starts full.
+    """
+
+    name = "memory"
+
+    def __init__(self, capacity: float, refill_per_second: float, maxsize: int = 100_000):
+        super().__init__(capacity, refill_per_second)
+        self.maxsize = maxsize
+        self.buckets: OrderedDict[str, list[float]] = OrderedDict()
+
+    async def acquire(self, key: str, cost: float) -> float:
+        now = time.monotonic()
+        bucket = self.buckets.get(key)
+        if bucket is None:
+            if len(self.buckets) >= self.maxsize:
+                self.buckets.popitem(last=False)
+            bucket = self.buckets[key] = [self.capacity, now]
+        else:
+            self.buckets.move_to_end(key)
+
+        tokens = min(self.capacity, bucket[0] + (now - bucket[1]) * self.rate)
+        bucket[1] = now
+        cost = min(cost, self.capacity)
+        if tokens >= cost:
+            bucket[0] = tokens - cost
+            return 0.0
+        bucket[0] = tokens
+        return (cost - tokens) / self.rate
+
+
+# Atomic refill-and-take on the server, timed by the server's clock so
+# workers' clocks need not agree. Returns the wait in seconds as a string
+# (Lua numbers would be truncated to integers in the reply).
+TOKEN_BUCKET_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local cost = math.min(tonumber(ARGV[3]), capacity)
+local time = redis.call('TIME')
+local now = tonumber(time[1]) + tonumber(time[2]) / 1000000
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(bucket[1]) or capacity
+local ts = tonumber(bucket[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+local wait = 0
+if tokens >= cost then
+    tokens = tokens - cost
+else
+    wait = (cost - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('PEXPIRE', KEYS[1], math.ceil(capacity / rate * 1000) + 1000)
+return tostring(wait)
+"""
+
+
+class RedisRateLimiter(RateLimiter):
+    """
+    Shared buckets, one hash per key, expiring once full again. Any client
+    with the redis.asyncio register_script / aclose interface works.
+
+    A Redis outage lets requests through rather than failing them.
+    """
+
+    name = "redis"
+
+    def __init__(self, client, capacity: float, refill_per_second: float, prefix: str = "flowtrack:ratelimit:"):
+        super().__init__(capacity, refill_per_second)
+        self.client = client
+        self.prefix = prefix
+        self.script = client.register_script(TOKEN_BUCKET_SCRIPT)
+
+    @classmethod
+    def from_url(cls, url: str, capacity: float, refill_per_second: float) -> "RedisRateLimiter":
+        return cls(redis.asyncio.Redis.from_url(url), capacity, refill_per_second)
+
+    async def acquire(self, key: str, cost: float) -> float:
+        try:
+            wait = await self.script(keys=[self.prefix + key], args=[self.capacity, self.rate, cost])
+        except RedisError:
+            return 0.0
+        return float(wait)
+
+    async def close(self) -> None:
+        await self.client.aclose()
+
+
+_rate_limiter: RateLimiter | None = None
+
+
+def get_rate_limiter() -> RateLimiter:
+    global _rate_limiter
+    if _rate_limiter is None:
+        backend = settings.RATE_LIMIT_BACKEND
+        capacity, rate = settings.RATE_LIMIT_CAPACITY, settings.RATE_LIMIT_REFILL_PER_SECOND
+        if backend == "memory":
+            _rate_limiter = MemoryRateLimiter(capacity, rate)
+        elif backend == "redis":
+            _rate_limiter = RedisRateLimiter.from_url(settings.RATE_LIMIT_URL, capacity, rate)
+        else:
+            raise ValueError(f"Unknown rate limit backend: {backend}")
+    return _rate_limiter
+
+
+async def close_rate_limiter() -> None:
+    global _rate_limiter
+    if _rate_limiter is not None:
+        await _rate_limiter.close()
+        _rate_limiter = None
+
+
+class RateLimitMiddleware:
+    """Pure ASGI; sits inside CORS so 429s stay readable by browsers."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] == "OPTIONS" or scope["path"] in EXEMPT_PATHS:
+            await self.app(scope, receive, send)
+            return
+
+        cost = request_cost(scope["method"], scope["path"], scope["query_string"])
+        wait = await get_rate_limiter().acquire(client_key(scope), cost)
+        if wait > 0:
+            response = JSONResponse(
+                {"detail": "Too many requests"},
+                status_code=429,
+                headers={"Retry-After": str(max(1, math.ceil(wait)))},
+            )
+            await response(scope, receive, send)
+            return
+        await self.app(scope, receive, send)
@@ -0,0 +1,136 @@
+"""
+Cache of serialized list responses.
+
+Keys combine the normalized request parameters, the RBAC scope and the
+change versions (app/core/change_versions.py) the response was built
+from. Writes bump versions instead of deleting keys: stale entries are
+simply never asked for again and age out through TTL / LRU eviction.
+"""
+import hashlib
+import json
+import math
+
+import redis.asyncio
+from fastapi import Response
+from redis.exceptions import RedisError
+
+from app.core.config import settings
+from app.core.ttl_cache import TTLCache
+
+
+def cache_key(*parts) -> str:
+    digest = hashlib.blake2b(
+        "\x1f".join(str(part) for part in parts).encode("utf-8"), digest_size=16
+    ).hexdigest()
+    return f"{parts[0]}:{digest}"
+
+
+def encode_entry(headers: dict[str, str], body: bytes) -> bytes:
+    # One JSON line of response headers, then the body as-is
+    return json.dumps(headers).encode("utf-8") + b"\n" + body
+
+
+def decode_entry(entry: bytes) -> tuple[dict[str, str], bytes]:
+    headers, _, body = entry.partition(b"\n")
+    return json.loads(headers), body
+
+
+def json_response(body: bytes, headers: dict[str, str]) -> Response:
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+class ResponseCache:
+    """Backend interface: opaque bytes in, opaque bytes out."""
+
+    name: str = ""
+
+    async def get(self, key: str) -> bytes | None:
+        raise NotImplementedError
+
+    async def set(self, key: str, value: bytes) -> None:
+        raise NotImplementedError
+
+    async def close(self) -> None:
+        pass
+
+
+class MemoryResponseCache(ResponseCache):
+    """Per-process LRU bounded by entry count, entries expire after `ttl`."""
+
+    name = "memory"
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.entries = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    async def get(self, key: str) -> bytes | None:
+        return self.entries.get(key)
+
+    async def set(self, key: str, value: bytes) -> None:
+        self.entries.set(key, value)
+
+
+class RedisResponseCache(ResponseCache):
+    """
+    Shared across workers. Entries expire after `ttl`; size is bounded by
+    the server (maxmemory with an allkeys-lru policy). Any client with the
+    redis.asyncio get / set / aclose interface works.
+
+    A cache outage degrades to misses rather than failing requests.
+    """
+
+    name = "redis"
+
+    def __init__(self, client, ttl: float, prefix: str = "flowtrack:response:"):
+        self.client = client
+        self.ttl = max(1, math.ceil(ttl))
+        self.prefix = prefix
+
+    @classmethod
+    def from_url(cls, url: str, ttl: float) -> "RedisResponseCache":
+        return cls(redis.asyncio.Redis.from_url(url), ttl)
+
+    async def get(self, key: str) -> bytes | None:
+        try:
+            return await self.client.get(self.prefix + key)
+        except RedisError:
+            return None
+
+    async def set(self, key: str, value: bytes) -> None:
+        try:
+            await self.client.set(self.prefix + key, value, ex=self.ttl)
+        except RedisError:
+            pass
+
+    async def close(self) -> None:
+        await self.client.aclose()
+
+
+_response_cache: ResponseCache | None = None
+
+
+def get_response_cache() -> ResponseCache | None:
+    """The configured backend, or None when RESPONSE_CACHE_BACKEND is "none"."""
+    global _response_cache
+    if _response_cache is None:
+        backend = settings.RESPONSE_CACHE_BACKEND
+        if backend == "none":
+            return None
+        if backend == "memory":
+            _response_cache = MemoryResponseCache(
+                maxsize=settings.RESPONSE_CACHE_SIZE,
+                ttl=settings.RESPONSE_CACHE_TTL_SECONDS,
+            )
+        elif backend == "redis":
+            _response_cache = RedisResponseCache.from_url(
+                settings.RESPONSE_CACHE_URL, ttl=settings.RESPONSE_CACHE_TTL_SECONDS
+            )
+        else:
+            raise ValueError(f"Unknown response cache backend: {backend}")
+    return _response_cache
+
+
+async def close_response_cache() -> None:
+    global _response_cache
+    if _response_cache is not None:
+        await _response_cache.close()
+        _response_cache = None
@@ -0,0 +1,182 @@
+"""
+Revoked access token ids, checked by get_current_user without a query.
+
+Revoking inserts a revoked_tokens row and NOTIFYs `token_revocations`
+in the same transaction. Every worker keeps the unexpired ids in memory:
+loaded at startup, then kept current by one LISTEN connection. After
+that connection drops, the table is reloaded on reconnect, so
+revocations made meanwhile are not lost.
+
+A user's role or active flag changing revokes their claims: an id of
+the form "claims:<user id>". Until their access tokens have expired,
+role claims embedded in them are not trusted, and every worker drops
+the user's cached principal when the notification arrives.
+"""
+import asyncio
+import logging
+import time
+from uuid import UUID
+
+import asyncpg
+from sqlalchemy import Connection, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+
+CHANNEL = "token_revocations"
+CLAIMS_PREFIX = "claims:"
+
+RECONNECT_DELAYS = (1, 2, 5, 10, 30)
+
+logger = logging.getLogger("app.revocation")
+
+
+class RevocationList:
+    """Token ids with the time (epoch seconds) they may be forgotten at."""
+
+    def __init__(self):
+        self._expiry: dict[str, float] = {}
+        self._next_purge = 0.0
+
+    def __len__(self) -> int:
+        return len(self._expiry)
+
+    def add(self, token_id: str, expires_at: float) -> None:
+        self._expiry[token_id] = max(expires_at, self._expiry.get(token_id, 0.0))
+        now = time.time()
+        if now >= self._next_purge:
+            self._expiry = {key: exp for key, exp in self._expiry.items() if exp > now}
+            self._next_purge = now + 60
+
+    def replace(self, entries: dict[str, float]) -> None:
+        self._expiry = entries
+
+    def is_revoked(self, *token_ids: str | None) -> bool:
+        # Hot path: usually an empty or small dict and two lookups
+        if not self._expiry:
+            return False
+        now = time.time()
+        return any(
+            self._expiry.get(token_id, 0.0) > now
+            for token_id in token_ids if token_id is not None
+        )
+
+
+revocation_list = RevocationList()
+
+
+_REVOKE = text(
+    "INSERT INTO revoked_tokens (token_id, expires_at)"
+    " SELECT id, to_timestamp(:expires_at) FROM unnest(CAST(:ids AS text[])) AS id"
+    " ON CONFLICT (token_id) DO UPDATE SET expires_at = EXCLUDED.expires_at"
+)
+_NOTIFY = text("SELECT pg_notify(:channel, payload) FROM unnest(CAST(:payloads AS text[])) AS payload")
+
+
+def _revocation(token_ids: list[str]) -> tuple[float, dict, dict]:
+    expires_at = time.time() + settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
+    return (
+        expires_at,
+        {"ids": token_ids, "expires_at": expires_at},
+        {"channel": CHANNEL, "payloads": [f"{token_id} {expires_at}" for token_id in token_ids]},
+    )
+
+
+async def revoke_token_ids(db: AsyncSession, token_ids: list[str]) -> float:
+    """
+    Revoke ids until every access token they can appear in has expired.
+    Takes effect on commit (in every worker); returns the expiry.
+    """
+    expires_at, revoked, notified = _revocation(token_ids)
+    await db.execute(_REVOKE, revoked)
+    await db.execute(_NOTIFY, notified)
+    return expires_at
+
+
+def claims_id(user_id: UUID) -> str:
+    return f"{CLAIMS_PREFIX}{user_id}"
+
+
+def revoke_claims(connection: Connection, user_id: UUID) -> float:
+    """revoke_token_ids for a user's claims, from inside an ORM flush."""
+    expires_at, revoked, notified = _revocation([claims_id(user_id)])
+    connection.execute(_REVOKE, revoked)
+    connection.execute(_NOTIFY, notified)
+    return expires_at
+
+
+def _principal_cache():
+    # Imported here: principals imports this module
+    from app.core.principals import principal_cache
+
+    return principal_cache
+
+
+class RevocationListener:
+    """The per-worker LISTEN connection feeding `revocations`."""
+
+    def __init__(self, revocations: RevocationList):
+        self.revocations = revocations
+        self._connection: asyncpg.Connection | None = None
+        self._reconnect: asyncio.Task | None = None
+        self._closed = False
+
+    async def start(self) -> None:
+        self._closed = False
+        await self._connect()
+
+    async def _connect(self) -> None:
+        connection = await asyncpg.connect(
+            user=settings.DB_USER,
+            password=settings.DB_PASSWORD,
+            host=settings.DB_HOST,
+            port=settings.DB_PORT,
+            database=settings.DB_NAME,
+        )
+        connection.add_termination_listener(self._on_terminated)
+        # Listen first, then load: a revocation committed in between is
+        # seen at least once
+        await connection.add_listener(CHANNEL, self._on_notify)
+        rows = await connection.fetch(
+            "SELECT token_id, extract(epoch FROM expires_at)::float8 AS expires_at"
+            " FROM revoked_tokens WHERE expires_at > now()"
+        )
+        self.revocations.replace({row["token_id"]: row["expires_at"] for row in rows})
+        # Role changes notified while there was no connection were missed
+        _principal_cache().clear()
+        self._connection = connection
+
+    async def close(self) -> None:
+        self._closed = True
+        if self._reconnect is not None:
+            self._reconnect.cancel()
+            self._reconnect = None
+        if self._connection is not None:
+            await self._connection.close()
+            self._connection = None
+
+    def _on_notify(self, connection, pid, channel, payload: str) -> None:
+        token_id, _, expires_at = payload.rpartition(" ")
+        self.revocations.add(token_id, float(expires_at))
+        if token_id.startswith(CLAIMS_PREFIX):
+            _principal_cache().pop(UUID(token_id.removeprefix(CLAIMS_PREFIX)))
+
+    def _on_terminated(self, connection) -> None:
+        self._connection = None
+        if not self._closed and self._reconnect is None:
+            self._reconnect = asyncio.get_running_loop().create_task(self._reconnect_loop())
+
+    async def _reconnect_loop(self) -> None:
+        attempt = 0
+        while not self._closed:
+            await asyncio.sleep(RECONNECT_DELAYS[min(attempt, len(RECONNECT_DELAYS) - 1)])
+            try:
+                await self._connect()
+                break
+            except (OSError, asyncpg.PostgresError) as exc:
+                logger.warning("revocation listener reconnect failed: %s", exc)
+                attempt += 1
+        self._reconnect = None
+
+
+revocation_listener = RevocationListener(revocation_list)
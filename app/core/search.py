@@ -0,0 +1,84 @@
+from sqlalchemy import func, or_
+
+from app.core.config import settings
+from app.models.task import Task
+
+# Must match the expression behind the generated Task.search_vector column,
+# otherwise the GIN index is not used.
+FULLTEXT_CONFIG = "english"
+
+
+class TaskSearch:
+    """
+    Internal search interface behind the `q` parameter of GET /tasks.
+
+    filter() returns the WHERE clause for a search term, rank() an
+    expression to order matches by relevance (or None if unsupported).
+    """
+
+    name: str = ""
+
+    def filter(self, q: str):
+        raise NotImplementedError
+
+    def rank(self, q: str):
+        return None
+
+
+class IlikeSearch(TaskSearch):
+    """Plain substring match. No index can serve it; the default for now."""
+
+    name = "ilike"
+
+    def filter(self, q: str):
+        return or_(
+            Task.title.ilike(f"%{q}%"),
+            Task.description.ilike(f"%{q}%"),
+        )
+
+
+class TrigramSearch(IlikeSearch):
+    """
+    Same substring semantics as ILIKE, served by the pg_trgm GIN indexes
+    on title and description. Ranked by trigram similarity.
+    """
+
+    name = "trigram"
+
+    def rank(self, q: str):
+        return func.greatest(
+            func.similarity(Task.title, q),
+            func.similarity(Task.description, q),
+        )
+
+
+class FullTextSearch(TaskSearch):
+    """
+    Word match (with stemming) on the generated `search_vector` column.
+    Accepts web-search syntax: quoted phrases, `or`, `-exclusions`.
+    """
+
+    name = "fulltext"
+
+    def _query(self, q: str):
+        return func.websearch_to_tsquery(FULLTEXT_CONFIG, q)
+
+    def filter(self, q: str):
+        return Task.search_vector.op("@@")(self._query(q))
+
+    def rank(self, q: str):
+        return func.ts_rank_cd(Task.search_vector, self._query(q))
+
+
+SEARCH_BACKENDS: dict[str, TaskSearch] = {
+    backend.name: backend
+    for backend in (IlikeSearch(), TrigramSearch(), FullTextSearch())
+}
+
+
+def get_task_search(name: str | None = None) -> TaskSearch:
+    name = name or settings.TASK_SEARCH_BACKEND
+    try:
+        return SEARCH_BACKENDS[name]
+    except KeyError:
+        raise ValueError(f"Unknown task search backend: {name}")
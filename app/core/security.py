@@ -1,6 +1,11 @@
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+from fastapi import HTTPException, status
 from passlib.context import CryptContext
-from jose import jwt, JWTError
 from app.core.config import settings
+from app.core.tokens import InvalidToken, verify_access_token
 
 pwd_context = CryptContext(
     schemes=["bcrypt"],
@@ -19,13 +24,65 @@ def hash_password(password: str) -> str:
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
+
+# bcrypt is deliberately slow. Running it on FastAPI's shared threadpool
+# lets a burst of logins starve every other endpoint, so the async API
+# below sends it to a small dedicated process pool (no GIL contention)
+# and sheds load once too many hashes are queued.
+_password_executor: ProcessPoolExecutor | None = None
+_password_jobs_pending = 0
+
+
+def get_password_executor() -> ProcessPoolExecutor:
+    global _password_executor
+    if _password_executor is None:
+        _password_executor = ProcessPoolExecutor(
+            max_workers=settings.PASSWORD_HASH_WORKERS,
+            # spawn: forking a threaded server process is not safe
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _password_executor
+
+
+def shutdown_password_executor() -> None:
+    global _password_executor
+    if _password_executor is not None:
+        _password_executor.shutdown(wait=False, cancel_futures=True)
+        _password_executor = None
+
+
+async def _run_password_job(fn, *args):
+    global _password_jobs_pending
+    # Only touched from the event loop thread, so no lock is needed
+    if _password_jobs_pending >= settings.PASSWORD_HASH_MAX_PENDING:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Authentication service is busy, retry shortly",
+            headers={"Retry-After": str(settings.PASSWORD_HASH_RETRY_AFTER_SECONDS)},
+        )
+
+    _password_jobs_pending += 1
+    try:
+        loop = asyncio.get_running_loop()
+        executor = get_password_executor() if settings.PASSWORD_HASH_WORKERS > 0 else None
+        return await loop.run_in_executor(executor, fn, *args)
+    finally:
+        _password_jobs_pending -= 1
+
+
+async def hash_password_async(password: str) -> str:
+    # Fail fast in-process instead of paying a round trip to the pool
+    if len(password.encode("utf-8")) > MAX_BCRYPT_PASSWORD_LENGTH:
+        raise ValueError("Password too long")
+    return await _run_password_job(hash_password, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await _run_password_job(verify_password, plain_password, hashed_password)
+
+
 def decode_access_token(token: str) -> dict | None:
     try:
-        payload = jwt.decode(
-            token,
-            settings.JWT_SECRET_KEY,
-            algorithms=[settings.JWT_ALGORITHM],
-        )
-        return payload
-    except JWTError:
+        return verify_access_token(token)
+    except InvalidToken:
         return None
@@ -0,0 +1,174 @@
+"""
+Fast response path for the hot read endpoints.
+
+Rows are selected as plain tuples, turned into dicts shaped exactly like
+TaskResponse / UserResponse (same keys, same order) without per-row
+Pydantic validation, and encoded with orjson. The response_model on each
+route still documents the shape.
+"""
+import uuid
+
+import orjson
+from fastapi.responses import JSONResponse
+from sqlalchemy import select
+
+from app.models.task import Task
+from app.models.user import User
+
+# UTC as "Z", like Pydantic's JSON output
+ORJSON_OPTIONS = orjson.OPT_UTC_Z
+
+
+def _default(value):
+    # asyncpg returns its own uuid.UUID subclass, which orjson only
+    # serializes natively as the exact type
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+def dumps(content) -> bytes:
+    return orjson.dumps(content, default=_default, option=ORJSON_OPTIONS)
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse encoded with orjson (UUID / datetime / enum natively)."""
+
+    def render(self, content) -> bytes:
+        return dumps(content)
+
+
+USER_COLUMNS = (
+    User.email,
+    User.full_name,
+    User.role,
+    User.id,
+    User.is_active,
+    User.created_at,
+)
+
+
+def user_payload(row) -> dict:
+    email, full_name, role, user_id, is_active, created_at = row
+    return {
+        "email": email,
+        "full_name": full_name,
+        "role": role,
+        "id": user_id,
+        "is_active": is_active,
+        "created_at": created_at,
+    }
+
+# Top-level fields of TaskResponse, in its key order; "assigned_to" is the
+# embedded assignee (the users join)
+TASK_FIELDS = {
+    "id": Task.id,
+    "title": Task.title,
+    "description": Task.description,
+    "status": Task.status,
+    "created_by_id": Task.created_by_id,
+    "assigned_to_id": Task.assigned_to_id,
+    "assigned_to": None,
+    "created_at": Task.created_at,
+    "updated_at": Task.updated_at,
+}
+
+# Fields of the embedded assignee (UserResponse order); its id is the
+# task's assigned_to_id, so only the others need the join
+ASSIGNEE_FIELDS = {
+    "email": User.email.label("assignee_email"),
+    "full_name": User.full_name.label("assignee_full_name"),
+    "role": User.role.label("assignee_role"),
+    "id": Task.assigned_to_id,
+    "is_active": User.is_active.label("assignee_is_active"),
+    "created_at": User.created_at.label("assignee_created_at"),
+}
+
+
+class TaskFieldset:
+    """
+    The fields a task read returns (?fields= on GET /tasks): which columns
+    to select and how to shape each row.
+
+    `fields` are top-level TaskResponse fields; "assigned_to" embeds the
+    whole assignee and "assigned_to.<field>" only some of its fields. None
+    means every field.
+    """
+
+    def __init__(self, fields: list[str] | None = None):
+        if fields is None:
+            fields = list(TASK_FIELDS)
+        top: set[str] = set()
+        assignee: set[str] = set()
+        for field in fields:
+            name, _, sub = field.partition(".")
+            if name not in TASK_FIELDS or (sub and (name != "assigned_to" or sub not in ASSIGNEE_FIELDS)):
+                raise ValueError(f"Unknown field: {field}")
+            top.add(name)
+            if name == "assigned_to":
+                assignee.update([sub] if sub else ASSIGNEE_FIELDS)
+
+        self.top = [name for name in TASK_FIELDS if name in top]
+        self.assignee = [name for name in ASSIGNEE_FIELDS if name in assignee]
+        self.joins_users = any(name != "id" for name in self.assignee)
+
+        # Always selected: id / created_at for cursors, assigned_to_id to
+        # tell an unassigned task from a missing assignee
+        columns = {"id": Task.id, "created_at": Task.created_at}
+        if self.assignee:
+            columns["assigned_to_id"] = Task.assigned_to_id
+        for name in self.top:
+            if TASK_FIELDS[name] is not None:
+                columns[name] = TASK_FIELDS[name]
+        for name in self.assignee:
+            column = ASSIGNEE_FIELDS[name]
+            columns.setdefault(column.key, column)
+        self.columns = list(columns.values())
+
+        index = {key: position for position, key in enumerate(columns)}
+        self._assignee_index = index.get("assigned_to_id")
+        self._top = [(name, index.get(name)) for name in self.top]
+        self._nested = [(name, index[ASSIGNEE_FIELDS[name].key]) for name in self.assignee]
+
+    @classmethod
+    def parse(cls, fields: str | None) -> "TaskFieldset":
+        """From a comma-separated ?fields= value; ValueError if invalid."""
+        if fields is None:
+            return cls()
+        names = [name.strip() for name in fields.split(",") if name.strip()]
+        if not names:
+            raise ValueError("No fields requested")
+        return cls(names)
+
+    @property
+    def key(self) -> str:
+        """Normalized form, for cache keys."""
+        return ",".join(self.top + [f"assigned_to.{name}" for name in self.assignee])
+
+    def select(self):
+        query = select(*self.columns)
+        if self.joins_users:
+            query = query.outerjoin(User, Task.assigned_to_id == User.id)
+        return query
+
+    def payload(self, row) -> dict:
+        item = {}
+        for name, position in self._top:
+            if position is not None:
+                item[name] = row[position]
+            elif row[self._assignee_index] is None:
+                item[name] = None
+            else:
+                item[name] = {sub: row[sub_position] for sub, sub_position in self._nested}
+        return item
+
+
+ALL_TASK_FIELDS = TaskFieldset()
+
+
+def task_rows_select():
+    return ALL_TASK_FIELDS.select()
+
+
+def task_payload(row) -> dict:
+    return ALL_TASK_FIELDS.payload(row)
@@ -0,0 +1,146 @@
+"""
+Login sessions: refresh token rotation and revocation.
+
+A login starts a session (id "sid", carried by its access tokens) with
+an opaque refresh token. POST /auth/refresh trades a refresh token for a
+new access token and the session's next refresh token, with no password
+check. A refresh token is good for one exchange: presenting a used one
+means it leaked, and revokes the whole session.
+
+Rotating and revoking a session both hold a transaction-level advisory
+lock on its id, so they never interleave: a logout that starts while a
+refresh is in flight waits for it, then revokes the token it issued too.
+Expired rows are pruned from cron:
+
+    python -m app.core.sessions prune
+"""
+import asyncio
+import hashlib
+import secrets
+import sys
+from datetime import datetime, timedelta, timezone
+from uuid import UUID
+
+from sqlalchemy import delete, func, select, text, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.revocation import revocation_list, revoke_token_ids
+from app.database import SessionLocal, engine
+from app.models.refresh_token import RefreshToken
+from app.models.revoked_token import RevokedToken
+
+
+# Advisory lock space for sessions (two-int form: apart from the
+# migration lock's bigint key); the second key is hashtext(session id)
+SESSION_LOCK_CLASS = 0x53455353  # "SESS"
+
+
+class RefreshRejected(Exception):
+    pass
+
+
+def hash_refresh_token(token: str) -> str:
+    # Tokens are 256 random bits: a fast hash is enough (no bcrypt)
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+def new_session_id() -> str:
+    return secrets.token_urlsafe(16)
+
+
+def issue_refresh_token(db: AsyncSession, user_id: UUID, session_id: str) -> str:
+    token = secrets.token_urlsafe(32)
+    db.add(RefreshToken(
+        token_hash=hash_refresh_token(token),
+        session_id=session_id,
+        user_id=user_id,
+        expires_at=datetime.now(timezone.utc) + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS),
+    ))
+    return token
+
+
+async def lock_session(db: AsyncSession, session_id: str) -> None:
+    """Serialize with other rotations / revocations of the session until commit."""
+    await db.execute(
+        text("SELECT pg_advisory_xact_lock(:lock_class, hashtext(:session_id))"),
+        {"lock_class": SESSION_LOCK_CLASS, "session_id": session_id},
+    )
+
+
+async def rotate_refresh_token(db: AsyncSession, token: str) -> tuple[RefreshToken, str]:
+    """
+    Use up `token`: its row and the session's next refresh token.
+    RefreshRejected if it is unknown, expired, revoked or already used
+    (the last revokes the session, committed before raising).
+    """
+    token_hash = hash_refresh_token(token)
+    # The session lock comes before the row lock, in the order
+    # revoke_session takes them
+    session_id = await db.scalar(
+        select(RefreshToken.session_id).where(RefreshToken.token_hash == token_hash)
+    )
+    if session_id is None or revocation_list.is_revoked(session_id):
+        raise RefreshRejected("Invalid refresh token")
+    await lock_session(db, session_id)
+
+    result = await db.execute(
+        select(RefreshToken)
+        .where(RefreshToken.token_hash == token_hash)
+        # Concurrent exchanges of one token: the second sees it used
+        .with_for_update()
+    )
+    row = result.scalar_one_or_none()
+    if row is None or row.revoked_at is not None:
+        raise RefreshRejected("Invalid refresh token")
+
+    if row.used_at is not None:
+        await revoke_session(db, row.session_id)
+        await db.commit()
+        raise RefreshRejected("Refresh token reuse detected; session revoked")
+
+    now = datetime.now(timezone.utc)
+    if row.expires_at <= now:
+        raise RefreshRejected("Refresh token expired")
+
+    row.used_at = now
+    return row, issue_refresh_token(db, row.user_id, row.session_id)
+
+
+async def revoke_session(db: AsyncSession, session_id: str) -> float:
+    """End a session: its refresh tokens and, on commit, its access tokens."""
+    # Waits out a rotation in flight; the token it issued is then revoked too
+    await lock_session(db, session_id)
+    await db.execute(
+        update(RefreshToken)
+        .where(RefreshToken.session_id == session_id, RefreshToken.revoked_at.is_(None))
+        .values(revoked_at=func.now())
+    )
+    return await revoke_token_ids(db, [session_id])
+
+
+async def prune_sessions(db: AsyncSession) -> tuple[int, int]:
+    """Delete expired refresh tokens and revocations; returns both counts."""
+    refresh = await db.execute(delete(RefreshToken).where(RefreshToken.expires_at < func.now()))
+    revoked = await db.execute(delete(RevokedToken).where(RevokedToken.expires_at < func.now()))
+    await db.commit()
+    return refresh.rowcount, revoked.rowcount
+
+
+async def _main(argv: list[str]) -> int:
+    if argv != ["prune"]:
+        print("usage: python -m app.core.sessions prune", file=sys.stderr)
+        return 1
+
+    try:
+        async with SessionLocal() as db:
+            refresh, revoked = await prune_sessions(db)
+    finally:
+        await engine.dispose()
+
+    print(f"{refresh} refresh tokens, {revoked} revocations pruned")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(_main(sys.argv[1:])))
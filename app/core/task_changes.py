@@ -0,0 +1,58 @@
+from dataclasses import dataclass
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.change_versions import TASKS, bump_versions
+from app.core.task_counters import apply_counter_deltas, assignee_key, counter_deltas
+from app.core.task_events import notify_task_changes
+from app.core.task_sync import record_tombstones
+from app.models.task import TaskStatus
+
+
+@dataclass(frozen=True, slots=True)
+class TaskChange:
+    """
+    Before / after snapshot of one task write. old_status is None for a
+    created task, new_status is None for a deleted one.
+    """
+
+    task_id: UUID
+    created_by_id: UUID
+    old_status: TaskStatus | None
+    new_status: TaskStatus | None
+    old_assignee_id: UUID | None
+    new_assignee_id: UUID | None
+
+    @property
+    def kind(self) -> str:
+        if self.old_status is None:
+            return "created"
+        if self.new_status is None:
+            return "deleted"
+        if self.old_assignee_id != self.new_assignee_id:
+            return "assigned"
+        return "status"
+
+
+async def record_task_changes(db: AsyncSession, changes: list[TaskChange]) -> None:
+    """
+    Everything derived from task writes. Call inside the writing
+    transaction, before commit, so derived state commits atomically.
+    """
+    if not changes:
+        return
+    await apply_counter_deltas(db, counter_deltas(changes))
+
+    # Every assignee scope whose task list changed (old and new owner)
+    scopes = set()
+    for change in changes:
+        if change.old_status is not None:
+            scopes.add(assignee_key(change.old_assignee_id))
+        if change.new_status is not None:
+            scopes.add(assignee_key(change.new_assignee_id))
+    await bump_versions(db, TASKS, scopes)
+    await record_tombstones(db, changes)
+
+    # Delivered to GET /tasks/events subscribers on commit
+    await notify_task_changes(db, changes)
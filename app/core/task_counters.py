@@ -0,0 +1,189 @@
+"""
+Materialized task counts (the task_counters table).
+
+Kept current by record_task_changes() in the same transaction as each
+task write; reconcile_counters() repairs any drift and runs from cron:
+
+    python -m app.core.task_counters reconcile
+"""
+import asyncio
+import sys
+from collections import Counter
+from uuid import UUID
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.change_versions import TASKS, bump_versions
+from app.database import SessionLocal, engine
+from app.models.task import Task, TaskStatus
+from app.models.task_counter import TaskCounter
+from app.models import user  # noqa: F401  (Task.assigned_to resolves "User" at mapper setup)
+
+ASSIGNEE = "assignee"
+CREATOR = "creator"
+UNASSIGNED = ""
+
+CounterKey = tuple[str, str, TaskStatus]
+
+
+def assignee_key(assignee_id: UUID | None) -> str:
+    return str(assignee_id) if assignee_id else UNASSIGNED
+
+
+def add_counts(
+    deltas: Counter,
+    assignee_id: UUID | None,
+    created_by_id: UUID,
+    status: TaskStatus,
+    count: int,
+) -> None:
+    deltas[(ASSIGNEE, assignee_key(assignee_id), status)] += count
+    deltas[(CREATOR, str(created_by_id), status)] += count
+
+
+def counter_deltas(changes) -> Counter:
+    deltas: Counter = Counter()
+    for change in changes:
+        if change.old_status is not None:
+            add_counts(deltas, change.old_assignee_id, change.created_by_id, change.old_status, -1)
+        if change.new_status is not None:
+            add_counts(deltas, change.new_assignee_id, change.created_by_id, change.new_status, 1)
+    return deltas
+
+
+async def apply_counter_deltas(db: AsyncSession, deltas: Counter) -> None:
+    # Sorted so concurrent writers lock counter rows in the same order
+    # (no deadlocks); one multi-row upsert for the whole write
+    rows = [
+        {"dimension": dimension, "key": key, "status": status, "count": delta}
+        for (dimension, key, status), delta in sorted(deltas.items())
+        if delta
+    ]
+    if not rows:
+        return
+
+    stmt = insert(TaskCounter).values(rows)
+    await db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[TaskCounter.dimension, TaskCounter.key, TaskCounter.status],
+            set_={"count": TaskCounter.count + stmt.excluded.count},
+        )
+    )
+
+
+async def read_counters(db: AsyncSession, dimension: str | None = None, key: str | None = None):
+    query = select(TaskCounter.dimension, TaskCounter.key, TaskCounter.status, TaskCounter.count)
+    if dimension is not None:
+        query = query.where(TaskCounter.dimension == dimension)
+    if key is not None:
+        query = query.where(TaskCounter.key == key)
+    return (await db.execute(query)).all()
+
+
+async def count_assigned(
+    db: AsyncSession, key: str | None = None, status: TaskStatus | None = None
+) -> int:
+    """Tasks with assignee `key` (None: any) and `status` (None: any)."""
+    query = select(func.coalesce(func.sum(TaskCounter.count), 0)).where(
+        TaskCounter.dimension == ASSIGNEE
+    )
+    if key is not None:
+        query = query.where(TaskCounter.key == key)
+    if status is not None:
+        query = query.where(TaskCounter.status == status)
+    return int((await db.execute(query)).scalar_one())
+
+
+def summarize_counters(rows, breakdown: bool) -> dict:
+    """Shape counter rows for GET /tasks/stats."""
+    by_status = {status: 0 for status in TaskStatus}
+    by_assignee: dict[str, dict] = {}
+    by_creator: dict[str, dict] = {}
+
+    for dimension, key, status, count in rows:
+        if dimension == ASSIGNEE:
+            by_status[status] += count
+            target = by_assignee.setdefault(key or "unassigned", {})
+        else:
+            target = by_creator.setdefault(key, {})
+        target[status] = count
+
+    stats = {"total": sum(by_status.values()), "by_status": by_status}
+    if breakdown:
+        stats["by_assignee"] = by_assignee
+        stats["by_creator"] = by_creator
+    return stats
+
+
+async def _actual_counts(db: AsyncSession) -> Counter:
+    actual: Counter = Counter()
+    by_assignee = await db.execute(
+        select(Task.assigned_to_id, Task.status, func.count())
+        .group_by(Task.assigned_to_id, Task.status)
+    )
+    for assignee_id, status, count in by_assignee:
+        actual[(ASSIGNEE, assignee_key(assignee_id), status)] = count
+
+    by_creator = await db.execute(
+        select(Task.created_by_id, Task.status, func.count())
+        .group_by(Task.created_by_id, Task.status)
+    )
+    for creator_id, status, count in by_creator:
+        actual[(CREATOR, str(creator_id), status)] = count
+    return actual
+
+
+async def reconcile_counters(db: AsyncSession) -> Counter:
+    """
+    Recompute counts from tasks and correct any drift. Returns the
+    corrections applied.
+
+    tasks and task_counters are read from one REPEATABLE READ snapshot,
+    in which they must agree. Corrections are then applied as increments
+    in a separate transaction, so they compose with concurrent writers
+    instead of locking them out.
+    """
+    await db.connection(execution_options={"isolation_level": "REPEATABLE READ"})
+    actual = await _actual_counts(db)
+    stored = Counter({
+        (dimension, key, status): count
+        for dimension, key, status, count in await read_counters(db)
+    })
+    await db.commit()
+
+    corrections = Counter({
+        counter_key: actual[counter_key] - stored[counter_key]
+        for counter_key in actual.keys() | stored.keys()
+        if actual[counter_key] != stored[counter_key]
+    })
+    await apply_counter_deltas(db, corrections)
+    # Drift means tasks changed outside the API: invalidate those ETags too
+    await bump_versions(db, TASKS, {
+        key for dimension, key, _ in corrections if dimension == ASSIGNEE
+    })
+    await db.execute(delete(TaskCounter).where(TaskCounter.count == 0))
+    await db.commit()
+    return corrections
+
+
+async def _main(argv: list[str]) -> int:
+    if argv != ["reconcile"]:
+        print("usage: python -m app.core.task_counters reconcile", file=sys.stderr)
+        return 1
+
+    try:
+        async with SessionLocal() as db:
+            corrections = await reconcile_counters(db)
+    finally:
+        await engine.dispose()
+
+    for (dimension, key, status), delta in sorted(corrections.items()):
+        print(f"{dimension} {key or '-'} {status.value}: {delta:+d}")
+    print(f"{len(corrections)} counters corrected")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(_main(sys.argv[1:])))
@@ -0,0 +1,197 @@
+"""
+Task change feed behind GET /tasks/events.
+
+Writers NOTIFY on the `task_events` channel inside their transaction, so
+events go out on commit only. Each worker holds one LISTEN connection
+and fans events out to its in-process subscribers; every worker sees
+the same events in the same (commit) order, so a resume token from one
+worker is valid on any other.
+"""
+import asyncio
+import json
+from collections import deque
+
+import asyncpg
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.principals import Principal
+
+CHANNEL = "task_events"
+
+# Sent instead of events when a subscriber may have missed some: the
+# client should refetch its list, then keep listening
+RESET = {"type": "reset"}
+
+
+async def notify_task_changes(db: AsyncSession, changes) -> None:
+    events = [
+        json.dumps({
+            "type": change.kind,
+            "task_id": str(change.task_id),
+            "status": change.new_status.value if change.new_status else None,
+            "assigned_to_id": str(change.new_assignee_id) if change.new_assignee_id else None,
+            "previous_assigned_to_id": (
+                str(change.old_assignee_id) if change.old_assignee_id else None
+            ),
+            "created_by_id": str(change.created_by_id),
+        })
+        for change in changes
+    ]
+    await notify_events(db, events)
+
+
+async def notify_events(db: AsyncSession, events: list[str]) -> None:
+    # One statement for the whole write; the event id (transaction id +
+    # position) is unique across workers and restarts
+    await db.execute(
+        text(
+            "SELECT pg_notify(:channel, (event::jsonb"
+            " || jsonb_build_object('id', txid_current()::text || '-' || n::text))::text)"
+            " FROM unnest(CAST(:events AS text[])) WITH ORDINALITY AS e(event, n)"
+        ),
+        {"channel": CHANNEL, "events": events},
+    )
+
+
+def visible_to(principal: Principal, event: dict) -> bool:
+    # Same scope as list_tasks: EMPLOYEE only hears about tasks that are,
+    # or just stopped being, assigned to them
+    if principal.role in ("ADMIN", "MANAGER") or event["type"] in ("reset", "bulk"):
+        return True
+    user_id = str(principal.id)
+    return user_id in (event.get("assigned_to_id"), event.get("previous_assigned_to_id"))
+
+
+class Subscriber:
+    """One open stream: a bounded queue of events visible to `principal`."""
+
+    def __init__(self, principal: Principal, queue_size: int):
+        self.principal = principal
+        self.queue: asyncio.Queue[dict] = asyncio.Queue(maxsize=queue_size)
+
+    def offer(self, event: dict) -> bool:
+        """Queue the event if visible; False if the subscriber fell behind."""
+        if not visible_to(self.principal, event):
+            return True
+        try:
+            self.queue.put_nowait(event)
+            return True
+        except asyncio.QueueFull:
+            return False
+
+    def reset(self) -> None:
+        # Drop whatever is queued: the client refetches anyway
+        while not self.queue.empty():
+            self.queue.get_nowait()
+        self.queue.put_nowait(RESET)
+
+
+class TaskEventBroker:
+    """
+    The per-worker LISTEN connection plus its subscribers.
+
+    Memory is bounded: each subscriber queues at most `queue_size` events
+    (a slower one is sent a reset and dropped), and the last
+    `buffer_size` events are kept for resuming after a brief disconnect.
+    """
+
+    def __init__(self, buffer_size: int, queue_size: int):
+        self.queue_size = queue_size
+        self.recent: deque[dict] = deque(maxlen=buffer_size)
+        self.subscribers: set[Subscriber] = set()
+        self._connection: asyncpg.Connection | None = None
+        self._lock = asyncio.Lock()
+
+    async def start(self) -> None:
+        async with self._lock:
+            if self._connection is not None and not self._connection.is_closed():
+                return
+            self._connection = await asyncpg.connect(
+                user=settings.DB_USER,
+                password=settings.DB_PASSWORD,
+                host=settings.DB_HOST,
+                port=settings.DB_PORT,
+                database=settings.DB_NAME,
+            )
+            self._connection.add_termination_listener(self._on_terminated)
+            await self._connection.add_listener(CHANNEL, self._on_notify)
+
+    async def close(self) -> None:
+        async with self._lock:
+            if self._connection is not None:
+                await self._connection.close()
+                self._connection = None
+        self._reset_all()
+
+    def subscribe(self, principal: Principal, last_event_id: str | None = None) -> Subscriber:
+        subscriber = Subscriber(principal, self.queue_size)
+        if last_event_id:
+            ids = [event["id"] for event in self.recent]
+            if last_event_id in ids:
+                missed = list(self.recent)[ids.index(last_event_id) + 1:]
+                if not all(subscriber.offer(event) for event in missed):
+                    subscriber.reset()
+            else:
+                # Too old, or from before this worker was listening
+                subscriber.reset()
+        self.subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber) -> None:
+        self.subscribers.discard(subscriber)
+
+    def publish(self, event: dict) -> None:
+        self.recent.append(event)
+        for subscriber in list(self.subscribers):
+            if not subscriber.offer(event):
+                subscriber.reset()
+                self.unsubscribe(subscriber)
+
+    def _on_notify(self, connection, pid, channel, payload: str) -> None:
+        self.publish(json.loads(payload))
+
+    def _on_terminated(self, connection) -> None:
+        # Events may have been lost while disconnected: nothing buffered
+        # can be trusted for resuming. The next subscriber reconnects.
+        self._connection = None
+        self._reset_all()
+
+    def _reset_all(self) -> None:
+        self.recent.clear()
+        for subscriber in self.subscribers:
+            subscriber.reset()
+        self.subscribers.clear()
+
+
+task_event_broker = TaskEventBroker(
+    buffer_size=settings.TASK_EVENTS_BUFFER_SIZE,
+    queue_size=settings.TASK_EVENTS_QUEUE_SIZE,
+)
+
+
+def format_sse(event: dict) -> str:
+    if event is RESET:
+        return "event: reset\ndata: {}\n\n"
+    return f"id: {event['id']}\nevent: {event['type']}\ndata: {json.dumps(event)}\n\n"
+
+
+async def stream_events(broker: TaskEventBroker, subscriber: Subscriber):
+    """SSE frames for one subscriber; ends after a reset."""
+    try:
+        yield f"retry: {settings.TASK_EVENTS_RETRY_MS}\n\n"
+        while True:
+            try:
+                event = await asyncio.wait_for(
+                    subscriber.queue.get(), timeout=settings.TASK_EVENTS_HEARTBEAT_SECONDS
+                )
+            except asyncio.TimeoutError:
+                # Comment frame: keeps proxies from closing an idle stream
+                yield ": keepalive\n\n"
+                continue
+            yield format_sse(event)
+            if event is RESET:
+                return
+    finally:
+        broker.unsubscribe(subscriber)
@@ -0,0 +1,322 @@
+"""
+Bulk task import: streamed CSV / NDJSON -> validated chunks -> COPY into a
+temporary staging table -> one INSERT ... SELECT into tasks.
+
+Used by POST /tasks/import and, for large offline loads, from the shell:
+
+    python -m app.core.task_import tasks.csv --created-by admin@example.com
+"""
+import argparse
+import asyncio
+import csv
+import json
+import sys
+import time
+import uuid
+from collections import Counter
+from typing import AsyncIterator, Callable
+from uuid import UUID
+
+from pydantic import ValidationError
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.change_versions import TASKS, bump_versions
+from app.core.task_counters import add_counts, apply_counter_deltas, assignee_key
+from app.core.task_events import notify_events
+from app.database import SessionLocal, engine
+from app.models.task import TaskStatus
+from app.models.user import User
+from app.schemas.task import TaskImportError, TaskImportReport, TaskImportRow
+
+IMPORT_CHUNK_SIZE = 5000
+MAX_REPORTED_ERRORS = 1000
+
+STAGING_TABLE = "task_import_staging"
+STAGING_COLUMNS = (
+    "id", "title", "description", "status",
+    "created_by_id", "assigned_to_id", "created_at",
+)
+
+
+# COPY rejects NUL in text columns
+NUL_ERROR = "NUL characters are not allowed"
+
+
+def _decode_line(line: bytes) -> tuple[str, str | None]:
+    line = line.rstrip(b"\r")
+    try:
+        decoded = line.decode("utf-8")
+    except UnicodeDecodeError as exc:
+        # Replacements keep the line's quotes where they were, so a CSV
+        # record spanning it still ends in the right place
+        return line.decode("utf-8", "replace"), f"Invalid UTF-8 at byte {exc.start + 1}"
+    if "\x00" in decoded:
+        return decoded, NUL_ERROR
+    return decoded, None
+
+
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[tuple[str, str | None]]:
+    """Decoded lines, each with the error that rules it out (or None)."""
+    pending = b""
+    async for chunk in chunks:
+        pending += chunk
+        *lines, pending = pending.split(b"\n")
+        for line in lines:
+            yield _decode_line(line)
+    if pending.strip():
+        yield _decode_line(pending)
+
+
+async def iter_ndjson(chunks: AsyncIterator[bytes]) -> AsyncIterator[dict | str]:
+    async for line, error in iter_lines(chunks):
+        if error:
+            yield error
+            continue
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as exc:
+            yield f"Invalid JSON: {exc}"
+            continue
+        yield record if isinstance(record, dict) else "Expected a JSON object"
+
+
+async def iter_csv(chunks: AsyncIterator[bytes]) -> AsyncIterator[dict | str]:
+    header = None
+    record_lines: list[str] = []
+    record_error = None
+    async for line, error in iter_lines(chunks):
+        # A quoted field may span lines: a record is complete once its
+        # quote count is even
+        record_lines.append(line)
+        record_error = record_error or error
+        record = "\n".join(record_lines)
+        if record.count('"') % 2:
+            continue
+        record_lines = []
+
+        if record_error:
+            yield record_error
+            record_error = None
+            continue
+        if not record.strip():
+            continue
+        values = next(csv.reader([record]))
+        if header is None:
+            header = values
+            continue
+        if len(values) != len(header):
+            yield f"Expected {len(header)} columns, got {len(values)}"
+            continue
+        # Empty CSV cells mean "not provided", so model defaults apply
+        yield {key: value for key, value in zip(header, values) if value != ""}
+
+    if record_lines:
+        yield "Unterminated quoted field"
+
+
+RECORD_READERS = {
+    "csv": iter_csv,
+    "ndjson": iter_ndjson,
+}
+
+
+def _validation_message(exc: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}"
+        for error in exc.errors()
+    )
+
+
+class _ImportRun:
+    def __init__(self, db: AsyncSession, created_by_id: UUID):
+        self.db = db
+        self.created_by_id = created_by_id
+        self.received = 0
+        self.staged = 0
+        self.failed = 0
+        self.errors: list[TaskImportError] = []
+        # Assignee id -> role, filled batch by batch and reused across chunks
+        self.assignee_roles: dict[UUID, str | None] = {}
+
+    def fail(self, row: int, error: str) -> None:
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append(TaskImportError(row=row, error=error))
+
+    async def resolve_assignees(self, rows: list[TaskImportRow]) -> None:
+        unknown = {
+            row.assigned_to_id for row in rows
+            if row.assigned_to_id and row.assigned_to_id not in self.assignee_roles
+        }
+        if not unknown:
+            return
+        result = await self.db.execute(
+            select(User.id, User.role).where(User.id.in_(unknown))
+        )
+        found = dict(result.all())
+        for user_id in unknown:
+            self.assignee_roles[user_id] = found.get(user_id)
+
+    async def copy_chunk(self, chunk: list[tuple[int, dict | str]]) -> None:
+        valid: list[tuple[int, TaskImportRow]] = []
+        for row_number, record in chunk:
+            if isinstance(record, str):
+                self.fail(row_number, record)
+                continue
+            try:
+                row = TaskImportRow.model_validate(record)
+            except ValidationError as exc:
+                self.fail(row_number, _validation_message(exc))
+                continue
+            # An escaped \u0000 in NDJSON gets past the line check
+            if "\x00" in row.title or "\x00" in (row.description or ""):
+                self.fail(row_number, NUL_ERROR)
+                continue
+            valid.append((row_number, row))
+
+        await self.resolve_assignees([row for _, row in valid])
+
+        records = []
+        for row_number, row in valid:
+            if row.assigned_to_id:
+                role = self.assignee_roles.get(row.assigned_to_id)
+                if role is None:
+                    self.fail(row_number, "Assigned user does not exist")
+                    continue
+                if role != "EMPLOYEE":
+                    self.fail(row_number, "Tasks can only be assigned to EMPLOYEE users")
+                    continue
+            records.append((
+                uuid.uuid4(),
+                row.title,
+                row.description,
+                row.status.value,
+                self.created_by_id,
+                row.assigned_to_id,
+                row.created_at,
+            ))
+
+        if records:
+            connection = await self.db.connection()
+            raw = await connection.get_raw_connection()
+            await raw.driver_connection.copy_records_to_table(
+                STAGING_TABLE, records=records, columns=STAGING_COLUMNS
+            )
+            self.staged += len(records)
+
+
+async def import_tasks(
+    db: AsyncSession,
+    chunks: AsyncIterator[bytes],
+    fmt: str,
+    created_by_id: UUID,
+    on_progress: Callable[[int, float], None] | None = None,
+) -> TaskImportReport:
+    """
+    Load a streamed upload in one transaction. Invalid rows are reported
+    and skipped; nothing is written unless the final merge succeeds.
+    """
+    started = time.perf_counter()
+    run = _ImportRun(db, created_by_id)
+
+    # Large merges legitimately outlive the per-statement API timeout
+    await db.execute(text("SET LOCAL statement_timeout = 0"))
+    await db.execute(text(
+        f"CREATE TEMP TABLE {STAGING_TABLE} ("
+        " id uuid, title text, description text, status text,"
+        " created_by_id uuid, assigned_to_id uuid, created_at timestamptz"
+        ") ON COMMIT DROP"
+    ))
+
+    chunk: list[tuple[int, dict | str]] = []
+    async for record in RECORD_READERS[fmt](chunks):
+        run.received += 1
+        chunk.append((run.received, record))
+        if len(chunk) >= IMPORT_CHUNK_SIZE:
+            await run.copy_chunk(chunk)
+            chunk = []
+            if on_progress:
+                on_progress(run.received, time.perf_counter() - started)
+    if chunk:
+        await run.copy_chunk(chunk)
+
+    # updated_at is the merge time, not the transaction start: a long
+    # import must not land behind delta sync watermarks handed out meanwhile
+    await db.execute(text(
+        "INSERT INTO tasks"
+        " (id, title, description, status, created_by_id, assigned_to_id,"
+        "  created_at, updated_at)"
+        " SELECT id, title, description, status::task_status_enum,"
+        "  created_by_id, assigned_to_id,"
+        "  coalesce(created_at, now()), clock_timestamp()"
+        f" FROM {STAGING_TABLE}"
+    ))
+
+    # Counters for the merged rows, aggregated in SQL rather than per row
+    deltas: Counter = Counter()
+    scopes = set()
+    grouped = await db.execute(text(
+        "SELECT assigned_to_id, created_by_id, status, count(*)"
+        f" FROM {STAGING_TABLE} GROUP BY 1, 2, 3"
+    ))
+    for assignee_id, creator_id, status, count in grouped:
+        add_counts(deltas, assignee_id, creator_id, TaskStatus(status), count)
+        scopes.add(assignee_key(assignee_id))
+    await apply_counter_deltas(db, deltas)
+    await bump_versions(db, TASKS, scopes)
+    # One event for the whole load rather than one per row: subscribers
+    # refetch
+    await notify_events(db, [json.dumps({"type": "bulk", "count": run.staged})])
+
+    await db.commit()
+
+    elapsed = time.perf_counter() - started
+    return TaskImportReport(
+        rows_received=run.received,
+        rows_imported=run.staged,
+        rows_failed=run.failed,
+        errors=sorted(run.errors, key=lambda error: error.row),
+        elapsed_seconds=round(elapsed, 3),
+        rows_per_second=round(run.received / elapsed, 1) if elapsed else 0.0,
+    )
+
+
+async def _read_file(path: str, size: int = 1 << 20) -> AsyncIterator[bytes]:
+    with open(path, "rb") as handle:
+        while block := handle.read(size):
+            yield block
+
+
+async def _main(args) -> int:
+    fmt = args.format or ("ndjson" if args.path.endswith((".ndjson", ".jsonl")) else "csv")
+
+    def progress(rows: int, elapsed: float) -> None:
+        print(f"{rows} rows read, {rows / elapsed:.0f} rows/s", file=sys.stderr)
+
+    try:
+        async with SessionLocal() as db:
+            result = await db.execute(select(User.id).where(User.email == args.created_by))
+            creator_id = result.scalar()
+            if creator_id is None:
+                print(f"No user with email {args.created_by}", file=sys.stderr)
+                return 1
+
+            report = await import_tasks(
+                db, _read_file(args.path), fmt, creator_id, on_progress=progress
+            )
+    finally:
+        await engine.dispose()
+
+    print(report.model_dump_json(indent=2))
+    return 0 if report.rows_failed == 0 else 2
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bulk import tasks from CSV or NDJSON")
+    parser.add_argument("path")
+    parser.add_argument("--created-by", required=True, help="email of the creating user")
+    parser.add_argument("--format", choices=sorted(RECORD_READERS))
+    sys.exit(asyncio.run(_main(parser.parse_args())))
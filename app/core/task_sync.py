@@ -0,0 +1,188 @@
+"""
+Delta sync for GET /tasks/changes.
+
+A watermark is an opaque (timestamp, task id) position in the combined,
+ordered stream of task writes (tasks.updated_at) and removals
+(task_tombstones.removed_at). Writes are stamped with now(), the start
+time of their transaction, but only become visible when it commits. So
+watermarks stop short of the oldest transaction still open on the
+database (pg_stat_activity.xact_start), however long it runs: its
+writes cannot land behind a watermark a client already holds.
+
+pg_stat_activity only shows xact_start for sessions of the same role,
+unless the app's role has pg_read_all_stats. Writes made under another
+role (migrations, manual fixes) are covered only by the fixed safety lag
+(TASK_CHANGES_SAFETY_LAG_SECONDS), which must exceed their longest
+transaction. A session left idle in a transaction holds watermarks back
+until it ends; idle_in_transaction_session_timeout bounds that.
+
+Tombstones older than the retention period are pruned from the shell:
+
+    python -m app.core.task_sync prune
+"""
+import asyncio
+import sys
+from datetime import datetime, timedelta, timezone
+from uuid import UUID
+
+from sqlalchemy import String, delete, func, insert, literal, select, text, tuple_, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.loaders import task_select
+from app.core.principals import Principal
+from app.database import SessionLocal, engine
+from app.models.task import Task
+from app.models.task_tombstone import TaskTombstone
+
+DELETED = "deleted"
+UNASSIGNED = "unassigned"
+
+# Position before every change: a full initial sync
+ORIGIN = (datetime(1970, 1, 1, tzinfo=timezone.utc), UUID(int=0))
+# Sorts after every task id at the same timestamp
+_LAST_ID = UUID(int=(1 << 128) - 1)
+
+
+async def record_tombstones(db: AsyncSession, changes) -> None:
+    tombstones = []
+    for change in changes:
+        if change.kind == "deleted":
+            tombstones.append({
+                "task_id": change.task_id,
+                "assigned_to_id": change.old_assignee_id,
+                "reason": DELETED,
+            })
+        elif change.old_assignee_id and change.old_assignee_id != change.new_assignee_id:
+            # Leaves the previous assignee's sync scope
+            tombstones.append({
+                "task_id": change.task_id,
+                "assigned_to_id": change.old_assignee_id,
+                "reason": UNASSIGNED,
+            })
+    if tombstones:
+        await db.execute(insert(TaskTombstone).values(tombstones))
+
+
+async def oldest_transaction_start(db: AsyncSession) -> datetime | None:
+    """Start time of the oldest other transaction open on this database."""
+    return (await db.execute(text(
+        "SELECT min(xact_start) FROM pg_stat_activity"
+        " WHERE datname = current_database() AND backend_type = 'client backend'"
+        " AND pid <> pg_backend_pid()"
+    ))).scalar_one()
+
+
+def retention_horizon(now: datetime) -> datetime:
+    return now - timedelta(days=settings.TASK_TOMBSTONE_RETENTION_DAYS)
+
+
+async def read_changes(
+    db: AsyncSession,
+    current_user: Principal,
+    since: tuple[datetime, UUID],
+    limit: int,
+    now: datetime,
+):
+    """
+    Up to `limit` changes after `since`, visible to `current_user`.
+    Returns (changed tasks, removals, new watermark, has_more).
+    """
+    upper = now - timedelta(seconds=settings.TASK_CHANGES_SAFETY_LAG_SECONDS)
+    oldest = await oldest_transaction_start(db)
+    if oldest is not None:
+        # Strictly before it: its writes may carry exactly that timestamp
+        upper = min(upper, oldest - timedelta(microseconds=1))
+
+    changed = select(
+        Task.id.label("task_id"),
+        Task.updated_at.label("changed_at"),
+        literal(None, String).label("reason"),
+    ).where(tuple_(Task.updated_at, Task.id) > since, Task.updated_at <= upper)
+
+    removed = select(
+        TaskTombstone.task_id,
+        TaskTombstone.removed_at,
+        TaskTombstone.reason,
+    ).where(
+        tuple_(TaskTombstone.removed_at, TaskTombstone.task_id) > since,
+        TaskTombstone.removed_at <= upper,
+    )
+
+    # Same scope as GET /tasks; EMPLOYEE also learns about tasks taken
+    # away from them
+    scoped = current_user.role not in ("ADMIN", "MANAGER")
+    if scoped:
+        changed = changed.where(Task.assigned_to_id == current_user.id)
+        removed = removed.where(TaskTombstone.assigned_to_id == current_user.id)
+    else:
+        removed = removed.where(TaskTombstone.reason == DELETED)
+
+    feed = union_all(changed, removed).subquery()
+    rows = (await db.execute(
+        select(feed)
+        .order_by(feed.c.changed_at, feed.c.task_id)
+        .limit(limit + 1)
+    )).all()
+
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    # Only the latest entry per task matters (e.g. unassigned, then
+    # assigned back)
+    latest = {row.task_id: row for row in rows}
+    changed_ids = [task_id for task_id, row in latest.items() if row.reason is None]
+    removals = [
+        {"task_id": row.task_id, "reason": row.reason, "removed_at": row.changed_at}
+        for row in latest.values()
+        if row.reason is not None
+    ]
+
+    tasks = []
+    if changed_ids:
+        query = task_select().where(Task.id.in_(changed_ids))
+        if scoped:
+            query = query.where(Task.assigned_to_id == current_user.id)
+        tasks = (await db.execute(query.order_by(Task.updated_at, Task.id))).scalars().all()
+
+        # Deleted, or reassigned away from an EMPLOYEE, since the feed was
+        # read: removed as far as this caller can tell. The tombstone that
+        # follows in a later sync repeats (or corrects) the reason.
+        reloaded = {task.id for task in tasks}
+        removals.extend(
+            {"task_id": task_id, "reason": UNASSIGNED if scoped else DELETED,
+             "removed_at": latest[task_id].changed_at}
+            for task_id in changed_ids
+            if task_id not in reloaded
+        )
+
+    watermark = (rows[-1].changed_at, rows[-1].task_id) if has_more else (upper, _LAST_ID)
+    return tasks, removals, watermark, has_more
+
+
+async def prune_tombstones(db: AsyncSession) -> int:
+    now = (await db.execute(select(func.now()))).scalar_one()
+    result = await db.execute(
+        delete(TaskTombstone).where(TaskTombstone.removed_at < retention_horizon(now))
+    )
+    await db.commit()
+    return result.rowcount
+
+
+async def _main(argv: list[str]) -> int:
+    if argv != ["prune"]:
+        print("usage: python -m app.core.task_sync prune", file=sys.stderr)
+        return 1
+
+    try:
+        async with SessionLocal() as db:
+            pruned = await prune_tombstones(db)
+    finally:
+        await engine.dispose()
+
+    print(f"{pruned} tombstones pruned")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(_main(sys.argv[1:])))
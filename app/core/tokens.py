@@ -0,0 +1,219 @@
+"""
+Access token verification, shared by every authenticated route.
+
+The signing key is parsed once, when the verifier is created, and
+verified claims are cached by a hash of the token until the token
+expires, so repeat requests with the same token skip signature checks
+entirely. Backends (JWT_BACKEND):
+
+- "builtin": HMAC (HS256 / HS384 / HS512) on hashlib / hmac directly;
+  the default. It accepts and rejects exactly the tokens "jose" does
+  (tests/test_tokens.py checks both on the same cases).
+- "jose": python-jose, as used before.
+- "pyjwt": PyJWT, if installed (optional dependency).
+"""
+import base64
+import hashlib
+import hmac
+import json
+import time
+
+from jose import JWTError, jwt as jose_jwt
+
+from app.core.config import settings
+from app.core.ttl_cache import TTLCache
+
+HMAC_DIGESTS = {"HS256": "sha256", "HS384": "sha384", "HS512": "sha512"}
+
+
+class InvalidToken(Exception):
+    pass
+
+
+class TokenVerifier:
+    """Backend interface: signed token in, claims out (or InvalidToken)."""
+
+    name: str = ""
+
+    def decode(self, token: str) -> dict:
+        raise NotImplementedError
+
+
+def _b64decode(segment: bytes) -> bytes:
+    # As python-jose: padding added by length, characters outside
+    # base64url skipped rather than rejected
+    return base64.urlsafe_b64decode(segment + b"=" * (-len(segment) % 4))
+
+
+def _loads(data: bytes):
+    # The stdlib parser, as python-jose: orjson differs at the edges
+    # (NaN, integers beyond 64 bits come back as floats)
+    return json.loads(data.decode("utf-8"))
+
+
+def _int_claim(claims: dict, name: str) -> int:
+    # Coerced with int(), as python-jose does: "123" and 1.5 pass
+    try:
+        return int(claims[name])
+    except (TypeError, ValueError, OverflowError):
+        raise InvalidToken(f"Invalid {name} claim")
+
+
+def _is_number(value) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+class BuiltinVerifier(TokenVerifier):
+    name = "builtin"
+
+    # Distinct header segments seen to be valid; tokens from one issuer
+    # all share one, so it is parsed once instead of per request
+    MAX_KNOWN_HEADERS = 8
+
+    def __init__(self, key: str, algorithm: str):
+        if algorithm not in HMAC_DIGESTS:
+            raise ValueError(f"The builtin JWT backend only supports {', '.join(HMAC_DIGESTS)}")
+        self.key = key.encode("utf-8")
+        self.algorithm = algorithm
+        self.digest = HMAC_DIGESTS[algorithm]
+        self._known_headers: set[bytes] = set()
+
+    def _check_header(self, segment: bytes) -> None:
+        if segment in self._known_headers:
+            return
+        header = _loads(_b64decode(segment))
+        if not isinstance(header, dict) or header.get("alg") != self.algorithm:
+            raise InvalidToken("Unexpected algorithm")
+        if len(self._known_headers) < self.MAX_KNOWN_HEADERS:
+            self._known_headers.add(segment)
+
+    def decode(self, token: str) -> dict:
+        try:
+            signing_input, _, signature = token.encode("utf-8").rpartition(b".")
+            header, dot, payload = signing_input.partition(b".")
+            if not dot:
+                raise InvalidToken("Malformed token")
+
+            self._check_header(header)
+            expected = hmac.digest(self.key, signing_input, self.digest)
+            if not hmac.compare_digest(expected, _b64decode(signature)):
+                raise InvalidToken("Signature verification failed")
+
+            claims = _loads(_b64decode(payload))
+        except ValueError:
+            # binascii.Error, UnicodeError and JSONDecodeError alike
+            raise InvalidToken("Malformed token")
+
+        if not isinstance(claims, dict):
+            raise InvalidToken("Malformed token")
+        # The registered claims python-jose checks, with its defaults
+        now = int(time.time())
+        if "iat" in claims:
+            _int_claim(claims, "iat")
+        if "nbf" in claims and _int_claim(claims, "nbf") > now:
+            raise InvalidToken("Token not yet valid")
+        if "exp" in claims and _int_claim(claims, "exp") < now:
+            raise InvalidToken("Token expired")
+        if "aud" in claims:
+            # Verified without an audience: any audience is the wrong one
+            raise InvalidToken("Invalid audience")
+        for name in ("sub", "jti"):
+            if name in claims and not isinstance(claims[name], str):
+                raise InvalidToken(f"Invalid {name} claim")
+        if "at_hash" in claims:
+            raise InvalidToken("No access token to check at_hash against")
+        return claims
+
+
+class JoseVerifier(TokenVerifier):
+    name = "jose"
+
+    def __init__(self, key: str, algorithm: str):
+        self.key = key
+        self.algorithms = [algorithm]
+
+    def decode(self, token: str) -> dict:
+        try:
+            return jose_jwt.decode(token, self.key, algorithms=self.algorithms)
+        except JWTError as exc:
+            raise InvalidToken(str(exc))
+        except (TypeError, ValueError, OverflowError) as exc:
+            # Raised as-is for some malformed claims (e.g. "exp": null)
+            # and tokens that are not valid UTF-8
+            raise InvalidToken(str(exc))
+
+
+class PyJWTVerifier(TokenVerifier):
+    name = "pyjwt"
+
+    def __init__(self, key: str, algorithm: str):
+        try:
+            import jwt
+        except ImportError:
+            raise RuntimeError('JWT_BACKEND "pyjwt" needs PyJWT: pip install PyJWT')
+        self._jwt = jwt
+        self.key = key
+        self.algorithms = [algorithm]
+
+    def decode(self, token: str) -> dict:
+        try:
+            return self._jwt.decode(token, self.key, algorithms=self.algorithms)
+        except self._jwt.PyJWTError as exc:
+            raise InvalidToken(str(exc))
+
+
+TOKEN_BACKENDS = {
+    backend.name: backend for backend in (BuiltinVerifier, JoseVerifier, PyJWTVerifier)
+}
+
+
+class CachingVerifier(TokenVerifier):
+    """
+    `backend` behind a per-process LRU of verified claims. Keys are token
+    digests (bearer tokens themselves are not kept), and an entry never
+    outlives its token's exp.
+    """
+
+    def __init__(self, backend: TokenVerifier, maxsize: int):
+        self.backend = backend
+        self.name = backend.name
+        self.cache = TTLCache(maxsize=maxsize, ttl=float(settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60))
+
+    def decode(self, token: str) -> dict:
+        key = hashlib.blake2b(token.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+        claims = self.cache.get(key)
+        if claims is not None:
+            return claims
+
+        claims = self.backend.decode(token)
+        exp = claims.get("exp")
+        if _is_number(exp):
+            ttl = exp - time.time()
+            if ttl > 0:
+                self.cache.set(key, claims, ttl=min(ttl, self.cache.ttl))
+        return claims
+
+
+_token_verifier: TokenVerifier | None = None
+
+
+def get_token_verifier() -> TokenVerifier:
+    global _token_verifier
+    if _token_verifier is None:
+        backend_name = settings.JWT_BACKEND
+        if backend_name not in TOKEN_BACKENDS:
+            raise ValueError(f"Unknown JWT backend: {backend_name}")
+        backend = TOKEN_BACKENDS[backend_name](settings.JWT_SECRET_KEY, settings.JWT_ALGORITHM)
+        _token_verifier = (
+            CachingVerifier(backend, settings.TOKEN_CACHE_SIZE)
+            if settings.TOKEN_CACHE_SIZE > 0 else backend
+        )
+    return _token_verifier
+
+
+def verify_access_token(token: str) -> dict:
+    """
+    Claims of a valid, unexpired access token; InvalidToken otherwise.
+    The dict may be shared with the cache: read it, do not modify it.
+    """
+    return get_token_verifier().decode(token)
@@ -1,28 +1,60 @@
+import time
+
+# First, so the import time reported by STARTUP_PROFILE covers everything
+_import_started = time.perf_counter()
+
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
 from app.database import engine
+from app.core.config import settings
+from app.core.security import shutdown_password_executor
+from app.core.db_pool import pool_status
+from app.core.response_cache import close_response_cache
+from app.core.task_events import task_event_broker
+from app.core.revocation import revocation_listener
+from app.core.rate_limit import RateLimitMiddleware, close_rate_limiter
+from app.core.instrumentation import (
+    RequestMetricsMiddleware,
+    instrument_queries,
+    render_metrics,
+)
+from app.core.metrics import PrometheusText
 from sqlalchemy import text
 from app.routers import users, auth, tasks
 from fastapi.middleware.cors import CORSMiddleware
-import subprocess
-import os
+from app.core.startup import StartupProfiler, run_migrations, warm_pool, warm_principals
 
-def run_migrations():
-    if os.getenv("RUN_MIGRATIONS", "false") != "true":
-        return
+profiler = StartupProfiler(settings.STARTUP_PROFILE)
 
-    try:
-        subprocess.run(
-            ["alembic", "upgrade", "head"],
-            check=True
-        )
-        print("✅ Alembic migrations applied")
-    except Exception as e:
-        print("❌ Alembic migration failed:", e)
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Migrations first: the revocation listener reads revoked_tokens
+    if settings.RUN_MIGRATIONS:
+        with profiler.step("migrations"):
+            await run_migrations(engine)
+    with profiler.step("revocations"):
+        await revocation_listener.start()
+    if settings.STARTUP_WARMUP:
+        with profiler.step("pool warmup"):
+            await warm_pool(engine, settings.DB_POOL_SIZE)
+        with profiler.step("principal warmup"):
+            await warm_principals(settings.PRINCIPAL_CACHE_SIZE)
+    profiler.report()
+    yield
+    await revocation_listener.close()
+    shutdown_password_executor()
+    await close_response_cache()
+    await close_rate_limiter()
+    await task_event_broker.close()
+    await engine.dispose()
 
 
-run_migrations()
-
-app = FastAPI(title="FlowTrack API")
+app = FastAPI(title="FlowTrack API", lifespan=lifespan)
+if settings.RATE_LIMIT_ENABLED:
+    # Added before CORS, so it runs inside it: 429s carry CORS headers
+    app.add_middleware(RateLimitMiddleware)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=[
@@ -34,17 +66,33 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "X-Total-Count", "ETag", "Server-Timing", "Retry-After"],
 )
+if settings.METRICS_ENABLED:
+    # Outermost, so latency includes every other middleware
+    app.add_middleware(RequestMetricsMiddleware, server_timing=settings.SERVER_TIMING_ENABLED)
+    instrument_queries(engine)
 app.include_router(users.router)
 app.include_router(auth.router)
 app.include_router(tasks.router)
 
 
 @app.get("/health")
-def health_check():
-    with engine.connect() as conn:
-        conn.execute(text("SELECT 1"))
+async def health_check():
+    async with engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
     return {"status": "ok", "database": "connected"}
 
 
+@app.get("/health/pool")
+async def pool_health():
+    return pool_status(engine)
+
+
+if settings.METRICS_ENABLED:
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics():
+        return PlainTextResponse(render_metrics(engine), media_type=PrometheusText.CONTENT_TYPE)
+
 
+profiler.record("import", time.perf_counter() - _import_started)
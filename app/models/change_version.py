@@ -0,0 +1,20 @@
+from sqlalchemy import BigInteger, Column, String
+
+from app.database import Base
+
+
+class ChangeVersion(Base):
+    """
+    Monotonic version per data scope, bumped in the same transaction as
+    the writes it covers (see app/core/change_versions.py). ETags are
+    built from these instead of hashing response bodies.
+
+    kind is "tasks" (key: assignee id as text, "" for unassigned) or
+    "users" (key: ""). A missing row is version 0.
+    """
+
+    __tablename__ = "change_versions"
+
+    kind = Column(String, primary_key=True)
+    key = Column(String, primary_key=True)
+    version = Column(BigInteger, nullable=False, default=0)
@@ -0,0 +1,19 @@
+from sqlalchemy import Column, DateTime, Index, String
+
+from app.database import Base
+
+
+class RevokedToken(Base):
+    """
+    A revoked access token id (session "sid" or token "jti"). Kept until
+    every access token it covers has expired; workers hold the live rows
+    in memory (app/core/revocation.py).
+    """
+
+    __tablename__ = "revoked_tokens"
+    __table_args__ = (
+        Index("ix_revoked_tokens_expires_at", "expires_at"),
+    )
+
+    token_id = Column(String, primary_key=True)
+    expires_at = Column(DateTime(timezone=True), nullable=False)
@@ -1,10 +1,10 @@
 # app/models/task.py
 import enum
 import uuid
-from sqlalchemy import Column, String, DateTime, ForeignKey
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, String, DateTime, ForeignKey, Index, text, Computed
+from sqlalchemy.dialects.postgresql import UUID, TSVECTOR
 from sqlalchemy.sql import func
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, deferred
 from sqlalchemy import Enum
 
 
@@ -20,6 +20,41 @@ class TaskStatus(str, enum.Enum):
 
 class Task(Base):
     __tablename__ = "tasks"
+    __table_args__ = (
+        # Keyset pagination: ORDER BY created_at DESC, id DESC
+        Index("ix_tasks_created_at_id", "created_at", "id"),
+        # list_tasks filter shapes, all ending in the same sort key
+        Index(
+            "ix_tasks_assigned_to_id_created_at_id",
+            "assigned_to_id", "created_at", "id",
+        ),
+        Index(
+            "ix_tasks_assigned_to_id_status_created_at_id",
+            "assigned_to_id", "status", "created_at", "id",
+        ),
+        Index("ix_tasks_status_created_at_id", "status", "created_at", "id"),
+        # Delta sync (GET /tasks/changes): rows changed after a watermark
+        Index("ix_tasks_updated_at_id", "updated_at", "id"),
+        Index(
+            "ix_tasks_unassigned_created_at_id",
+            "created_at", "id",
+            postgresql_where=text("assigned_to_id IS NULL"),
+        ),
+        # Search backends (app/core/search.py)
+        Index("ix_tasks_search_vector", "search_vector", postgresql_using="gin"),
+        Index(
+            "ix_tasks_title_trgm",
+            "title",
+            postgresql_using="gin",
+            postgresql_ops={"title": "gin_trgm_ops"},
+        ),
+        Index(
+            "ix_tasks_description_trgm",
+            "description",
+            postgresql_using="gin",
+            postgresql_ops={"description": "gin_trgm_ops"},
+        ),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     title = Column(String, nullable=False)
@@ -40,5 +75,18 @@ class Task(Base):
         onupdate=func.now()
     )
 
+    # Maintained by Postgres on insert/update; deferred so regular task
+    # queries never ship it over the wire.
+    search_vector = deferred(
+        Column(
+            TSVECTOR,
+            Computed(
+                "to_tsvector('english', "
+                "coalesce(title, '') || ' ' || coalesce(description, ''))",
+                persisted=True,
+            ),
+        )
+    )
+
     created_by = relationship("User", foreign_keys=[created_by_id])
     assigned_to = relationship("User", foreign_keys=[assigned_to_id])
\ No newline at end of file
@@ -0,0 +1,25 @@
+from sqlalchemy import BigInteger, Column, Enum, String
+
+from app.database import Base
+from app.models.task import TaskStatus
+
+
+class TaskCounter(Base):
+    """
+    Incrementally maintained task counts, updated in the same transaction
+    as every task write (see app/core/task_counters.py).
+
+    dimension is "assignee" or "creator"; key is the user id as text, or
+    "" for unassigned tasks. Overall per-status totals are the sum of the
+    assignee rows, so no single row is hit by every write.
+    """
+
+    __tablename__ = "task_counters"
+
+    dimension = Column(String, primary_key=True)
+    key = Column(String, primary_key=True)
+    status = Column(
+        Enum(TaskStatus, name="task_status_enum", create_type=False),
+        primary_key=True,
+    )
+    count = Column(BigInteger, nullable=False, default=0)
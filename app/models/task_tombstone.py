@@ -0,0 +1,29 @@
+from sqlalchemy import BigInteger, Column, DateTime, Index, String
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.sql import func
+
+from app.database import Base
+
+
+class TaskTombstone(Base):
+    """
+    A task leaving a sync scope, for GET /tasks/changes: reason "deleted"
+    (gone for everyone) or "unassigned" (no longer visible to
+    assigned_to_id, its previous assignee).
+    """
+
+    __tablename__ = "task_tombstones"
+    __table_args__ = (
+        # Delta sync keyset: (removed_at, task_id) after the watermark
+        Index("ix_task_tombstones_removed_at_task_id", "removed_at", "task_id"),
+        Index(
+            "ix_task_tombstones_assigned_to_id_removed_at_task_id",
+            "assigned_to_id", "removed_at", "task_id",
+        ),
+    )
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    task_id = Column(UUID(as_uuid=True), nullable=False)
+    assigned_to_id = Column(UUID(as_uuid=True), nullable=True)
+    reason = Column(String, nullable=False)
+    removed_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
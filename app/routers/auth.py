@@ -1,26 +1,106 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_db
 from app.models.user import User
-from app.schemas.auth import LoginRequest, TokenResponse
-from app.core.security import verify_password
+from app.schemas.auth import LoginRequest, RefreshRequest, TokenResponse
+from app.core.security import verify_password_async
 from app.core.jwt import create_access_token
+from app.core.dependencies import principal_from_token
+from app.core.principals import load_principal
+from app.core.revocation import revocation_list, revoke_token_ids
+from app.core.sessions import (
+    RefreshRejected,
+    issue_refresh_token,
+    new_session_id,
+    revoke_session,
+    rotate_refresh_token,
+)
+from app.core.tokens import verify_access_token
 
 router = APIRouter(prefix="/auth", tags=["Auth"])
 
+security = HTTPBearer()
+
 
 @router.post("/login", response_model=TokenResponse)
-def login(data: LoginRequest, db: Session = Depends(get_db)):
-    user = db.query(User).filter(User.email == data.email).first()
-    if not user or not verify_password(data.password, user.hashed_password):
+async def login(data: LoginRequest, db: AsyncSession = Depends(get_db)):
+    result = await db.execute(select(User).where(User.email == data.email))
+    user = result.scalars().first()
+    if not user or not await verify_password_async(data.password, user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid email or password"
         )
 
-    token = create_access_token(subject=str(user.id))
+    session_id = new_session_id()
+    refresh_token = issue_refresh_token(db, user.id, session_id)
+    await db.commit()
+
+    token = create_access_token(subject=str(user.id), role=user.role, session_id=session_id)
     return {
         "access_token": token,
-        "token_type": "bearer"
-    }
\ No newline at end of file
+        "token_type": "bearer",
+        "refresh_token": refresh_token,
+    }
+
+
+@router.post("/refresh", response_model=TokenResponse)
+async def refresh(data: RefreshRequest, db: AsyncSession = Depends(get_db)):
+    """
+    Exchange a refresh token for a new access token and the next refresh
+    token. No password check; the presented token cannot be used again.
+    """
+    try:
+        used, refresh_token = await rotate_refresh_token(db, data.refresh_token)
+    except RefreshRejected as exc:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=str(exc))
+
+    # Role / active flag as of now, not as of login
+    principal = await load_principal(db, used.user_id)
+    if principal is None or not principal.is_active:
+        await revoke_session(db, used.session_id)
+        await db.commit()
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User is inactive")
+
+    await db.commit()
+
+    token = create_access_token(
+        subject=str(principal.id), role=principal.role, session_id=used.session_id
+    )
+    return {
+        "access_token": token,
+        "token_type": "bearer",
+        "refresh_token": refresh_token,
+    }
+
+
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+async def logout(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    End the caller's session: its refresh tokens stop working at once,
+    its access tokens on every worker as soon as the revocation arrives.
+    """
+    await principal_from_token(credentials.credentials, db)
+    claims = verify_access_token(credentials.credentials)
+
+    session_id, token_id = claims.get("sid"), claims.get("jti")
+    if session_id:
+        revoked_id = session_id
+        expires_at = await revoke_session(db, session_id)
+    elif token_id:
+        revoked_id = token_id
+        expires_at = await revoke_token_ids(db, [token_id])
+    else:
+        # Issued before sessions existed: nothing to revoke it by
+        return Response(status_code=status.HTTP_204_NO_CONTENT)
+    await db.commit()
+
+    # This worker need not wait for its own NOTIFY
+    revocation_list.add(revoked_id, expires_at)
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
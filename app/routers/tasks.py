@@ -1,16 +1,72 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from uuid import UUID
+from sqlalchemy.ext.asyncio import AsyncSession
+from uuid import UUID, uuid4
 from typing import Optional
-from fastapi import Query
-from sqlalchemy import or_
+from fastapi import Query, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy import func, insert, select, tuple_, update
 
 from app.database import get_db
 from app.models.task import Task, TaskStatus
 from app.models.user import User
-from app.schemas.task import TaskCreate, TaskResponse, TaskUpdateStatus
-from app.core.dependencies import get_current_user
+from app.schemas.task import (
+    TaskCreate,
+    TaskResponse,
+    TaskUpdateStatus,
+    TaskBatchCreate,
+    TaskStatusBatch,
+    TaskAssignBatch,
+    TaskBatchItemResult,
+    TaskBatchResponse,
+    TaskImportReport,
+    TaskStats,
+    TaskChanges,
+)
+from app.core.dependencies import get_current_user, get_stream_user
+from app.core.principals import Principal
 from app.core.permissions import require_roles
+from app.core.loaders import load_task
+from app.core.pagination import (
+    encode_cursor,
+    decode_cursor,
+    encode_watermark,
+    decode_watermark,
+)
+from app.core.search import get_task_search
+from app.core.export import (
+    EXPORT_BATCH_SIZE,
+    EXPORT_COLUMNS,
+    EXPORT_MEDIA_TYPES,
+    stream_export,
+)
+from app.core.task_import import import_tasks
+from app.core.task_changes import TaskChange, record_task_changes
+from app.core.task_counters import (
+    ASSIGNEE,
+    UNASSIGNED,
+    count_assigned,
+    read_counters,
+    summarize_counters,
+)
+from app.core.counting import exact_count, estimated_count
+from app.core.change_versions import TASKS, USERS, read_versions
+from app.core.etags import etag_matches, make_etag, not_modified, set_etag
+from app.core.task_events import stream_events, task_event_broker
+from app.core.task_sync import ORIGIN, read_changes, retention_horizon
+from app.core.response_cache import (
+    cache_key,
+    decode_entry,
+    encode_entry,
+    get_response_cache,
+    json_response,
+)
+from app.core.serialization import (
+    FastJSONResponse,
+    TaskFieldset,
+    dumps,
+    task_payload,
+    task_rows_select,
+)
 
 router = APIRouter(prefix="/tasks", tags=["Tasks"])
 
@@ -21,11 +77,86 @@ VALID_TRANSITIONS = {
 }
 
 
+def apply_task_filters(
+    query,
+    current_user: Principal,
+    task_status: Optional[TaskStatus],
+    assigned: Optional[str],
+    q: Optional[str],
+):
+    """
+    RBAC scope plus the status / assignment / search filters of GET /tasks.
+    Shared by every endpoint that reads task collections.
+    """
+    # RBAC base query
+    if current_user.role not in ("ADMIN", "MANAGER"):
+        query = query.where(Task.assigned_to_id == current_user.id)
+
+    # Status filter
+    if task_status:
+        query = query.where(Task.status == task_status)
+
+    # Assignment filter
+    if assigned == "me":
+        query = query.where(Task.assigned_to_id == current_user.id)
+
+    elif assigned == "unassigned":
+        if current_user.role not in ("ADMIN", "MANAGER"):
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Not allowed to view unassigned tasks",
+            )
+        query = query.where(Task.assigned_to_id.is_(None))
+
+    # Search (title + description)
+    if q:
+        query = query.where(get_task_search().filter(q))
+
+    return query
+
+
+def assignee_scope(current_user: Principal, assigned: Optional[str]) -> Optional[str]:
+    """
+    Assignee key a GET /tasks listing is limited to (None: all tasks),
+    for its total and its change version. Matches the RBAC / assignment
+    part of apply_task_filters.
+    """
+    if assigned == "unassigned":
+        return UNASSIGNED
+    if assigned == "me" or current_user.role not in ("ADMIN", "MANAGER"):
+        return str(current_user.id)
+    return None
+
+
+async def count_tasks(
+    db: AsyncSession,
+    mode: str,
+    current_user: Principal,
+    task_status: Optional[TaskStatus],
+    assigned: Optional[str],
+    q: Optional[str],
+) -> Optional[int]:
+    """Total for ?count=; None when not requested."""
+    if mode == "none":
+        return None
+
+    scope = assignee_scope(current_user, assigned)
+    if mode == "exact" and not q:
+        # Scope / status filters only: read the materialized counters
+        return await count_assigned(db, scope, task_status)
+
+    query = apply_task_filters(select(Task.id), current_user, task_status, assigned, q)
+    if mode == "estimated":
+        return await estimated_count(db, query)
+    cache_key = (scope, task_status, get_task_search().name, q)
+    return await exact_count(db, query, cache_key)
+
+
 @router.post("/", response_model=TaskResponse)
-def create_task(
+async def create_task(
     task: TaskCreate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
 ):
     # Only ADMIN / MANAGER can create tasks
     if current_user.role not in ["ADMIN", "MANAGER"]:
@@ -36,7 +167,7 @@ def create_task(
 
     # Assignment validation (if assignment requested)
     if task.assigned_to_id:
-        assignee = db.query(User).filter(User.id == task.assigned_to_id).first()
+        assignee = await db.get(User, task.assigned_to_id)
         if not assignee:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -57,70 +188,556 @@ def create_task(
     )
 
     db.add(new_task)
-    db.commit()
-    db.refresh(new_task)
+    await db.flush()
+    task_id = new_task.id
+    await record_task_changes(db, [TaskChange(
+        task_id=task_id,
+        created_by_id=new_task.created_by_id,
+        old_status=None,
+        new_status=new_task.status,
+        old_assignee_id=None,
+        new_assignee_id=new_task.assigned_to_id,
+    )])
+    await db.commit()
 
-    return new_task
+    return await load_task(db, task_id)
 
 
 @router.get("/", response_model=list[TaskResponse])
-def list_tasks(
+async def list_tasks(
+    request: Request,
     status: Optional[TaskStatus] = Query(None),
     assigned: Optional[str] = Query(None),
     q: Optional[str] = Query(None),
     page: int = Query(1, ge=1),
     limit: int = Query(10, ge=1, le=50),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    after: Optional[str] = Query(None),
+    sort: str = Query("recent", pattern="^(recent|relevance)$"),
+    count: str = Query("none", pattern="^(none|exact|estimated)$"),
+    fields: Optional[str] = Query(
+        None,
+        description="Comma-separated task fields to return, e.g. "
+        "id,title,status,assigned_to.full_name (default: all)",
+    ),
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
 ):
+    """
+    fields= narrows both the SELECT and each item: only the listed fields
+    are returned, and users is not joined unless assignee fields other
+    than its id are requested.
+
+    count=exact|estimated adds an X-Total-Count header for the filters
+    (ignoring page / cursor). Exact totals come from the task counters,
+    or for searches from a COUNT cached for a few seconds; estimated
+    totals are the planner's row estimate.
+
+    The ETag comes from the change versions of the listed scope (and of
+    users, when assignee fields are embedded), so If-None-Match is
+    answered with 304 before the task query runs. Otherwise the serialized
+    response is served from the response cache when an entry for the same
+    parameters, scope and versions exists.
+    """
+    search = get_task_search()
+    rank = search.rank(q) if q and sort == "relevance" else None
+
+    if rank is not None and after:
+        raise HTTPException(
+            status_code=400,
+            detail="Cursor pagination is only available with sort=recent",
+        )
 
-    query = db.query(Task)
+    # Cursor mode: `after` takes precedence over `page`
+    cursor = None
+    if after:
+        try:
+            cursor = decode_cursor(after)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    try:
+        fieldset = TaskFieldset.parse(fields)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+    # Plain column tuples, serialized without per-row model validation
+    query = apply_task_filters(fieldset.select(), current_user, status, assigned, q)
+    scope = assignee_scope(current_user, assigned)
+
+    # User edits only matter when assignee fields are embedded
+    tracked = {TASKS: scope, USERS: None} if fieldset.joins_users else {TASKS: scope}
+    versions = await read_versions(db, tracked)
+    etag = make_etag(
+        "tasks", current_user.id, current_user.role, search.name,
+        request.url.query, versions[TASKS], versions.get(USERS),
+    )
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
+    # Same scope + normalized parameters + versions => same response,
+    # whoever asks (e.g. every manager's first page of TODO tasks)
+    response_cache = get_response_cache()
+    key = cache_key(
+        "tasks", scope, status, q or None, search.name, sort, count, limit,
+        after if cursor else page, fieldset.key, versions[TASKS], versions.get(USERS),
+    )
+    entry = await response_cache.get(key) if response_cache else None
+    if entry is not None:
+        headers, body = decode_entry(entry)
+        response = json_response(body, headers)
+        set_etag(response, etag)
+        return response
+
+    # Relevance first when requested; the search backend may not rank
+    if rank is not None:
+        query = query.order_by(rank.desc())
+
+    # id breaks ties so the order is total and keyset cursors are stable
+    query = query.order_by(Task.created_at.desc(), Task.id.desc())
+
+    if cursor:
+        query = query.where(tuple_(Task.created_at, Task.id) < cursor)
+    else:
+        query = query.offset((page - 1) * limit)
+
+    headers = {}
+
+    # Fetch one extra row to know whether another page exists
+    rows = (await db.execute(query.limit(limit + 1))).all()
+    if len(rows) > limit:
+        rows = rows[:limit]
+        # Cursors follow (created_at, id); ranked pages are offset-only
+        if rank is None:
+            last = rows[-1]
+            headers["X-Next-Cursor"] = encode_cursor(last.created_at, last.id)
+
+    total = await count_tasks(db, count, current_user, status, assigned, q)
+    if total is not None:
+        headers["X-Total-Count"] = str(total)
+
+    body = dumps([fieldset.payload(row) for row in rows])
+    if response_cache:
+        await response_cache.set(key, encode_entry(headers, body))
+
+    response = json_response(body, headers)
+    set_etag(response, etag)
+    return response
+
+
+@router.get("/export")
+async def export_tasks(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    status: Optional[TaskStatus] = Query(None),
+    assigned: Optional[str] = Query(None),
+    q: Optional[str] = Query(None),
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
+):
+    """
+    Stream every task matching the GET /tasks filters as NDJSON or CSV.
+
+    Rows come from a server-side cursor in batches of EXPORT_BATCH_SIZE
+    and are encoded as plain tuples, so memory stays flat however many
+    tasks match.
+    """
+    query = (
+        select(*EXPORT_COLUMNS)
+        .outerjoin(User, Task.assigned_to_id == User.id)
+    )
+    query = apply_task_filters(query, current_user, status, assigned, q)
+    query = query.order_by(Task.created_at.desc(), Task.id.desc())
 
-    # RBAC base query
-    if current_user.role not in ("ADMIN", "MANAGER"):
-        query = query.filter(Task.assigned_to_id == current_user.id)
+    result = await db.stream(query.execution_options(yield_per=EXPORT_BATCH_SIZE))
 
-    # Status filter
-    if status:
-        query = query.filter(Task.status == status)
+    return StreamingResponse(
+        stream_export(result, format),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="tasks.{format}"'},
+    )
 
-    # Assignment filter
-    if assigned == "me":
-        query = query.filter(Task.assigned_to_id == current_user.id)
+@router.post("/import", response_model=TaskImportReport)
+async def import_tasks_upload(
+    request: Request,
+    format: str = Query("csv", pattern="^(csv|ndjson)$"),
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
+):
+    """
+    Bulk-load tasks from a streamed CSV / NDJSON request body.
 
-    elif assigned == "unassigned":
-        if current_user.role not in ("ADMIN", "MANAGER"):
+    Rows are validated against TaskImportRow in chunks and loaded with
+    COPY; the report lists per-row errors and throughput.
+    """
+    if current_user.role not in ["ADMIN", "MANAGER"]:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You are not allowed to create tasks",
+        )
+
+    return await import_tasks(db, request.stream(), format, current_user.id)
+
+@router.get("/stats", response_model=TaskStats)
+async def task_stats(
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
+):
+    """
+    Task counts from the task_counters table: O(assignees + creators)
+    rows instead of an aggregate over tasks. EMPLOYEE sees their own
+    assigned tasks only.
+    """
+    if current_user.role in ("ADMIN", "MANAGER"):
+        rows = await read_counters(db)
+        return summarize_counters(rows, breakdown=True)
+
+    rows = await read_counters(db, ASSIGNEE, str(current_user.id))
+    return summarize_counters(rows, breakdown=False)
+
+@router.get("/events")
+async def task_events(
+    request: Request,
+    last_event_id: Optional[str] = Query(None),
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_stream_user),
+):
+    """
+    Server-sent events for task created / status / assigned / deleted
+    (and "bulk" after an import), filtered like GET /tasks for the caller.
+
+    Reconnecting with Last-Event-ID (sent automatically by EventSource, or
+    ?last_event_id=) replays what was missed if it is still buffered;
+    otherwise a "reset" event tells the client to refetch. The caller's
+    role is fixed for the lifetime of the stream.
+    """
+    # Authentication is done: the stream must not pin a pooled connection
+    await db.close()
+
+    await task_event_broker.start()
+    subscriber = task_event_broker.subscribe(
+        current_user, request.headers.get("last-event-id") or last_event_id
+    )
+    return StreamingResponse(
+        stream_events(task_event_broker, subscriber),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+@router.get("/changes", response_model=TaskChanges)
+async def task_changes(
+    since: Optional[str] = Query(None),
+    limit: int = Query(500, ge=1, le=1000),
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
+):
+    """
+    Tasks created, updated or removed from the caller's scope after the
+    `since` watermark (omit it for a full initial sync). Keep calling
+    with the returned watermark while has_more is true.
+    """
+    now = (await db.execute(select(func.now()))).scalar_one()
+
+    if since is None:
+        position = ORIGIN
+    else:
+        try:
+            position, issued_at = decode_watermark(since)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid watermark")
+        # Tombstones before the horizon are pruned: a client that last
+        # synced before it may have missed deletes
+        if issued_at < retention_horizon(now):
             raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Not allowed to view unassigned tasks",
+                status_code=status.HTTP_410_GONE,
+                detail="Watermark expired, sync again without since",
             )
-        query = query.filter(Task.assigned_to_id.is_(None))
 
-    # Search (title + description)
-    if q:
-        query = query.filter(
-            or_(
-                Task.title.ilike(f"%{q}%"),
-                Task.description.ilike(f"%{q}%"),
-            )
+    tasks, removals, watermark, has_more = await read_changes(
+        db, current_user, position, limit, now
+    )
+    return {
+        "changed": tasks,
+        "removed": removals,
+        "watermark": encode_watermark(*watermark, now),
+        "has_more": has_more,
+    }
+
+# ---------------------------------------------------------------------------
+# Batch endpoints
+#
+# Same rules as the single-task endpoints, applied per item. Lookups are
+# one query per batch, writes are multi-row statements, and everything
+# commits in a single transaction. Each item gets its own result; invalid
+# items are skipped without failing the rest.
+# ---------------------------------------------------------------------------
+
+async def _load_assignee_roles(db: AsyncSession, user_ids) -> dict[UUID, str]:
+    if not user_ids:
+        return {}
+    result = await db.execute(
+        select(User.id, User.role).where(User.id.in_(set(user_ids)))
+    )
+    return dict(result.all())
+
+
+def _assignee_error(roles: dict[UUID, str], assignee_id: UUID) -> str | None:
+    role = roles.get(assignee_id)
+    if role is None:
+        return "Assigned user does not exist"
+    if role != "EMPLOYEE":
+        return "Tasks can only be assigned to EMPLOYEE users"
+    return None
+
+
+def _ok(index: int, task_id: UUID) -> TaskBatchItemResult:
+    return TaskBatchItemResult(
+        index=index, ok=True, task_id=task_id, status_code=status.HTTP_200_OK
+    )
+
+
+def _failed(index: int, task_id: UUID | None, status_code: int, error: str) -> TaskBatchItemResult:
+    return TaskBatchItemResult(
+        index=index, ok=False, task_id=task_id, status_code=status_code, error=error
+    )
+
+
+def _batch_response(results: list[TaskBatchItemResult]) -> TaskBatchResponse:
+    succeeded = sum(1 for result in results if result.ok)
+    return TaskBatchResponse(
+        succeeded=succeeded,
+        failed=len(results) - succeeded,
+        results=results,
+    )
+
+
+@router.post("/batch", response_model=TaskBatchResponse)
+async def create_tasks_batch(
+    payload: TaskBatchCreate,
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
+):
+    if current_user.role not in ["ADMIN", "MANAGER"]:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You are not allowed to create tasks",
         )
 
-    query = query.order_by(Task.created_at.desc())
+    roles = await _load_assignee_roles(
+        db, [item.assigned_to_id for item in payload.items if item.assigned_to_id]
+    )
 
-    offset = (page - 1) * limit
+    results = []
+    rows = []
+    changes = []
+    for index, item in enumerate(payload.items):
+        if item.assigned_to_id:
+            error = _assignee_error(roles, item.assigned_to_id)
+            if error:
+                results.append(_failed(index, None, status.HTTP_400_BAD_REQUEST, error))
+                continue
+
+        task_id = uuid4()
+        changes.append(TaskChange(
+            task_id=task_id,
+            created_by_id=current_user.id,
+            old_status=None,
+            new_status=TaskStatus.TODO,
+            old_assignee_id=None,
+            new_assignee_id=item.assigned_to_id,
+        ))
+        rows.append({
+            "id": task_id,
+            "title": item.title,
+            "description": item.description,
+            "status": TaskStatus.TODO,
+            "created_by_id": current_user.id,
+            "assigned_to_id": item.assigned_to_id,
+        })
+        results.append(_ok(index, task_id))
+
+    if rows:
+        # A single multi-row INSERT ... VALUES statement
+        await db.execute(insert(Task).values(rows))
+        await record_task_changes(db, changes)
+        await db.commit()
+
+    return _batch_response(results)
+
+
+@router.patch("/batch/status", response_model=TaskBatchResponse)
+async def update_task_status_batch(
+    payload: TaskStatusBatch,
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
+):
+    # Lock the rows so transitions are validated against committed state
+    result = await db.execute(
+        select(Task.id, Task.status, Task.assigned_to_id, Task.created_by_id)
+        .where(Task.id.in_({item.task_id for item in payload.items}))
+        .with_for_update()
+    )
+    tasks = {row.id: row for row in result.all()}
+
+    # Track the status as items apply, so a task listed twice moves
+    # TODO -> IN_PROGRESS -> DONE within one batch
+    current_status = {task_id: row.status for task_id, row in tasks.items()}
+
+    results = []
+    for index, item in enumerate(payload.items):
+        task = tasks.get(item.task_id)
+        if not task:
+            results.append(_failed(index, item.task_id, status.HTTP_404_NOT_FOUND, "Task not found"))
+            continue
+
+        if current_user.role == "EMPLOYEE":
+            if task.assigned_to_id != current_user.id:
+                results.append(_failed(
+                    index, item.task_id, status.HTTP_403_FORBIDDEN,
+                    "You can only update your assigned tasks",
+                ))
+                continue
+
+            from_status = current_status[item.task_id]
+            if item.status not in VALID_TRANSITIONS.get(from_status, []):
+                results.append(_failed(
+                    index, item.task_id, status.HTTP_400_BAD_REQUEST,
+                    f"Invalid status transition from {from_status}",
+                ))
+                continue
+
+        current_status[item.task_id] = item.status
+        results.append(_ok(index, item.task_id))
+
+    # One UPDATE per target status (at most len(TaskStatus) statements)
+    changed: dict[TaskStatus, list[UUID]] = {}
+    changes = []
+    for task_id, new_status in current_status.items():
+        task = tasks[task_id]
+        if new_status != task.status:
+            changed.setdefault(new_status, []).append(task_id)
+            changes.append(TaskChange(
+                task_id=task_id,
+                created_by_id=task.created_by_id,
+                old_status=task.status,
+                new_status=new_status,
+                old_assignee_id=task.assigned_to_id,
+                new_assignee_id=task.assigned_to_id,
+            ))
+
+    for new_status, task_ids in changed.items():
+        await db.execute(
+            update(Task).where(Task.id.in_(task_ids)).values(status=new_status)
+        )
+    await record_task_changes(db, changes)
+    await db.commit()
 
-    return query.offset(offset).limit(limit).all()
+    return _batch_response(results)
 
 
+@router.patch("/batch/assign", response_model=TaskBatchResponse)
+async def assign_tasks_batch(
+    payload: TaskAssignBatch,
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
+):
+    if current_user.role not in ["ADMIN", "MANAGER"]:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You are not allowed to assign tasks",
+        )
+
+    result = await db.execute(
+        select(Task.id, Task.status, Task.assigned_to_id, Task.created_by_id)
+        .where(Task.id.in_({item.task_id for item in payload.items}))
+        .with_for_update()
+    )
+    tasks = {row.id: row for row in result.all()}
+    roles = await _load_assignee_roles(db, [item.assignee_id for item in payload.items])
+
+    results = []
+    assignments: dict[UUID, UUID] = {}
+    for index, item in enumerate(payload.items):
+        if item.task_id not in tasks:
+            results.append(_failed(index, item.task_id, status.HTTP_404_NOT_FOUND, "Task not found"))
+            continue
+
+        error = _assignee_error(roles, item.assignee_id)
+        if error:
+            results.append(_failed(index, item.task_id, status.HTTP_400_BAD_REQUEST, error))
+            continue
+
+        # Last assignment wins for a task listed more than once
+        assignments[item.task_id] = item.assignee_id
+        results.append(_ok(index, item.task_id))
+
+    # One UPDATE per assignee
+    by_assignee: dict[UUID, list[UUID]] = {}
+    changes = []
+    for task_id, assignee_id in assignments.items():
+        task = tasks[task_id]
+        if task.assigned_to_id != assignee_id:
+            by_assignee.setdefault(assignee_id, []).append(task_id)
+            changes.append(TaskChange(
+                task_id=task_id,
+                created_by_id=task.created_by_id,
+                old_status=task.status,
+                new_status=task.status,
+                old_assignee_id=task.assigned_to_id,
+                new_assignee_id=assignee_id,
+            ))
+
+    for assignee_id, task_ids in by_assignee.items():
+        await db.execute(
+            update(Task).where(Task.id.in_(task_ids)).values(assigned_to_id=assignee_id)
+        )
+    await record_task_changes(db, changes)
+    await db.commit()
+
+    return _batch_response(results)
+
+
+@router.get("/{task_id}", response_model=TaskResponse)
+async def get_task(
+    task_id: UUID,
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
+):
+    row = (await db.execute(task_rows_select().where(Task.id == task_id))).first()
+
+    if not row:
+        raise HTTPException(status_code=404, detail="Task not found")
+
+    if current_user.role not in ("ADMIN", "MANAGER") and row.assigned_to_id != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You can only view your assigned tasks",
+        )
+
+    # updated_at moves on every task write; the embedded assignee is part
+    # of the representation too
+    etag = make_etag(
+        "task", row.id, row.updated_at.isoformat(), row.assigned_to_id,
+        row.assignee_email, row.assignee_full_name, row.assignee_role, row.assignee_is_active,
+    )
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
+    response = FastJSONResponse(task_payload(row))
+    set_etag(response, etag)
+    return response
+
 
 @router.patch("/{task_id}/status", response_model=TaskResponse)
-def update_task_status(
+async def update_task_status(
     task_id: UUID,
     payload: TaskUpdateStatus,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
 ):
-    task = db.query(Task).filter(Task.id == task_id).first()
+    # Locked until commit: the counter deltas are computed from the old
+    # status / assignee read here. Taking the task lock first also keeps
+    # the lock order of the batch endpoints (tasks, then counters)
+    task = await db.get(Task, task_id, with_for_update=True)
 
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
@@ -143,18 +760,30 @@ def update_task_status(
             )
 
     # ADMIN / MANAGER can override workflow
+    change = TaskChange(
+        task_id=task.id,
+        created_by_id=task.created_by_id,
+        old_status=task.status,
+        new_status=payload.status,
+        old_assignee_id=task.assigned_to_id,
+        new_assignee_id=task.assigned_to_id,
+    )
     task.status = payload.status
-    db.commit()
-    db.refresh(task)
+    await record_task_changes(db, [change])
+    # Read back under the lock: after the commit, a concurrent delete
+    # could leave nothing to return
+    await db.flush()
+    task = await load_task(db, task_id)
+    await db.commit()
 
     return task
 
 @router.patch("/{task_id}/assign", response_model=TaskResponse)
-def assign_task(
+async def assign_task(
     task_id: UUID,
     assignee_id: UUID,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
 ):
     # RBAC
     if current_user.role not in ["ADMIN", "MANAGER"]:
@@ -163,11 +792,11 @@ def assign_task(
             detail="You are not allowed to assign tasks",
         )
 
-    task = db.query(Task).filter(Task.id == task_id).first()
+    task = await db.get(Task, task_id, with_for_update=True)
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
 
-    assignee = db.query(User).filter(User.id == assignee_id).first()
+    assignee = await db.get(User, assignee_id)
     if not assignee:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -180,17 +809,27 @@ def assign_task(
             detail="Tasks can only be assigned to EMPLOYEE users",
         )
 
+    change = TaskChange(
+        task_id=task.id,
+        created_by_id=task.created_by_id,
+        old_status=task.status,
+        new_status=task.status,
+        old_assignee_id=task.assigned_to_id,
+        new_assignee_id=assignee_id,
+    )
     task.assigned_to_id = assignee_id
-    db.commit()
-    db.refresh(task)
+    await record_task_changes(db, [change])
+    await db.flush()
+    task = await load_task(db, task_id)
+    await db.commit()
 
     return task
 
 @router.delete("/{task_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_task(
+async def delete_task(
     task_id: UUID,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
 ):
     # RBAC: only ADMIN / MANAGER
     if current_user.role not in ["ADMIN", "MANAGER"]:
@@ -199,11 +838,19 @@ def delete_task(
             detail="You are not allowed to delete tasks",
         )
 
-    task = db.query(Task).filter(Task.id == task_id).first()
+    task = await db.get(Task, task_id, with_for_update=True)
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
 
-    db.delete(task)
-    db.commit()
+    await db.delete(task)
+    await record_task_changes(db, [TaskChange(
+        task_id=task.id,
+        created_by_id=task.created_by_id,
+        old_status=task.status,
+        new_status=None,
+        old_assignee_id=task.assigned_to_id,
+        new_assignee_id=None,
+    )])
+    await db.commit()
 
     return
\ No newline at end of file
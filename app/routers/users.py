@@ -1,32 +1,31 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from app.database import get_db
 from app.models.user import User
 from app.schemas.user import UserCreate, UserResponse
-from app.core.security import hash_password
-from app.core.dependencies import get_current_user
+from app.core.security import hash_password_async
+from app.core.dependencies import get_current_user, principal_from_token
 from app.core.permissions import require_roles
+from app.core.principals import Principal
 from app.models.enums import UserRole
-from app.core.security import decode_access_token
-from jose import JWTError
+from app.core.change_versions import USERS, bump_versions, read_versions
+from app.core.etags import etag_matches, make_etag, not_modified, set_etag
+from app.core.serialization import USER_COLUMNS, FastJSONResponse, user_payload
 
 router = APIRouter(prefix="/users", tags=["Users"])
 
 optional_security = HTTPBearer(auto_error=False)
 
-def get_optional_current_user(
+async def get_optional_current_user(
     credentials: HTTPAuthorizationCredentials | None = Depends(optional_security),
-    db: Session = Depends(get_db),
-) -> User | None:
+    db: AsyncSession = Depends(get_db),
+) -> Principal | None:
     if credentials is None:
         return None
 
-    token = credentials.credentials
-    payload = decode_access_token(token)
-
-    user = db.query(User).filter(User.id == payload["sub"]).first()
-    return user
+    return await principal_from_token(credentials.credentials, db)
 
 # @router.post("/", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
 # def create_user(user: UserCreate, db: Session = Depends(get_db)):
@@ -51,10 +50,10 @@ def get_optional_current_user(
 #     return new_user
 
 @router.post("/", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
-def create_user(
+async def create_user(
     user: UserCreate,
-    db: Session = Depends(get_db),
-    current_user: User | None = Depends(get_optional_current_user),
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal | None = Depends(get_optional_current_user),
 ):
     """
     User creation endpoint.
@@ -79,30 +78,36 @@ def create_user(
     # 🟢 ADMIN / MANAGER → allowed
 
     # Duplicate check
-    existing_user = db.query(User).filter(User.email == user.email).first()
+    result = await db.execute(select(User).where(User.email == user.email))
+    existing_user = result.scalars().first()
     if existing_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="User with this email already exists"
         )
 
+    # Hashed on the password pool, off the request threadpool
+    hashed_password = await hash_password_async(user.password)
+
     new_user = User(
         email=user.email,
         full_name=user.full_name,
         role=user.role.value,
-        hashed_password=hash_password(user.password),
+        hashed_password=hashed_password,
     )
 
     db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+    await bump_versions(db, USERS, [""])
+    await db.commit()
+    await db.refresh(new_user)
 
     return new_user
 
 @router.get("/", response_model=list[dict])
-def list_users(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+async def list_users(
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
 ):
     if current_user.role not in ["ADMIN", "MANAGER"]:
         raise HTTPException(
@@ -110,27 +115,46 @@ def list_users(
             detail="Not allowed",
         )
 
-    users = (
-        db.query(User)
-        .filter(User.role == "EMPLOYEE")
-        .all()
+    versions = await read_versions(db, {USERS: None})
+    etag = make_etag("users", versions[USERS])
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
+    # Only the three listed columns, as tuples
+    result = await db.execute(
+        select(User.id, User.email, User.role).where(User.role == "EMPLOYEE")
     )
 
-    return [
-        {
-            "id": user.id,
-            "email": user.email,
-            "role": user.role,
-        }
-        for user in users
-    ]
+    response = FastJSONResponse([
+        {"id": user_id, "email": email, "role": role}
+        for user_id, email, role in result
+    ])
+    set_etag(response, etag)
+    return response
 
 @router.get("/me", response_model=UserResponse)
-def read_me(current_user: User = Depends(get_current_user)):
-    return current_user
+async def read_me(
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
+):
+    versions = await read_versions(db, {USERS: None})
+    etag = make_etag("me", current_user.id, versions[USERS])
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
+    # The principal only carries auth fields; the profile needs the row
+    result = await db.execute(select(*USER_COLUMNS).where(User.id == current_user.id))
+    row = result.first()
+    if not row:
+        raise HTTPException(status_code=404, detail="User not found")
+
+    response = FastJSONResponse(user_payload(row))
+    set_etag(response, etag)
+    return response
 
 @router.get("/elevated")
-def elevated_access(
-    current_user: User = Depends(require_roles("ADMIN", "MANAGER"))
+async def elevated_access(
+    current_user: Principal = Depends(require_roles("ADMIN", "MANAGER"))
 ):
     return {"message": "You have elevated access"}
@@ -6,4 +6,9 @@ class LoginRequest(BaseModel):
 
 class TokenResponse(BaseModel):
     access_token: str
-    token_type: str = "bearer"
\ No newline at end of file
+    token_type: str = "bearer"
+    refresh_token: str
+
+
+class RefreshRequest(BaseModel):
+    refresh_token: str
\ No newline at end of file
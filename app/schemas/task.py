@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from uuid import UUID
 from datetime import datetime
 from app.models.task import TaskStatus
@@ -30,3 +30,88 @@ class TaskResponse(BaseModel):
 
 class TaskUpdateStatus(BaseModel):
     status: TaskStatus
+
+
+# Upper bound on items per batch request: keeps one transaction (and the
+# row locks it holds) short
+MAX_BATCH_SIZE = 1000
+
+
+class TaskBatchCreate(BaseModel):
+    items: list[TaskCreate] = Field(min_length=1, max_length=MAX_BATCH_SIZE)
+
+
+class TaskStatusBatchItem(BaseModel):
+    task_id: UUID
+    status: TaskStatus
+
+
+class TaskStatusBatch(BaseModel):
+    items: list[TaskStatusBatchItem] = Field(min_length=1, max_length=MAX_BATCH_SIZE)
+
+
+class TaskAssignBatchItem(BaseModel):
+    task_id: UUID
+    assignee_id: UUID
+
+
+class TaskAssignBatch(BaseModel):
+    items: list[TaskAssignBatchItem] = Field(min_length=1, max_length=MAX_BATCH_SIZE)
+
+
+class TaskBatchItemResult(BaseModel):
+    index: int
+    ok: bool
+    task_id: UUID | None = None
+    status_code: int
+    error: str | None = None
+
+
+class TaskBatchResponse(BaseModel):
+    succeeded: int
+    failed: int
+    results: list[TaskBatchItemResult]
+
+
+class TaskImportRow(TaskCreate):
+    # Historical tasks may arrive with their original status / timestamp
+    status: TaskStatus = TaskStatus.TODO
+    created_at: datetime | None = None
+
+
+class TaskImportError(BaseModel):
+    row: int
+    error: str
+
+
+class TaskImportReport(BaseModel):
+    rows_received: int
+    rows_imported: int
+    rows_failed: int
+    # Capped; rows_failed has the full count
+    errors: list[TaskImportError]
+    elapsed_seconds: float
+    rows_per_second: float
+
+
+class TaskStats(BaseModel):
+    total: int
+    by_status: dict[TaskStatus, int]
+    # ADMIN / MANAGER only; keyed by user id ("unassigned" for no assignee)
+    by_assignee: dict[str, dict[TaskStatus, int]] | None = None
+    by_creator: dict[str, dict[TaskStatus, int]] | None = None
+
+
+class TaskRemoval(BaseModel):
+    task_id: UUID
+    # "deleted", or "unassigned" (no longer assigned to the caller)
+    reason: str
+    removed_at: datetime
+
+
+class TaskChanges(BaseModel):
+    changed: list[TaskResponse]
+    removed: list[TaskRemoval]
+    # Pass back as ?since= for the next sync
+    watermark: str
+    has_more: bool
@@ -0,0 +1,203 @@
+"""
+Microbenchmarks of single hot-path steps, outside any HTTP stack.
+
+    python -m benchmarks.micro [name ...] [--size 2000] [--out report.json]
+
+Each reports microseconds per operation (per row for serialization,
+milliseconds per call for stats) for the current implementation next to
+the one it replaced, where there is one. serialization and stats read
+benchmarks.seed data.
+"""
+import argparse
+import asyncio
+import sys
+import time
+
+from benchmarks.report import save
+
+
+def per_op(fn, ops: int, repeat: int = 5, number: int = 10) -> float:
+    """Best-of-`repeat` microseconds per op; `fn` performs `ops` ops per call."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        best = min(best, (time.perf_counter() - start) / number)
+    return round(best / ops * 1e6, 3)
+
+
+async def serialization(size: int) -> dict:
+    """GET /tasks encoding: ORM + Pydantic + json vs tuples + orjson."""
+    from fastapi.encoders import jsonable_encoder
+    from fastapi.responses import JSONResponse
+    from pydantic import TypeAdapter
+
+    from app.models import user  # noqa: F401  (Task.assigned_to resolves "User")
+    from app.core.loaders import task_select
+    from app.core.serialization import TaskFieldset, dumps
+    from app.database import SessionLocal
+    from app.models.task import Task
+    from app.schemas.task import TaskResponse
+
+    adapter = TypeAdapter(list[TaskResponse])
+    full = TaskFieldset()
+    sparse = TaskFieldset.parse("id,title,status,assigned_to.full_name")
+
+    def newest(query):
+        return query.order_by(Task.created_at.desc(), Task.id.desc()).limit(size)
+
+    async with SessionLocal() as db:
+        objects = (await db.execute(newest(task_select()))).scalars().all()
+        full_rows = (await db.execute(newest(full.select()))).all()
+        sparse_rows = (await db.execute(newest(sparse.select()))).all()
+
+    def pydantic_path():
+        # What FastAPI does with response_model and ORM objects
+        validated = adapter.validate_python(objects, from_attributes=True)
+        return JSONResponse(jsonable_encoder(adapter.dump_python(validated, mode="json"))).body
+
+    def fast_path():
+        return dumps([full.payload(row) for row in full_rows])
+
+    def sparse_path():
+        return dumps([sparse.payload(row) for row in sparse_rows])
+
+    count = len(full_rows)
+    if not count:
+        raise SystemExit("no tasks found; run python -m benchmarks.seed first")
+    return {
+        "rows": count,
+        "us_per_row": {
+            "orm_pydantic_json": per_op(pydantic_path, count, number=2),
+            "tuples_orjson": per_op(fast_path, count),
+            "tuples_orjson_sparse": per_op(sparse_path, count),
+        },
+        "bytes_per_row": {
+            "full": round(len(fast_path()) / count),
+            "sparse": round(len(sparse_path()) / count),
+        },
+    }
+
+
+async def tokens(size: int) -> dict:
+    """Access token verification per backend, and a verified-token cache hit."""
+    from app.core.config import settings
+    from app.core.jwt import create_access_token
+    from app.core.tokens import TOKEN_BACKENDS, CachingVerifier
+
+    tokens = [create_access_token(f"user-{i}") for i in range(size)]
+    key, algorithm = settings.JWT_SECRET_KEY, settings.JWT_ALGORITHM
+
+    results = {}
+    for name, backend in TOKEN_BACKENDS.items():
+        try:
+            verifier = backend(key, algorithm)
+        except RuntimeError:
+            continue  # optional backend not installed
+        results[name] = per_op(lambda: [verifier.decode(token) for token in tokens], size, number=2)
+
+    cached = CachingVerifier(TOKEN_BACKENDS["builtin"](key, algorithm), maxsize=size)
+    for token in tokens:
+        cached.decode(token)
+    results["cache_hit"] = per_op(lambda: [cached.decode(token) for token in tokens], size)
+    return {"tokens": size, "us_per_token": results}
+
+
+async def rate_limit(size: int) -> dict:
+    """Per-request admission overhead: cost + caller key + in-memory bucket."""
+    from app.core.jwt import create_access_token
+    from app.core.rate_limit import MemoryRateLimiter, client_key, request_cost
+
+    scopes = [
+        {"headers": [(b"authorization", f"Bearer {create_access_token(f'user-{i}')}".encode())],
+         "client": ("127.0.0.1", 0)}
+        for i in range(size)
+    ]
+    for scope in scopes:
+        client_key(scope)  # verified-token cache, as after a client's first request
+
+    # Buckets that never run dry: only the overhead of allowed requests
+    limiter = MemoryRateLimiter(capacity=1e12, refill_per_second=1e12)
+    best = float("inf")
+    for _ in range(5):
+        start = time.perf_counter()
+        for scope in scopes:
+            await limiter.acquire(client_key(scope), request_cost("GET", "/tasks/", b"page=2&limit=20"))
+        best = min(best, time.perf_counter() - start)
+    return {"requests": size, "us_per_request": round(best / size * 1e6, 3)}
+
+
+async def stats(size: int) -> dict:
+    """GET /tasks/stats (manager view): task_counters rows vs GROUP BY over tasks."""
+    from sqlalchemy import func, select
+
+    from app.core.task_counters import read_counters, summarize_counters
+    from app.database import SessionLocal
+    from app.models.task import Task
+
+    async def counters(db):
+        return summarize_counters(await read_counters(db), breakdown=True)
+
+    async def group_by(db):
+        # The same breakdown, aggregated from tasks on every call
+        by_status = await db.execute(select(Task.status, func.count()).group_by(Task.status))
+        by_assignee = await db.execute(
+            select(Task.assigned_to_id, Task.status, func.count())
+            .group_by(Task.assigned_to_id, Task.status)
+        )
+        by_creator = await db.execute(
+            select(Task.created_by_id, Task.status, func.count())
+            .group_by(Task.created_by_id, Task.status)
+        )
+        return by_status.all(), by_assignee.all(), by_creator.all()
+
+    results = {}
+    async with SessionLocal() as db:
+        tasks = await db.scalar(select(func.count()).select_from(Task))
+        for name, fn in (("counters", counters), ("group_by", group_by)):
+            await fn(db)
+            best = float("inf")
+            for _ in range(5):
+                start = time.perf_counter()
+                await fn(db)
+                best = min(best, time.perf_counter() - start)
+            results[name] = round(best * 1000, 3)
+    return {"tasks": tasks, "ms_per_call": results}
+
+
+MICROBENCHMARKS = {
+    "serialization": serialization,
+    "tokens": tokens,
+    "rate_limit": rate_limit,
+    "stats": stats,
+}
+
+
+async def _main(argv: list[str]) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.micro")
+    parser.add_argument("names", nargs="*", help=f"default: all of {', '.join(MICROBENCHMARKS)}")
+    parser.add_argument("--size", type=int, default=2000, help="rows / operations per run")
+    parser.add_argument("--out")
+    args = parser.parse_args(argv)
+    unknown = set(args.names) - MICROBENCHMARKS.keys()
+    if unknown:
+        parser.error(f"unknown microbenchmarks: {', '.join(sorted(unknown))}")
+
+    from app.database import engine
+
+    results = {}
+    try:
+        for name in args.names or MICROBENCHMARKS:
+            results[name] = await MICROBENCHMARKS[name](args.size)
+            print(name, results[name])
+    finally:
+        await engine.dispose()
+
+    if args.out:
+        save(results, args.out)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(_main(sys.argv[1:])))
@@ -0,0 +1,126 @@
+"""
+Benchmark reports: latency percentiles and throughput per workload,
+saved as JSON, and comparison of two reports.
+
+    python -m benchmarks.report compare baseline.json candidate.json [--threshold 0.1]
+
+compare exits with status 1 when any workload regressed by more than
+the threshold (p95 latency up, or throughput down), so it can gate CI.
+"""
+import argparse
+import json
+import math
+import sys
+
+PERCENTILES = (50, 90, 95, 99)
+
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    # Nearest rank
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def summarize(latencies: list[float], errors: int, status_codes: dict, seconds: float) -> dict:
+    """Latencies in seconds in, milliseconds out."""
+    ordered = sorted(latencies)
+    latency_ms = {
+        "mean": round(sum(ordered) / len(ordered) * 1000, 3) if ordered else 0.0,
+        **{f"p{pct}": round(percentile(ordered, pct) * 1000, 3) for pct in PERCENTILES},
+        "max": round(ordered[-1] * 1000, 3) if ordered else 0.0,
+    }
+    return {
+        "requests": len(ordered),
+        "errors": errors,
+        "status_codes": {str(code): count for code, count in sorted(status_codes.items())},
+        "throughput_rps": round(len(ordered) / seconds, 2) if seconds else 0.0,
+        "latency_ms": latency_ms,
+    }
+
+
+def save(report: dict, path: str) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+        f.write("\n")
+
+
+def load(path: str) -> dict:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def format_report(report: dict) -> str:
+    lines = [
+        f"{'workload':<16}{'requests':>10}{'errors':>8}{'rps':>10}"
+        f"{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}"
+    ]
+    rows = {**report["workloads"], "TOTAL": report["total"]}
+    for name, summary in rows.items():
+        latency = summary["latency_ms"]
+        lines.append(
+            f"{name:<16}{summary['requests']:>10}{summary['errors']:>8}"
+            f"{summary['throughput_rps']:>10.1f}{latency['p50']:>10.2f}"
+            f"{latency['p95']:>10.2f}{latency['p99']:>10.2f}{latency['max']:>10.2f}"
+        )
+    return "\n".join(lines)
+
+
+def compare(baseline: dict, candidate: dict, threshold: float) -> tuple[list[str], list[str]]:
+    """Comparison lines plus the workloads that regressed."""
+    lines = [f"{'workload':<16}{'p95 ms':>22}{'change':>9}{'rps':>22}{'change':>9}"]
+    regressions = []
+    base_rows = {**baseline["workloads"], "TOTAL": baseline["total"]}
+    new_rows = {**candidate["workloads"], "TOTAL": candidate["total"]}
+
+    for name in base_rows.keys() & new_rows.keys():
+        old, new = base_rows[name], new_rows[name]
+        old_p95, new_p95 = old["latency_ms"]["p95"], new["latency_ms"]["p95"]
+        old_rps, new_rps = old["throughput_rps"], new["throughput_rps"]
+        p95_change = (new_p95 - old_p95) / old_p95 if old_p95 else 0.0
+        rps_change = (new_rps - old_rps) / old_rps if old_rps else 0.0
+
+        flag = ""
+        if p95_change > threshold or rps_change < -threshold:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        lines.append(
+            f"{name:<16}{old_p95:>10.2f} ->{new_p95:>9.2f}{p95_change:>+9.1%}"
+            f"{old_rps:>10.1f} ->{new_rps:>9.1f}{rps_change:>+9.1%}{flag}"
+        )
+    lines[1:] = sorted(lines[1:], key=lambda line: (line.startswith("TOTAL"), line))
+    return lines, regressions
+
+
+def _main(argv: list[str]) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.report")
+    commands = parser.add_subparsers(dest="command", required=True)
+    show = commands.add_parser("show")
+    show.add_argument("report")
+    diff = commands.add_parser("compare")
+    diff.add_argument("baseline")
+    diff.add_argument("candidate")
+    diff.add_argument(
+        "--threshold", type=float, default=0.10,
+        help="relative p95 increase / throughput drop flagged as a regression",
+    )
+    args = parser.parse_args(argv)
+
+    if args.command == "show":
+        print(format_report(load(args.report)))
+        return 0
+
+    baseline, candidate = load(args.baseline), load(args.candidate)
+    if baseline["meta"]["mix"] != candidate["meta"]["mix"]:
+        print("warning: reports ran different mixes", file=sys.stderr)
+    lines, regressions = compare(baseline, candidate, args.threshold)
+    print("\n".join(lines))
+    if regressions:
+        print(f"{len(regressions)} regressed beyond {args.threshold:.0%}: {', '.join(sorted(regressions))}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(_main(sys.argv[1:]))
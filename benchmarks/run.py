@@ -0,0 +1,201 @@
+"""
+Run a workload mix and save a JSON report.
+
+    python -m benchmarks.run [--mix read] [--target inprocess|http://host:port]
+                             [--concurrency 16] [--duration 30] [--warmup 5]
+                             [--seed 42] [--search-backend NAME] [--out report.json]
+
+"inprocess" drives app.main:app through httpx's ASGI transport (lifespan
+included): no network or server process, good for comparing code
+changes. A URL drives a running server, e.g. uvicorn with several
+workers, for end-to-end numbers. Both need benchmarks.seed data.
+
+Each of --concurrency workers issues requests back to back from its own
+seeded RNG, so the sequence of calls is the same on every run; requests
+completed during --warmup are not counted.
+
+--search-backend picks TASK_SEARCH_BACKEND for an in-process run, so
+the search mix can be compared across backends on the same data (with
+the response cache off, or repeated searches never reach the backend):
+
+    for backend in ilike trigram fulltext; do
+        RESPONSE_CACHE_BACKEND=none python -m benchmarks.run --mix search \
+            --search-backend $backend --out search-$backend.json
+    done
+"""
+import argparse
+import asyncio
+import platform
+import random
+import subprocess
+import sys
+import time
+from collections import Counter, defaultdict
+from contextlib import AsyncExitStack
+from datetime import datetime, timezone
+from pathlib import Path
+
+import httpx
+
+from benchmarks.report import format_report, save, summarize
+from benchmarks.workloads import WORKLOADS, parse_mix, setup
+
+RESULTS_DIR = Path(__file__).parent / "results"
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class Recorder:
+    def __init__(self):
+        self.latencies: dict[str, list[float]] = defaultdict(list)
+        self.status_codes: dict[str, Counter] = defaultdict(Counter)
+        self.errors: Counter = Counter()
+
+    def record(self, name: str, seconds: float, status: int | str) -> None:
+        self.latencies[name].append(seconds)
+        self.status_codes[name][status] += 1
+        if not isinstance(status, int) or status >= 400:
+            self.errors[name] += 1
+
+
+async def _worker(client, ctx, mix, rng, recorder, measure_from, deadline):
+    names = list(mix)
+    weights = list(mix.values())
+    while True:
+        now = time.perf_counter()
+        if now >= deadline:
+            return
+        name = rng.choices(names, weights=weights)[0]
+        try:
+            response = await WORKLOADS[name](client, ctx, rng)
+            status = response.status_code
+        except httpx.HTTPError as exc:
+            status = type(exc).__name__
+        if now >= measure_from:
+            recorder.record(name, time.perf_counter() - now, status)
+
+
+async def run(
+    target: str,
+    mix_spec: str,
+    concurrency: int,
+    duration: float,
+    warmup: float,
+    seed: int,
+    search_backend: str | None = None,
+) -> dict:
+    mix = parse_mix(mix_spec)
+
+    async with AsyncExitStack() as stack:
+        if target == "inprocess":
+            from app.core.config import settings
+            from app.main import app
+
+            if search_backend:
+                settings.TASK_SEARCH_BACKEND = search_backend
+
+            await stack.enter_async_context(app.router.lifespan_context(app))
+            transport = httpx.ASGITransport(app=app)
+            base_url = "http://bench"
+        else:
+            transport = None
+            base_url = target
+        client = await stack.enter_async_context(httpx.AsyncClient(
+            transport=transport,
+            base_url=base_url,
+            timeout=60,
+            limits=httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency),
+        ))
+
+        ctx = await setup(client)
+        recorder = Recorder()
+        started_at = datetime.now(timezone.utc)
+        start = time.perf_counter()
+        measure_from = start + warmup
+        deadline = measure_from + duration
+        await asyncio.gather(*(
+            _worker(client, ctx, mix, random.Random(f"{seed}:{worker}"), recorder, measure_from, deadline)
+            for worker in range(concurrency)
+        ))
+        measured = time.perf_counter() - measure_from
+
+    workloads = {
+        name: summarize(recorder.latencies[name], recorder.errors[name], recorder.status_codes[name], measured)
+        for name in sorted(recorder.latencies)
+    }
+    total = summarize(
+        [latency for latencies in recorder.latencies.values() for latency in latencies],
+        sum(recorder.errors.values()),
+        sum(recorder.status_codes.values(), Counter()),
+        measured,
+    )
+    return {
+        "meta": {
+            "mix": mix_spec,
+            "weights": mix,
+            "target": target,
+            "concurrency": concurrency,
+            "duration_s": duration,
+            "warmup_s": warmup,
+            "seed": seed,
+            "search_backend": search_backend,
+            "started_at": started_at.isoformat(),
+            "git_commit": _git_commit(),
+            "python": platform.python_version(),
+        },
+        "total": total,
+        "workloads": workloads,
+    }
+
+
+async def _main(argv: list[str]) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.run")
+    parser.add_argument("--mix", default="read", help="MIXES name or workload=weight,...")
+    parser.add_argument("--target", default="inprocess", help='"inprocess" or a base URL')
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=30.0, help="measured seconds")
+    parser.add_argument("--warmup", type=float, default=5.0)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--search-backend", help="TASK_SEARCH_BACKEND for an in-process run")
+    parser.add_argument("--out", help="report path (default: benchmarks/results/<time>-<mix>.json)")
+    args = parser.parse_args(argv)
+
+    try:
+        parse_mix(args.mix)
+    except ValueError as exc:
+        parser.error(str(exc))
+    if args.search_backend:
+        from app.core.search import SEARCH_BACKENDS
+
+        if args.search_backend not in SEARCH_BACKENDS:
+            parser.error(f"unknown search backend: {args.search_backend}")
+        if args.target != "inprocess":
+            parser.error("--search-backend only applies to in-process runs")
+
+    report = await run(
+        args.target, args.mix, args.concurrency, args.duration, args.warmup, args.seed,
+        args.search_backend,
+    )
+
+    out = args.out
+    if out is None:
+        RESULTS_DIR.mkdir(exist_ok=True)
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        out = str(RESULTS_DIR / f"{stamp}-{args.mix.replace(',', '_').replace('=', '')}.json")
+    save(report, out)
+
+    print(format_report(report))
+    print(f"report: {out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(_main(sys.argv[1:])))
@@ -0,0 +1,221 @@
+"""
+Deterministic benchmark data: users in every role plus N tasks, loaded
+into the database configured for the app (DB_* settings) with COPY.
+
+    python -m benchmarks.seed --users 500 --tasks 1000000 [--seed 42] [--reset]
+
+The same --seed and sizes always produce the same rows (ids included),
+so runs on different machines or commits see identical data. Every
+benchmark user has an @bench.flowtrack email and BENCH_PASSWORD; --reset
+removes them and their tasks first, and nothing else is touched.
+"""
+import argparse
+import asyncio
+import random
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import text
+
+from app.core.security import hash_password
+from app.core.task_counters import reconcile_counters
+from app.database import SessionLocal, engine
+from app.models import task, user  # noqa: F401  (mapper setup for reconcile)
+
+BENCH_DOMAIN = "bench.flowtrack"
+BENCH_PASSWORD = "bench-password"
+
+COPY_BATCH_SIZE = 20000
+
+# Fixed, so created_at / updated_at do not depend on when seeding ran
+EPOCH = datetime(2025, 1, 1, tzinfo=timezone.utc)
+HISTORY = timedelta(days=365)
+
+FIRST_NAMES = (
+    "Ada", "Alan", "Barbara", "Brian", "Carol", "Dennis", "Edsger", "Frances",
+    "Grace", "Guido", "Hedy", "Ivan", "Jean", "Ken", "Linus", "Margaret",
+    "Niklaus", "Ole", "Radia", "Shafi", "Tim", "Vint", "Whitfield", "Yukihiro",
+)
+LAST_NAMES = (
+    "Allen", "Backus", "Cerf", "Dijkstra", "Engelbart", "Floyd", "Goldwasser",
+    "Hamilton", "Hopper", "Kay", "Knuth", "Lamport", "Liskov", "Lovelace",
+    "McCarthy", "Perlman", "Ritchie", "Stroustrup", "Thompson", "Wirth",
+)
+WORDS = (
+    "account", "alert", "api", "archive", "audit", "backup", "billing", "bug",
+    "build", "cache", "cleanup", "client", "config", "customer", "dashboard",
+    "data", "deadline", "deploy", "design", "docs", "email", "export", "feature",
+    "feedback", "fix", "import", "incident", "index", "invoice", "login",
+    "migration", "mobile", "monitoring", "onboarding", "outage", "payment",
+    "performance", "permissions", "pipeline", "release", "report", "review",
+    "roadmap", "search", "security", "server", "signup", "sprint", "staging",
+    "support", "sync", "test", "ticket", "timeout", "upgrade", "upload", "vendor",
+    "webhook", "workflow",
+)
+VERBS = (
+    "add", "check", "clean up", "document", "fix", "investigate", "migrate",
+    "plan", "refactor", "review", "ship", "speed up", "triage", "update",
+)
+
+# Share of tasks per status, and of tasks nobody is assigned to
+STATUS_WEIGHTS = {"TODO": 50, "IN_PROGRESS": 30, "DONE": 20}
+UNASSIGNED_SHARE = 0.15
+
+
+def bench_email(role: str, index: int) -> str:
+    return f"{role.lower()}{index}@{BENCH_DOMAIN}"
+
+
+def _uuid(rng: random.Random) -> uuid.UUID:
+    return uuid.UUID(int=rng.getrandbits(128), version=4)
+
+
+def generate_users(rng: random.Random, count: int) -> list[tuple]:
+    """1% ADMIN and 5% MANAGER (at least one each), the rest EMPLOYEE."""
+    admins = max(1, count // 100)
+    managers = max(1, count // 20)
+    roles = (
+        [("ADMIN", i) for i in range(admins)]
+        + [("MANAGER", i) for i in range(managers)]
+        + [("EMPLOYEE", i) for i in range(max(1, count - admins - managers))]
+    )
+    return [
+        (
+            _uuid(rng),
+            bench_email(role, index),
+            f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+            role,
+            EPOCH - HISTORY - timedelta(days=1),
+        )
+        for role, index in roles
+    ]
+
+
+def generate_tasks(rng: random.Random, count: int, creators: list, employees: list):
+    """
+    Batches of task records. Assignment is skewed (a few employees hold
+    many tasks, most hold few), like real workloads and unlike uniform
+    random data.
+    """
+    statuses = list(STATUS_WEIGHTS)
+    status_weights = list(STATUS_WEIGHTS.values())
+    employee_weights = [1 / (rank + 1) ** 0.8 for rank in range(len(employees))]
+    history = HISTORY.total_seconds()
+
+    remaining = count
+    while remaining:
+        size = min(COPY_BATCH_SIZE, remaining)
+        remaining -= size
+        assignees = rng.choices(employees, weights=employee_weights, k=size)
+        task_statuses = rng.choices(statuses, weights=status_weights, k=size)
+        batch = []
+        for assignee_id, status in zip(assignees, task_statuses):
+            created_at = EPOCH - timedelta(seconds=rng.random() * history)
+            updated_at = min(EPOCH, created_at + timedelta(days=rng.random() * 30))
+            title = f"{rng.choice(VERBS).capitalize()} " + " ".join(
+                rng.sample(WORDS, rng.randint(2, 5))
+            )
+            description = None
+            if rng.random() < 0.7:
+                description = " ".join(rng.choices(WORDS, k=rng.randint(10, 60)))
+            batch.append((
+                _uuid(rng),
+                title,
+                description,
+                status,
+                rng.choice(creators),
+                None if rng.random() < UNASSIGNED_SHARE else assignee_id,
+                created_at,
+                updated_at,
+            ))
+        yield batch
+
+
+async def reset(db) -> int:
+    users = "SELECT id FROM users WHERE email LIKE :pattern"
+    params = {"pattern": f"%@{BENCH_DOMAIN}"}
+    await db.execute(text(
+        f"DELETE FROM tasks WHERE created_by_id IN ({users}) OR assigned_to_id IN ({users})"
+    ), params)
+    result = await db.execute(text("DELETE FROM users WHERE email LIKE :pattern"), params)
+    return result.rowcount
+
+
+async def seed(users: int, tasks: int, seed_value: int, do_reset: bool) -> None:
+    rng = random.Random(seed_value)
+    started = time.perf_counter()
+
+    async with SessionLocal() as db:
+        await db.execute(text("SET LOCAL statement_timeout = 0"))
+        if do_reset:
+            print(f"removed {await reset(db)} benchmark users and their tasks")
+        else:
+            existing = await db.execute(
+                text("SELECT count(*) FROM users WHERE email LIKE :pattern"),
+                {"pattern": f"%@{BENCH_DOMAIN}"},
+            )
+            if existing.scalar_one():
+                raise SystemExit("benchmark data already present; pass --reset to reseed")
+
+        user_rows = generate_users(rng, users)
+        hashed = hash_password(BENCH_PASSWORD)
+        connection = await (await db.connection()).get_raw_connection()
+        raw = connection.driver_connection
+        await raw.copy_records_to_table(
+            "users",
+            records=[(*row[:4], hashed, True, row[4]) for row in user_rows],
+            columns=["id", "email", "full_name", "role", "hashed_password", "is_active", "created_at"],
+        )
+        creators = [row[0] for row in user_rows if row[3] in ("ADMIN", "MANAGER")]
+        employees = [row[0] for row in user_rows if row[3] == "EMPLOYEE"]
+        print(f"users: {len(user_rows)} ({len(creators)} admins / managers)")
+
+        loaded = 0
+        for batch in generate_tasks(rng, tasks, creators, employees):
+            await raw.copy_records_to_table(
+                "tasks",
+                records=batch,
+                columns=[
+                    "id", "title", "description", "status", "created_by_id",
+                    "assigned_to_id", "created_at", "updated_at",
+                ],
+            )
+            loaded += len(batch)
+            elapsed = time.perf_counter() - started
+            print(f"\rtasks: {loaded}/{tasks} ({loaded / elapsed:,.0f} rows/s)", end="", flush=True)
+        print()
+        await db.commit()
+
+    # Counters (and so change versions) follow the new rows
+    async with SessionLocal() as db:
+        corrections = await reconcile_counters(db)
+        print(f"task counters corrected: {len(corrections)}")
+
+    async with engine.connect() as conn:
+        await conn.execution_options(isolation_level="AUTOCOMMIT")
+        await conn.execute(text("SET statement_timeout = 0"))
+        await conn.execute(text("ANALYZE users"))
+        await conn.execute(text("ANALYZE tasks"))
+
+    print(f"done in {time.perf_counter() - started:.1f}s")
+
+
+async def _main(argv: list[str]) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.seed")
+    parser.add_argument("--users", type=int, default=500)
+    parser.add_argument("--tasks", type=int, default=1_000_000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--reset", action="store_true", help="remove earlier benchmark data first")
+    args = parser.parse_args(argv)
+
+    try:
+        await seed(args.users, args.tasks, args.seed, args.reset)
+    finally:
+        await engine.dispose()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(_main(sys.argv[1:])))
@@ -0,0 +1,304 @@
+"""
+Workloads: one scripted API call each, drawn at random (by weight) from
+a mix. Every call goes through the public API, so the same workloads run
+in-process or against any server seeded by benchmarks.seed.
+"""
+import random
+from dataclasses import dataclass, field
+
+import httpx
+
+from benchmarks.seed import BENCH_DOMAIN, BENCH_PASSWORD, WORDS
+
+STATUSES = ("TODO", "IN_PROGRESS", "DONE")
+SPARSE_FIELDS = "id,title,status,assigned_to.full_name"
+# Tasks per batch_status call, and per single_status round for comparison
+BATCH_SIZE = 50
+
+
+@dataclass
+class Actor:
+    email: str
+    role: str
+    token: str
+    headers: dict = field(init=False)
+
+    def __post_init__(self):
+        self.headers = {"Authorization": f"Bearer {self.token}"}
+
+
+@dataclass
+class Context:
+    """What workloads need to know about the seeded data, from setup()."""
+
+    managers: list[Actor]
+    employees: list[Actor]
+    employee_ids: list[str]
+    task_ids: list[str]
+    # Per actor and URL: last ETag / delta sync watermark seen
+    etags: dict = field(default_factory=dict)
+    watermarks: dict = field(default_factory=dict)
+
+
+async def login(client: httpx.AsyncClient, email: str) -> str:
+    response = await client.post("/auth/login", json={"email": email, "password": BENCH_PASSWORD})
+    response.raise_for_status()
+    return response.json()["access_token"]
+
+
+async def setup(client: httpx.AsyncClient, actors: int = 20, task_pages: int = 20) -> Context:
+    """Log in a few benchmark users and collect ids to write to."""
+    managers = [
+        Actor(email, role, await login(client, email))
+        for email, role in ((f"admin0@{BENCH_DOMAIN}", "ADMIN"), (f"manager0@{BENCH_DOMAIN}", "MANAGER"))
+    ]
+    users = await client.get("/users/", headers=managers[0].headers)
+    users.raise_for_status()
+    bench_employees = sorted(
+        (user for user in users.json() if user["email"].endswith("@" + BENCH_DOMAIN)),
+        key=lambda user: user["email"],
+    )
+    if not bench_employees:
+        raise SystemExit("no benchmark users found; run python -m benchmarks.seed first")
+
+    employees = [
+        Actor(user["email"], "EMPLOYEE", await login(client, user["email"]))
+        for user in bench_employees[:actors]
+    ]
+
+    task_ids: list[str] = []
+    after = None
+    for _ in range(task_pages):
+        params = {"limit": 50, "fields": "id"}
+        if after:
+            params["after"] = after
+        page = await client.get("/tasks/", params=params, headers=managers[0].headers)
+        page.raise_for_status()
+        task_ids.extend(task["id"] for task in page.json())
+        after = page.headers.get("X-Next-Cursor")
+        if not after:
+            break
+
+    return Context(
+        managers=managers,
+        employees=employees,
+        employee_ids=[user["id"] for user in bench_employees],
+        task_ids=task_ids,
+    )
+
+
+def _anyone(ctx: Context, rng: random.Random) -> Actor:
+    return rng.choice(ctx.employees) if rng.random() < 0.7 else rng.choice(ctx.managers)
+
+
+def _list_params(actor: Actor, rng: random.Random) -> dict:
+    params = {"limit": rng.choice((10, 20, 50))}
+    if rng.random() < 0.5:
+        params["status"] = rng.choice(STATUSES)
+    if actor.role != "EMPLOYEE" and rng.random() < 0.3:
+        params["assigned"] = "unassigned"
+    elif rng.random() < 0.3:
+        params["assigned"] = "me"
+    if rng.random() < 0.3:
+        params["page"] = rng.randint(2, 5)
+    return params
+
+
+async def list_tasks(client, ctx, rng):
+    actor = _anyone(ctx, rng)
+    return await client.get("/tasks/", params=_list_params(actor, rng), headers=actor.headers)
+
+
+async def list_sparse(client, ctx, rng):
+    actor = _anyone(ctx, rng)
+    params = {**_list_params(actor, rng), "fields": SPARSE_FIELDS}
+    return await client.get("/tasks/", params=params, headers=actor.headers)
+
+
+async def list_count(client, ctx, rng):
+    actor = _anyone(ctx, rng)
+    params = {**_list_params(actor, rng), "count": rng.choice(("exact", "estimated"))}
+    return await client.get("/tasks/", params=params, headers=actor.headers)
+
+
+async def list_serialize(client, ctx, rng):
+    # Largest page, every field: dominated by row fetch + JSON encoding
+    actor = rng.choice(ctx.managers)
+    return await client.get("/tasks/", params={"limit": 50}, headers=actor.headers)
+
+
+async def revalidate(client, ctx, rng):
+    # A client polling its list with If-None-Match
+    actor = _anyone(ctx, rng)
+    params = {"limit": 20, "status": rng.choice(STATUSES)}
+    key = (actor.email, params["status"])
+    headers = dict(actor.headers)
+    if key in ctx.etags:
+        headers["If-None-Match"] = ctx.etags[key]
+    response = await client.get("/tasks/", params=params, headers=headers)
+    if "ETag" in response.headers:
+        ctx.etags[key] = response.headers["ETag"]
+    return response
+
+
+async def search(client, ctx, rng):
+    actor = _anyone(ctx, rng)
+    params = {"q": rng.choice(WORDS), "limit": 20}
+    if rng.random() < 0.5:
+        params["sort"] = "relevance"
+    return await client.get("/tasks/", params=params, headers=actor.headers)
+
+
+async def search_substring(client, ctx, rng):
+    # Part of a word: matched by ilike / trigram, mostly not by full-text
+    actor = _anyone(ctx, rng)
+    word = rng.choice([word for word in WORDS if len(word) >= 6])
+    start = rng.randint(0, len(word) - 4)
+    params = {"q": word[start:start + 4], "limit": 20}
+    return await client.get("/tasks/", params=params, headers=actor.headers)
+
+
+async def search_rare(client, ctx, rng):
+    # A term no task contains: every row is a candidate, nothing matches
+    actor = _anyone(ctx, rng)
+    term = "".join(rng.choice("bcdfghjklmnpqrstvwxz") for _ in range(6))
+    return await client.get("/tasks/", params={"q": term, "limit": 20}, headers=actor.headers)
+
+
+async def get_task(client, ctx, rng):
+    actor = rng.choice(ctx.managers)
+    return await client.get(f"/tasks/{rng.choice(ctx.task_ids)}", headers=actor.headers)
+
+
+async def me(client, ctx, rng):
+    # Cheapest authenticated call: mostly get_current_user
+    actor = _anyone(ctx, rng)
+    return await client.get("/users/me", headers=actor.headers)
+
+
+async def stats(client, ctx, rng):
+    actor = rng.choice(ctx.managers)
+    return await client.get("/tasks/stats", headers=actor.headers)
+
+
+async def changes(client, ctx, rng):
+    actor = _anyone(ctx, rng)
+    params = {"limit": 100}
+    if actor.email in ctx.watermarks:
+        params["since"] = ctx.watermarks[actor.email]
+    response = await client.get("/tasks/changes", params=params, headers=actor.headers)
+    if response.status_code == 200:
+        ctx.watermarks[actor.email] = response.json()["watermark"]
+    return response
+
+
+async def update_status(client, ctx, rng):
+    actor = rng.choice(ctx.managers)
+    return await client.patch(
+        f"/tasks/{rng.choice(ctx.task_ids)}/status",
+        json={"status": rng.choice(STATUSES)},
+        headers=actor.headers,
+    )
+
+
+async def assign(client, ctx, rng):
+    actor = rng.choice(ctx.managers)
+    return await client.patch(
+        f"/tasks/{rng.choice(ctx.task_ids)}/assign",
+        params={"assignee_id": rng.choice(ctx.employee_ids)},
+        headers=actor.headers,
+    )
+
+
+def _status_items(ctx, rng) -> list[dict]:
+    return [
+        {"task_id": task_id, "status": rng.choice(STATUSES)}
+        for task_id in rng.sample(ctx.task_ids, min(BATCH_SIZE, len(ctx.task_ids)))
+    ]
+
+
+async def batch_status(client, ctx, rng):
+    actor = rng.choice(ctx.managers)
+    items = _status_items(ctx, rng)
+    return await client.patch("/tasks/batch/status", json={"items": items}, headers=actor.headers)
+
+
+async def single_status(client, ctx, rng):
+    # The same updates as one batch_status call, one PATCH at a time;
+    # reports the first failure, if any
+    actor = rng.choice(ctx.managers)
+    items = _status_items(ctx, rng)
+    if not items:
+        # No tasks were listed: send the same empty batch batch_status would
+        return await client.patch("/tasks/batch/status", json={"items": items}, headers=actor.headers)
+    failed = None
+    for item in items:
+        response = await client.patch(
+            f"/tasks/{item['task_id']}/status",
+            json={"status": item["status"]},
+            headers=actor.headers,
+        )
+        if failed is None and response.status_code >= 400:
+            failed = response
+    return failed or response
+
+
+async def login_workload(client, ctx, rng):
+    actor = rng.choice(ctx.employees)
+    return await client.post("/auth/login", json={"email": actor.email, "password": BENCH_PASSWORD})
+
+
+WORKLOADS = {
+    "list": list_tasks,
+    "list_sparse": list_sparse,
+    "list_count": list_count,
+    "list_serialize": list_serialize,
+    "revalidate": revalidate,
+    "search": search,
+    "search_substring": search_substring,
+    "search_rare": search_rare,
+    "get_task": get_task,
+    "me": me,
+    "stats": stats,
+    "changes": changes,
+    "status": update_status,
+    "assign": assign,
+    "batch_status": batch_status,
+    "single_status": single_status,
+    "login": login_workload,
+}
+
+MIXES = {
+    "read": {
+        "list": 35, "list_sparse": 10, "search": 15, "get_task": 15,
+        "me": 10, "revalidate": 10, "list_count": 5,
+    },
+    "write": {"status": 45, "assign": 45, "batch_status": 10},
+    # BATCH_SIZE status updates per call, batched vs one request each
+    "batch": {"batch_status": 1, "single_status": 1},
+    "mixed": {
+        "list": 30, "search": 10, "get_task": 10, "me": 5, "revalidate": 5,
+        "status": 15, "assign": 10, "changes": 5, "stats": 5, "login": 5,
+    },
+    "login": {"login": 1},
+    # List latency during a login burst: compare PASSWORD_HASH_WORKERS=0
+    # (bcrypt on threads) with the process pool
+    "login_storm": {"list": 4, "login": 1},
+    # Run once per search backend (benchmarks.run --search-backend)
+    "search": {"search": 4, "search_substring": 4, "search_rare": 1},
+    "serialize": {"list_serialize": 1},
+}
+
+
+def parse_mix(spec: str) -> dict[str, float]:
+    """A MIXES name, or "workload=weight,..." (e.g. "list=3,search=1")."""
+    if spec in MIXES:
+        return MIXES[spec]
+    mix = {}
+    for part in spec.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in WORKLOADS:
+            raise ValueError(f"Unknown workload: {name}")
+        mix[name] = float(weight) if weight else 1.0
+    return mix
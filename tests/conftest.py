@@ -0,0 +1,153 @@
+"""
+Tests run against a real Postgres, configured by the same DB_* settings
+as the app. DB_NAME is swapped for a scratch database (TEST_DB_NAME,
+default "<DB_NAME>_test"), created and migrated once per run; every test
+starts from empty tables. Tests that need the database get it through
+the `client` fixture (or `database` directly); without a reachable
+server those are skipped and the rest still run.
+
+    python -m pytest
+"""
+import asyncio
+import os
+from uuid import uuid4
+
+import asyncpg
+import httpx
+import pytest
+from sqlalchemy import text
+
+from app.core.config import settings
+
+TEST_DB_NAME = os.environ.get("TEST_DB_NAME") or f"{settings.DB_NAME}_test"
+# Before any app module builds the engine from it
+settings.DB_NAME = TEST_DB_NAME
+
+TABLES = (
+    "refresh_tokens",
+    "revoked_tokens",
+    "task_tombstones",
+    "task_counters",
+    "change_versions",
+    "tasks",
+    "users",
+)
+
+
+@pytest.fixture(scope="session")
+def database():
+    async def prepare():
+        try:
+            connection = await asyncpg.connect(
+                user=settings.DB_USER,
+                password=settings.DB_PASSWORD,
+                host=settings.DB_HOST,
+                port=settings.DB_PORT,
+                database="postgres",
+            )
+        except (OSError, asyncpg.PostgresError) as exc:
+            pytest.skip(f"Postgres not reachable: {exc}")
+        try:
+            exists = await connection.fetchval(
+                "SELECT 1 FROM pg_database WHERE datname = $1", TEST_DB_NAME
+            )
+            if not exists:
+                await connection.execute(f'CREATE DATABASE "{TEST_DB_NAME}"')
+        finally:
+            await connection.close()
+
+        from app.core.startup import run_migrations
+        from app.database import engine
+
+        try:
+            await run_migrations(engine)
+        finally:
+            await engine.dispose()
+
+    asyncio.run(prepare())
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture
+async def client(database, anyio_backend):
+    """The app with its lifespan, over empty tables and cold caches."""
+    from app.core.counting import count_cache
+    from app.core.principals import principal_cache
+    from app.database import engine
+    from app.main import app
+
+    async with engine.begin() as connection:
+        await connection.execute(text(f"TRUNCATE {', '.join(TABLES)}"))
+    principal_cache.clear()
+    count_cache.clear()
+
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            yield client
+
+
+@pytest.fixture
+async def db(client):
+    from app.database import SessionLocal
+
+    async with SessionLocal() as session:
+        yield session
+
+
+@pytest.fixture
+def make_user(db):
+    """Insert a user; only users created with a password can log in."""
+    from app.core.security import hash_password
+    from app.models.user import User
+
+    async def make(role: str = "EMPLOYEE", password: str | None = None) -> User:
+        user = User(
+            email=f"{role.lower()}-{uuid4().hex[:8]}@test.flowtrack",
+            full_name=f"Test {role.title()}",
+            role=role,
+            hashed_password=hash_password(password) if password else "!",
+        )
+        db.add(user)
+        await db.commit()
+        return user
+
+    return make
+
+
+@pytest.fixture
+def make_tasks(db):
+    """Insert `count` tasks created by `creator`, assigned round-robin."""
+    from app.models.task import Task
+
+    async def make(creator, count: int, assignees=(None,)) -> list:
+        tasks = []
+        for index in range(count):
+            assignee = assignees[index % len(assignees)]
+            tasks.append(Task(
+                title=f"Task {index}",
+                description="Seeded by tests",
+                created_by_id=creator.id,
+                assigned_to_id=assignee.id if assignee else None,
+            ))
+        db.add_all(tasks)
+        await db.commit()
+        return tasks
+
+    return make
+
+
+@pytest.fixture
+def auth():
+    """Authorization headers carrying a fresh access token for `user`."""
+    from app.core.jwt import create_access_token
+
+    def headers(user, session_id: str | None = None) -> dict:
+        token = create_access_token(str(user.id), role=user.role, session_id=session_id)
+        return {"Authorization": f"Bearer {token}"}
+
+    return headers
@@ -0,0 +1,110 @@
+"""
+The principal cache must not keep a role or active flag that was
+changed and committed in this process, even if another request read
+the old row while the change was still uncommitted. Other workers drop
+it when the change is notified, and access tokens embedding the old
+role stop being trusted.
+"""
+import asyncio
+
+import pytest
+
+from app.core.config import settings
+from app.core.principals import Principal, load_principal, principal_cache
+from app.core.revocation import claims_id, revocation_list, revoke_claims
+from app.database import SessionLocal, engine
+from app.models.user import User
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_role_change_invalidates_after_commit(client, make_user):
+    user = await make_user("EMPLOYEE")
+
+    async with SessionLocal() as writer, SessionLocal() as reader:
+        row = await writer.get(User, user.id)
+        row.role = "MANAGER"
+        await writer.flush()
+        # Uncommitted: another session still sees, and caches, the old role
+        assert (await load_principal(reader, user.id)).role == "EMPLOYEE"
+        await writer.commit()
+
+        assert principal_cache.get(user.id) is None
+        assert (await load_principal(reader, user.id)).role == "MANAGER"
+
+
+async def test_deactivation_invalidates_after_commit(client, make_user):
+    user = await make_user("EMPLOYEE")
+
+    async with SessionLocal() as writer, SessionLocal() as reader:
+        row = await writer.get(User, user.id)
+        row.is_active = False
+        await writer.flush()
+        await load_principal(reader, user.id)
+        await writer.commit()
+
+        assert not (await load_principal(reader, user.id)).is_active
+
+
+async def test_rollback_keeps_cached_principal(client, make_user):
+    user = await make_user("EMPLOYEE")
+
+    async with SessionLocal() as writer, SessionLocal() as reader:
+        row = await writer.get(User, user.id)
+        row.role = "ADMIN"
+        await writer.flush()
+        await load_principal(reader, user.id)
+        await writer.rollback()
+
+        assert principal_cache.get(user.id).role == "EMPLOYEE"
+
+
+async def test_change_in_another_worker_invalidates_on_notify(client, make_user):
+    user = await make_user("MANAGER")
+    principal_cache.set(user.id, Principal(id=user.id, role="MANAGER", is_active=True))
+
+    # What another worker's commit sends: nothing runs in this process's
+    # session events, only the notification reaches the listener
+    async with engine.begin() as connection:
+        await connection.run_sync(revoke_claims, user.id)
+
+    for _ in range(50):
+        if principal_cache.get(user.id) is None:
+            break
+        await asyncio.sleep(0.02)
+    assert principal_cache.get(user.id) is None
+    assert revocation_list.is_revoked(claims_id(user.id))
+
+
+@pytest.fixture
+def embedded_roles(monkeypatch):
+    monkeypatch.setattr(settings, "JWT_EMBED_ROLE_CLAIMS", True)
+
+
+async def test_embedded_role_is_not_trusted_after_deactivation(client, make_user, auth, embedded_roles):
+    user = await make_user("MANAGER")
+    headers = auth(user)
+    assert (await client.get("/tasks/", headers=headers)).status_code == 200
+
+    async with SessionLocal() as writer:
+        row = await writer.get(User, user.id)
+        row.is_active = False
+        await writer.commit()
+
+    response = await client.get("/tasks/", headers=headers)
+    assert response.status_code == 403
+    assert response.json()["detail"] == "User is inactive"
+
+
+async def test_embedded_role_is_not_trusted_after_demotion(client, make_user, auth, embedded_roles):
+    user = await make_user("MANAGER")
+    headers = auth(user)
+
+    async with SessionLocal() as writer:
+        row = await writer.get(User, user.id)
+        row.role = "EMPLOYEE"
+        await writer.commit()
+
+    # The token still says MANAGER; the database says otherwise
+    response = await client.post("/tasks/", json={"title": "Not allowed"}, headers=headers)
+    assert response.status_code == 403
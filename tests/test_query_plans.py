@@ -0,0 +1,126 @@
+"""
+Every query shape GET /tasks can build must be served by an index.
+
+Each case calls the endpoint, captures the tasks query it sent, and runs
+it through EXPLAIN (FORMAT JSON) on the same parameters. Test tables are
+tiny, where a sequential scan is always cheapest, so plans are made with
+enable_seqscan off: that only penalizes seq scans, and one still shows
+up wherever no index can serve the query.
+"""
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import event, text
+
+from app.core.config import settings
+from app.core.pagination import encode_cursor
+from app.database import engine
+
+pytestmark = pytest.mark.anyio
+
+MANAGER_SHAPES = [
+    {},
+    {"status": "TODO"},
+    {"assigned": "me"},
+    {"assigned": "unassigned"},
+    {"assigned": "unassigned", "status": "DONE"},
+    {"assigned": "me", "status": "IN_PROGRESS"},
+]
+EMPLOYEE_SHAPES = [
+    {},
+    {"status": "TODO"},
+    {"assigned": "me"},
+]
+# First page, offset page, keyset cursor
+PAGINATION = [{}, {"page": 3}, {"after": encode_cursor(datetime.now(timezone.utc), uuid4())}]
+
+SEARCH_SHAPES = [
+    {"q": "report"},
+    {"q": "report", "sort": "relevance"},
+    {"q": "report", "status": "TODO"},
+    {"q": "report", "assigned": "unassigned"},
+]
+
+
+@contextmanager
+def capture_task_queries():
+    queries = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().startswith("SELECT") and "FROM tasks" in statement:
+            queries.append((statement, parameters))
+
+    event.listen(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield queries
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+
+
+def seq_scans(plan: dict) -> list[str]:
+    found = []
+    if plan.get("Node Type") == "Seq Scan":
+        found.append(plan.get("Relation Name"))
+    for child in plan.get("Plans", []):
+        found.extend(seq_scans(child))
+    return found
+
+
+async def explain(statement: str, parameters) -> dict:
+    async with engine.connect() as connection:
+        await connection.execute(text("SET LOCAL enable_seqscan = off"))
+        result = await connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", parameters)
+        plan = result.scalar_one()
+        await connection.rollback()
+    return plan[0]["Plan"]
+
+
+async def assert_index_only_access(client, headers, params):
+    params = {"limit": 2, **params}
+    with capture_task_queries() as queries:
+        response = await client.get("/tasks/", params=params, headers=headers)
+    assert response.status_code == 200, response.text
+    assert queries, f"no tasks query captured for {params}"
+
+    for statement, parameters in queries:
+        plan = await explain(statement, parameters)
+        assert "tasks" not in seq_scans(plan), f"Seq Scan on tasks for {params}:\n{statement}"
+
+
+@pytest.fixture
+async def actors(client, make_user, make_tasks, auth):
+    manager = await make_user("MANAGER")
+    employee = await make_user("EMPLOYEE")
+    await make_tasks(manager, 12, assignees=(employee, None))
+    return {"MANAGER": auth(manager), "EMPLOYEE": auth(employee)}
+
+
+@pytest.mark.parametrize("pagination", PAGINATION, ids=["first", "offset", "cursor"])
+@pytest.mark.parametrize("shape", MANAGER_SHAPES, ids=str)
+async def test_manager_list_shapes(client, actors, shape, pagination):
+    await assert_index_only_access(client, actors["MANAGER"], {**shape, **pagination})
+
+
+@pytest.mark.parametrize("pagination", PAGINATION, ids=["first", "offset", "cursor"])
+@pytest.mark.parametrize("shape", EMPLOYEE_SHAPES, ids=str)
+async def test_employee_list_shapes(client, actors, shape, pagination):
+    await assert_index_only_access(client, actors["EMPLOYEE"], {**shape, **pagination})
+
+
+@pytest.mark.parametrize("backend", ["fulltext", "trigram"])
+@pytest.mark.parametrize("shape", SEARCH_SHAPES, ids=str)
+async def test_search_shapes(client, db, actors, monkeypatch, backend, shape):
+    if backend == "trigram":
+        installed = await db.scalar(text("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'"))
+        if not installed:
+            pytest.skip("pg_trgm is not installed in the test database")
+    monkeypatch.setattr(settings, "TASK_SEARCH_BACKEND", backend)
+    await assert_index_only_access(client, actors["MANAGER"], shape)
+
+
+async def test_harness_detects_seq_scans(client):
+    # No index can serve this: the plan must still show the seq scan
+    plan = await explain("SELECT id FROM tasks WHERE title ILIKE '%x%'", ())
+    assert seq_scans(plan) == ["tasks"]
@@ -0,0 +1,146 @@
+"""
+Token-bucket admission control: the in-memory and Redis backends, and
+the 429 the middleware answers with. No database needed.
+"""
+import fakeredis
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from app.core import rate_limit
+from app.core.rate_limit import MemoryRateLimiter, RateLimitMiddleware, RedisRateLimiter
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+class Clock:
+    """Stands in for the time module inside rate_limit."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(rate_limit, "time", clock)
+    return clock
+
+
+async def test_memory_bucket_allows_capacity_then_waits(clock):
+    limiter = MemoryRateLimiter(capacity=3, refill_per_second=1)
+
+    assert [await limiter.acquire("a", 1) for _ in range(3)] == [0, 0, 0]
+    assert await limiter.acquire("a", 2) == 2
+    # Another caller has its own bucket
+    assert await limiter.acquire("b", 3) == 0
+
+
+async def test_memory_bucket_refills(clock):
+    limiter = MemoryRateLimiter(capacity=2, refill_per_second=4)
+    await limiter.acquire("a", 2)
+    assert await limiter.acquire("a", 1) == 0.25
+
+    clock.now += 0.25
+    assert await limiter.acquire("a", 1) == 0
+    # Never refills past capacity, and a cost above it is capped
+    clock.now += 60
+    assert await limiter.acquire("a", 10) == 0
+    assert await limiter.acquire("a", 1) == 0.25
+
+
+async def test_memory_eviction_drops_least_recently_seen(clock):
+    limiter = MemoryRateLimiter(capacity=1, refill_per_second=0.01, maxsize=2)
+    await limiter.acquire("a", 1)
+    await limiter.acquire("b", 1)
+    await limiter.acquire("a", 1)  # a is now the most recent
+
+    await limiter.acquire("c", 1)
+    assert list(limiter.buckets) == ["a", "c"]
+    # a is still drained; b, when seen again, starts over with a full bucket
+    assert await limiter.acquire("a", 1) > 0
+    assert await limiter.acquire("b", 1) == 0
+
+
+async def test_memory_churn_does_not_reset_active_callers(clock):
+    limiter = MemoryRateLimiter(capacity=1, refill_per_second=0.01, maxsize=3)
+    await limiter.acquire("victim", 1)
+
+    # A flood of new keys, more than maxsize, while the victim keeps calling
+    for index in range(10):
+        await limiter.acquire(f"rotating-{index}", 1)
+        assert await limiter.acquire("victim", 1) > 0
+    assert len(limiter.buckets) == 3
+
+
+@pytest.fixture
+def redis_server():
+    return fakeredis.FakeServer()
+
+
+@pytest.fixture
+async def redis_limiter(redis_server):
+    client = fakeredis.FakeAsyncRedis(server=redis_server)
+    limiter = RedisRateLimiter(client, capacity=3, refill_per_second=1)
+    yield limiter
+    await limiter.close()
+
+
+async def test_redis_bucket_allows_capacity_then_waits(redis_limiter):
+    assert [await redis_limiter.acquire("a", 1) for _ in range(3)] == [0, 0, 0]
+    assert await redis_limiter.acquire("a", 2) == pytest.approx(2, abs=0.1)
+    assert await redis_limiter.acquire("b", 3) == 0
+
+
+async def test_redis_bucket_expires_once_full_again(redis_limiter):
+    await redis_limiter.acquire("a", 1)
+
+    key = redis_limiter.prefix + "a"
+    assert await redis_limiter.client.hget(key, "tokens") is not None
+    # capacity / rate seconds, plus one
+    assert 0 < await redis_limiter.client.pttl(key) <= 4000
+
+
+async def test_redis_outage_lets_requests_through(redis_server, redis_limiter):
+    redis_server.connected = False
+    assert await redis_limiter.acquire("a", 100) == 0
+
+
+@pytest.fixture
+async def limited_client(monkeypatch):
+    app = FastAPI()
+
+    @app.get("/tasks/")
+    async def tasks():
+        return []
+
+    @app.get("/health")
+    async def health():
+        return {"status": "ok"}
+
+    monkeypatch.setattr(rate_limit, "_rate_limiter", MemoryRateLimiter(capacity=5, refill_per_second=0.5))
+    transport = httpx.ASGITransport(app=RateLimitMiddleware(app))
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        yield client
+
+
+async def test_middleware_answers_429_with_retry_after(limited_client):
+    # A search costs 5 tokens: the whole bucket
+    assert (await limited_client.get("/tasks/", params={"q": "report"})).status_code == 200
+
+    response = await limited_client.get("/tasks/")
+    assert response.status_code == 429
+    assert response.json() == {"detail": "Too many requests"}
+    # 1 token at 0.5 per second, rounded up to whole seconds
+    assert response.headers["Retry-After"] == "2"
+
+    # Health checks are never throttled
+    assert (await limited_client.get("/health")).status_code == 200
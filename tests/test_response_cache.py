@@ -0,0 +1,146 @@
+"""
+Response cache backends (memory, and Redis through fakeredis), and how
+GET /tasks keys its entries: a write bumps the change versions so the
+next request misses, and callers with different scopes never share an
+entry.
+"""
+import asyncio
+
+import fakeredis
+import pytest
+
+from app.core import response_cache
+from app.core.response_cache import MemoryResponseCache, RedisResponseCache, ResponseCache
+
+pytestmark = pytest.mark.anyio
+
+BACKENDS = ["memory", "redis"]
+
+
+def make_backend(name: str, ttl: float = 60, maxsize: int = 100, server=None) -> ResponseCache:
+    if name == "memory":
+        return MemoryResponseCache(maxsize=maxsize, ttl=ttl)
+    return RedisResponseCache(fakeredis.FakeAsyncRedis(server=server or fakeredis.FakeServer()), ttl=ttl)
+
+
+class RecordingCache(ResponseCache):
+    """Wraps a backend, recording which lookups were hits."""
+
+    def __init__(self, backend: ResponseCache):
+        self.backend = backend
+        self.name = backend.name
+        self.lookups: list[bool] = []
+
+    async def get(self, key: str) -> bytes | None:
+        entry = await self.backend.get(key)
+        self.lookups.append(entry is not None)
+        return entry
+
+    async def set(self, key: str, value: bytes) -> None:
+        await self.backend.set(key, value)
+
+    async def close(self) -> None:
+        await self.backend.close()
+
+
+@pytest.mark.parametrize("name", BACKENDS)
+async def test_hit_and_miss(name):
+    cache = make_backend(name)
+    await cache.set("tasks:a", b"body")
+
+    assert await cache.get("tasks:a") == b"body"
+    assert await cache.get("tasks:b") is None
+    await cache.close()
+
+
+async def test_memory_entries_expire():
+    cache = make_backend("memory", ttl=0.05)
+    await cache.set("tasks:a", b"body")
+
+    await asyncio.sleep(0.06)
+    assert await cache.get("tasks:a") is None
+
+
+async def test_redis_entries_expire():
+    # Redis TTLs are whole seconds, rounded up
+    cache = make_backend("redis", ttl=0.2)
+    await cache.set("tasks:a", b"body")
+    assert 0 < await cache.client.ttl(cache.prefix + "tasks:a") <= 1
+
+    await asyncio.sleep(1.05)
+    assert await cache.get("tasks:a") is None
+    await cache.close()
+
+
+async def test_memory_evicts_least_recently_used():
+    # Redis bounds size itself (maxmemory + allkeys-lru), not the client
+    cache = make_backend("memory", maxsize=2)
+    await cache.set("tasks:a", b"a")
+    await cache.set("tasks:b", b"b")
+    await cache.get("tasks:a")
+
+    await cache.set("tasks:c", b"c")
+    assert await cache.get("tasks:b") is None
+    assert await cache.get("tasks:a") == b"a"
+    assert await cache.get("tasks:c") == b"c"
+
+
+async def test_redis_outage_is_a_miss():
+    server = fakeredis.FakeServer()
+    cache = make_backend("redis", server=server)
+    await cache.set("tasks:a", b"body")
+
+    server.connected = False
+    assert await cache.get("tasks:a") is None
+    await cache.set("tasks:b", b"body")  # does not raise
+
+
+@pytest.fixture(params=BACKENDS)
+def cache(request, monkeypatch):
+    cache = RecordingCache(make_backend(request.param))
+    monkeypatch.setattr(response_cache, "_response_cache", cache)
+    return cache
+
+
+async def test_list_is_shared_between_callers_with_the_same_scope(cache, client, make_user, make_tasks, auth):
+    manager, other_manager = await make_user("MANAGER"), await make_user("MANAGER")
+    await make_tasks(manager, 3)
+
+    first = await client.get("/tasks/", headers=auth(manager))
+    second = await client.get("/tasks/", headers=auth(other_manager))
+
+    assert cache.lookups == [False, True]
+    assert second.content == first.content
+    assert len(second.json()) == 3
+
+
+async def test_write_bumps_versions_so_the_next_list_misses(cache, client, make_user, auth):
+    manager = await make_user("MANAGER")
+    headers = auth(manager)
+    created = await client.post("/tasks/", json={"title": "First"}, headers=headers)
+    assert created.status_code == 200
+
+    await client.get("/tasks/", headers=headers)
+    await client.get("/tasks/", headers=headers)
+    await client.post("/tasks/", json={"title": "Second"}, headers=headers)
+    response = await client.get("/tasks/", headers=headers)
+
+    assert cache.lookups == [False, True, False]
+    assert [task["title"] for task in response.json()] == ["Second", "First"]
+
+
+async def test_scopes_do_not_share_entries(cache, client, make_user, make_tasks, auth):
+    manager = await make_user("MANAGER")
+    employee, other_employee = await make_user("EMPLOYEE"), await make_user("EMPLOYEE")
+    await make_tasks(manager, 4, assignees=(employee, other_employee))
+
+    listed = {}
+    for user in (manager, employee, other_employee):
+        response = await client.get("/tasks/", params={"status": "TODO"}, headers=auth(user))
+        listed[user.id] = {task["assigned_to"]["id"] for task in response.json()}
+
+    # Same parameters, three scopes: three misses, no entry reused
+    assert cache.lookups == [False, False, False]
+    assert listed[manager.id] == {str(employee.id), str(other_employee.id)}
+    assert listed[employee.id] == {str(employee.id)}
+    assert listed[other_employee.id] == {str(other_employee.id)}
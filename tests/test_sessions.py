@@ -0,0 +1,120 @@
+"""
+Login sessions: refresh token rotation, reuse detection and logout,
+including a logout racing a refresh of the same session.
+"""
+import asyncio
+
+import pytest
+from sqlalchemy import select
+
+from app.core.sessions import revoke_session, rotate_refresh_token
+from app.database import SessionLocal
+from app.models.refresh_token import RefreshToken
+
+pytestmark = pytest.mark.anyio
+
+PASSWORD = "correct horse"
+
+
+@pytest.fixture
+async def login(client, make_user):
+    user = await make_user("EMPLOYEE", password=PASSWORD)
+
+    async def login() -> dict:
+        response = await client.post("/auth/login", json={"email": user.email, "password": PASSWORD})
+        assert response.status_code == 200
+        return response.json()
+
+    return login
+
+
+async def refresh(client, refresh_token: str):
+    return await client.post("/auth/refresh", json={"refresh_token": refresh_token})
+
+
+def bearer(tokens: dict) -> dict:
+    return {"Authorization": f"Bearer {tokens['access_token']}"}
+
+
+async def test_refresh_rotates_the_token(client, login):
+    tokens = await login()
+
+    response = await refresh(client, tokens["refresh_token"])
+    assert response.status_code == 200
+    rotated = response.json()
+    assert rotated["refresh_token"] != tokens["refresh_token"]
+    assert (await client.get("/users/me", headers=bearer(rotated))).status_code == 200
+
+    # The next token in the chain works in turn
+    assert (await refresh(client, rotated["refresh_token"])).status_code == 200
+
+
+async def test_reused_refresh_token_revokes_the_session(client, login):
+    tokens = await login()
+    rotated = (await refresh(client, tokens["refresh_token"])).json()
+
+    reused = await refresh(client, tokens["refresh_token"])
+    assert reused.status_code == 401
+    assert "reuse" in reused.json()["detail"]
+
+    # Whoever holds the latest token is logged out too
+    assert (await refresh(client, rotated["refresh_token"])).status_code == 401
+    assert (await client.get("/users/me", headers=bearer(rotated))).status_code == 401
+
+
+async def test_logout_ends_the_session(client, login):
+    tokens = await login()
+    other = await login()
+
+    response = await client.post("/auth/logout", headers=bearer(tokens))
+    assert response.status_code == 204
+
+    assert (await client.get("/users/me", headers=bearer(tokens))).status_code == 401
+    assert (await refresh(client, tokens["refresh_token"])).status_code == 401
+    # Other sessions of the same user are unaffected
+    assert (await client.get("/users/me", headers=bearer(other))).status_code == 200
+    assert (await refresh(client, other["refresh_token"])).status_code == 200
+
+
+async def test_logout_during_refresh_revokes_the_new_token(client, login):
+    tokens = await login()
+
+    async with SessionLocal() as refreshing, SessionLocal() as logging_out:
+        used, new_token = await rotate_refresh_token(refreshing, tokens["refresh_token"])
+
+        async def logout():
+            await revoke_session(logging_out, used.session_id)
+            await logging_out.commit()
+
+        # Let the logout reach the session's lock before the refresh commits
+        revoking = asyncio.create_task(logout())
+        await asyncio.sleep(0.2)
+        await refreshing.commit()
+        await revoking
+
+    assert (await refresh(client, new_token)).status_code == 401
+
+    async with SessionLocal() as db:
+        live = await db.scalars(
+            select(RefreshToken.token_hash).where(
+                RefreshToken.session_id == used.session_id,
+                RefreshToken.revoked_at.is_(None),
+            )
+        )
+        assert live.all() == []
+
+
+async def test_refresh_of_a_revoked_session_is_rejected(client, login):
+    tokens = await login()
+
+    async with SessionLocal() as logging_out, SessionLocal() as refreshing:
+        used = await logging_out.scalar(
+            select(RefreshToken).where(RefreshToken.revoked_at.is_(None))
+        )
+        await revoke_session(logging_out, used.session_id)
+
+        # Waits for the logout to commit, then sees the session revoked
+        refreshed = asyncio.create_task(refresh(client, tokens["refresh_token"]))
+        await asyncio.sleep(0.2)
+        await logging_out.commit()
+        assert (await refreshed).status_code == 401
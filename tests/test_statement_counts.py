@@ -0,0 +1,93 @@
+"""
+SQL statements per task endpoint call. Each must be a fixed number,
+however many tasks (and assignees) there are: a lazy load per row would
+make it grow with the page.
+"""
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy import event
+
+from app.database import engine
+
+pytestmark = pytest.mark.anyio
+
+# Per call, with the caller's principal already cached. Writes include
+# counters, change versions, tombstones and the change NOTIFY
+EXPECTED_STATEMENTS = {
+    "list": 2,
+    "create": 6,
+    "status": 6,
+    "assign": 8,
+}
+
+
+@contextmanager
+def count_statements():
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+
+
+@pytest.fixture(params=[3, 40], ids=lambda count: f"{count}-tasks")
+async def seeded(request, client, make_user, make_tasks, auth):
+    manager = await make_user("MANAGER")
+    employees = [await make_user("EMPLOYEE") for _ in range(5)]
+    tasks = await make_tasks(manager, request.param, assignees=employees)
+    headers = auth(manager)
+    # Cache the principal: its lookup is per worker, not per request
+    (await client.get("/users/me", headers=headers)).raise_for_status()
+    return headers, employees, tasks
+
+
+async def test_list_tasks(client, seeded):
+    headers, _, tasks = seeded
+    with count_statements() as statements:
+        response = await client.get("/tasks/", params={"limit": 50}, headers=headers)
+    assert response.status_code == 200
+    assert len(response.json()) == len(tasks)
+    assert len(statements) == EXPECTED_STATEMENTS["list"], statements
+
+
+async def test_create_task(client, seeded):
+    headers, employees, _ = seeded
+    with count_statements() as statements:
+        response = await client.post(
+            "/tasks/",
+            json={"title": "New", "assigned_to_id": str(employees[0].id)},
+            headers=headers,
+        )
+    assert response.status_code == 200
+    assert response.json()["assigned_to"]["id"] == str(employees[0].id)
+    assert len(statements) == EXPECTED_STATEMENTS["create"], statements
+
+
+async def test_update_task_status(client, seeded):
+    headers, _, tasks = seeded
+    with count_statements() as statements:
+        response = await client.patch(
+            f"/tasks/{tasks[0].id}/status", json={"status": "IN_PROGRESS"}, headers=headers
+        )
+    assert response.status_code == 200
+    assert response.json()["assigned_to"] is not None
+    assert len(statements) == EXPECTED_STATEMENTS["status"], statements
+
+
+async def test_assign_task(client, seeded):
+    headers, employees, tasks = seeded
+    with count_statements() as statements:
+        response = await client.patch(
+            f"/tasks/{tasks[0].id}/assign",
+            params={"assignee_id": str(employees[-1].id)},
+            headers=headers,
+        )
+    assert response.status_code == 200
+    assert response.json()["assigned_to"]["id"] == str(employees[-1].id)
+    assert len(statements) == EXPECTED_STATEMENTS["assign"], statements
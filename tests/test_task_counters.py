@@ -0,0 +1,97 @@
+"""
+GET /tasks/stats reads the task_counters table, maintained by every
+task write. Concurrent writes to the same tasks must leave the counters
+equal to what the tasks table says.
+"""
+import asyncio
+
+import pytest
+from sqlalchemy import func, select
+
+from app.models.task import Task
+
+pytestmark = pytest.mark.anyio
+
+TASKS = 10
+# Concurrent writers per task
+WRITERS = 4
+
+
+async def create_tasks(client, headers, count: int) -> list[dict]:
+    # Through the API, so the counters include them
+    tasks = []
+    for index in range(count):
+        response = await client.post("/tasks/", json={"title": f"Task {index}"}, headers=headers)
+        assert response.status_code == 200
+        tasks.append(response.json())
+    return tasks
+
+
+async def actual_stats(db) -> dict:
+    rows = await db.execute(select(Task.status, func.count()).group_by(Task.status))
+    by_status = {status.value: count for status, count in rows}
+    total = await db.scalar(select(func.count()).select_from(Task))
+    return {"total": total, "by_status": by_status}
+
+
+async def stored_stats(client, headers) -> dict:
+    response = await client.get("/tasks/stats", headers=headers)
+    assert response.status_code == 200
+    stats = response.json()
+    return {
+        "total": stats["total"],
+        "by_status": {status: count for status, count in stats["by_status"].items() if count},
+    }
+
+
+async def test_parallel_status_updates_keep_counters(client, db, make_user, auth):
+    headers = auth(await make_user("MANAGER"))
+    tasks = await create_tasks(client, headers, TASKS)
+
+    # Each writer reads the same old status; all but one would subtract it
+    # again without the row lock
+    responses = await asyncio.gather(*(
+        client.patch(
+            f"/tasks/{task['id']}/status",
+            json={"status": ("IN_PROGRESS", "DONE")[writer % 2]},
+            headers=headers,
+        )
+        for task in tasks
+        for writer in range(WRITERS)
+    ))
+    assert all(response.status_code == 200 for response in responses)
+
+    assert await stored_stats(client, headers) == await actual_stats(db)
+
+
+async def test_parallel_assign_and_delete_keep_counters(client, db, make_user, auth):
+    headers = auth(await make_user("MANAGER"))
+    employees = [await make_user("EMPLOYEE") for _ in range(WRITERS)]
+    tasks = await create_tasks(client, headers, TASKS)
+
+    requests = [
+        client.patch(
+            f"/tasks/{task['id']}/assign",
+            params={"assignee_id": str(employee.id)},
+            headers=headers,
+        )
+        for task in tasks
+        for employee in employees
+    ]
+    # Deletes race the assignments of the same tasks
+    requests += [client.delete(f"/tasks/{task['id']}", headers=headers) for task in tasks[::2]]
+    responses = await asyncio.gather(*requests)
+    assert all(response.status_code in (200, 204, 404) for response in responses)
+
+    stats = await client.get("/tasks/stats", headers=headers)
+    by_assignee = {
+        key: sum(counts.values()) for key, counts in stats.json()["by_assignee"].items()
+        if sum(counts.values())
+    }
+    rows = await db.execute(
+        select(Task.assigned_to_id, func.count()).group_by(Task.assigned_to_id)
+    )
+    assert by_assignee == {
+        str(assignee_id) if assignee_id else "unassigned": count for assignee_id, count in rows
+    }
+    assert await stored_stats(client, headers) == await actual_stats(db)
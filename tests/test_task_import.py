@@ -0,0 +1,63 @@
+"""
+POST /tasks/import reports undecodable and NUL-carrying rows as per-row
+errors, like any other invalid row, and still imports the rest.
+"""
+import json
+
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+
+async def upload(client, headers, body: bytes, fmt: str) -> dict:
+    response = await client.post("/tasks/import", params={"format": fmt}, content=body, headers=headers)
+    assert response.status_code == 200
+    return response.json()
+
+
+def errors(report: dict) -> dict[int, str]:
+    return {error["row"]: error["error"] for error in report["errors"]}
+
+
+async def test_csv_rows_with_bad_bytes_are_reported(client, make_user, auth):
+    manager = await make_user("MANAGER")
+    body = (
+        b"title,description\r\n"
+        b"First,fine\r\n"
+        b"Second,caf\xe9\r\n"  # Latin-1, not UTF-8
+        b"Third,nul\x00byte\r\n"
+        b'Fourth,"spans\n\xff lines"\r\n'
+        b"Fifth,fine\r\n"
+    )
+
+    report = await upload(client, auth(manager), body, "csv")
+
+    assert report["rows_received"] == 5
+    assert report["rows_imported"] == 2
+    assert errors(report) == {
+        2: "Invalid UTF-8 at byte 11",
+        3: "NUL characters are not allowed",
+        4: "Invalid UTF-8 at byte 1",
+    }
+    listed = await client.get("/tasks/", headers=auth(manager))
+    assert {task["title"] for task in listed.json()} == {"First", "Fifth"}
+
+
+async def test_ndjson_rows_with_bad_bytes_are_reported(client, make_user, auth):
+    manager = await make_user("MANAGER")
+    body = b"\n".join([
+        json.dumps({"title": "First"}).encode(),
+        b'{"title": "caf\xc3"}',  # truncated UTF-8 sequence
+        b'{"title": "raw\x00"}',
+        json.dumps({"title": "escaped\u0000"}).encode(),
+        json.dumps({"title": "Fifth"}).encode(),
+    ])
+
+    report = await upload(client, auth(manager), body, "ndjson")
+
+    assert report["rows_imported"] == 2
+    assert errors(report) == {
+        2: "Invalid UTF-8 at byte 15",
+        3: "NUL characters are not allowed",
+        4: "NUL characters are not allowed",
+    }
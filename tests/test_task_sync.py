@@ -0,0 +1,82 @@
+"""
+Delta sync watermarks must not pass a write that is still uncommitted:
+its updated_at is its transaction's start, so once committed it would
+sort behind a watermark handed out meanwhile and never be synced.
+"""
+import asyncio
+
+import pytest
+from sqlalchemy import func, select
+
+from app.core.config import settings
+from app.core.principals import Principal
+from app.core.task_sync import ORIGIN, UNASSIGNED, read_changes
+from app.database import SessionLocal
+from app.models.task import Task
+
+pytestmark = pytest.mark.anyio
+
+
+async def sync(client, headers, since=None) -> dict:
+    params = {"since": since} if since else {}
+    response = await client.get("/tasks/changes", params=params, headers=headers)
+    assert response.status_code == 200
+    return response.json()
+
+
+async def test_watermark_stays_behind_open_transactions(client, make_user, auth, monkeypatch):
+    # No fixed lag: only the open transaction can hold the watermark back
+    monkeypatch.setattr(settings, "TASK_CHANGES_SAFETY_LAG_SECONDS", 0)
+    manager = await make_user("MANAGER")
+    headers = auth(manager)
+
+    async with SessionLocal() as writer:
+        # Fixes now(), and so the task's updated_at, at this point
+        await writer.execute(select(func.now()))
+        await asyncio.sleep(0.05)
+        first = await sync(client, headers)
+
+        writer.add(Task(title="Slow write", created_by_id=manager.id))
+        await writer.commit()
+
+    second = await sync(client, headers, first["watermark"])
+    assert [task["title"] for task in second["changed"]] == ["Slow write"]
+
+    # And it is not handed out again
+    third = await sync(client, headers, second["watermark"])
+    assert third["changed"] == []
+
+
+class ReassignAfterFeed:
+    """Session stand-in that reassigns a task right after the feed query."""
+
+    def __init__(self, db, task_id, assignee_id):
+        self.db = db
+        self.task_id = task_id
+        self.assignee_id = assignee_id
+
+    async def execute(self, statement, *args, **kwargs):
+        result = await self.db.execute(statement, *args, **kwargs)
+        if "UNION ALL" in str(statement):
+            async with SessionLocal() as other:
+                task = await other.get(Task, self.task_id)
+                task.assigned_to_id = self.assignee_id
+                await other.commit()
+        return result
+
+
+async def test_task_reassigned_during_sync_is_removed(client, db, make_user, make_tasks, monkeypatch):
+    monkeypatch.setattr(settings, "TASK_CHANGES_SAFETY_LAG_SECONDS", 0)
+    manager = await make_user("MANAGER")
+    employee, other = await make_user("EMPLOYEE"), await make_user("EMPLOYEE")
+    kept, moved = await make_tasks(manager, 2, assignees=(employee,))
+    await asyncio.sleep(0.05)
+
+    session = ReassignAfterFeed(db, moved.id, other.id)
+    now = (await db.execute(select(func.now()))).scalar_one()
+    principal = Principal(id=employee.id, role="EMPLOYEE", is_active=True)
+    tasks, removals, _, _ = await read_changes(session, principal, ORIGIN, 10, now)
+
+    # Not the reassigned task's new data, but its removal
+    assert [task.id for task in tasks] == [kept.id]
+    assert [(removal["task_id"], removal["reason"]) for removal in removals] == [(moved.id, UNASSIGNED)]
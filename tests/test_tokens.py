@@ -0,0 +1,113 @@
+"""
+The builtin token verifier must accept and reject exactly the tokens
+python-jose (JWT_BACKEND="jose") does, with the same claims. Every case
+is signed with the right key unless it says otherwise, so each one
+reaches the check it is about.
+"""
+import base64
+import hmac
+import json
+import time
+
+import pytest
+
+from app.core.tokens import BuiltinVerifier, InvalidToken, JoseVerifier
+
+KEY = "parity-secret"
+ALGORITHM = "HS256"
+NOW = int(time.time())
+LATER = NOW + 600
+EARLIER = NOW - 600
+HEADER = {"alg": ALGORITHM, "typ": "JWT"}
+
+
+def b64(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def sign(signing_input: str, key: str = KEY) -> str:
+    return b64(hmac.digest(key.encode("utf-8"), signing_input.encode("utf-8"), "sha256"))
+
+
+def token(claims=None, header=HEADER, payload: str | None = None, key: str = KEY) -> str:
+    if payload is None:
+        payload = json.dumps({"sub": "user-1", "exp": LATER} if claims is None else claims)
+    signing_input = f"{b64(json.dumps(header).encode())}.{b64(payload.encode())}"
+    return f"{signing_input}.{sign(signing_input, key)}"
+
+
+VALID = token()
+HEADER_SEGMENT, PAYLOAD_SEGMENT, SIGNATURE = VALID.split(".")
+
+
+def signed(signing_input: str) -> str:
+    return f"{signing_input}.{sign(signing_input)}"
+
+
+# (id, token, accepted)
+CASES = [
+    ("valid", VALID, True),
+    # exp
+    ("no-exp", token({"sub": "user-1"}), True),
+    ("expired", token({"sub": "user-1", "exp": EARLIER}), False),
+    ("exp-float", token({"exp": LATER + 0.5}), True),
+    ("exp-numeric-string", token({"exp": str(LATER)}), True),
+    ("exp-string", token({"exp": "tomorrow"}), False),
+    ("exp-null", token({"exp": None}), False),
+    ("exp-true", token({"exp": True}), False),
+    ("exp-nan", token(payload='{"exp": NaN}'), False),
+    ("exp-infinity", token(payload='{"exp": Infinity}'), False),
+    # nbf / iat
+    ("nbf-past", token({"nbf": EARLIER, "exp": LATER}), True),
+    ("nbf-future", token({"nbf": LATER, "exp": LATER}), False),
+    ("nbf-string", token({"nbf": "now"}), False),
+    ("iat-numeric-string", token({"iat": str(NOW)}), True),
+    ("iat-string", token({"iat": "now"}), False),
+    # Other registered claims
+    ("aud", token({"aud": "flowtrack", "exp": LATER}), False),
+    ("sub-not-string", token({"sub": 1}), False),
+    ("jti-not-string", token({"jti": 1}), False),
+    ("at-hash", token({"at_hash": "x"}), False),
+    ("big-int-claim", token(payload='{"n": 100000000000000000000000}'), True),
+    # Payload
+    ("payload-not-object", token(payload="[1]"), False),
+    ("payload-not-json", token(payload="{"), False),
+    ("payload-empty", token(payload=""), False),
+    # Header / signature
+    ("wrong-key", token(key="other-secret"), False),
+    ("alg-none", f"{b64(json.dumps({'alg': 'none'}).encode())}.{PAYLOAD_SEGMENT}.", False),
+    ("alg-none-signed", token(header={"alg": "none"}), False),
+    ("alg-other", token(header={"alg": "HS512"}), False),
+    ("alg-missing", token(header={"typ": "JWT"}), False),
+    ("header-not-object", token(header=["HS256"]), False),
+    ("signature-empty", f"{HEADER_SEGMENT}.{PAYLOAD_SEGMENT}.", False),
+    ("signature-truncated", VALID[:-2], False),
+    # Segment count
+    ("one-segment", HEADER_SEGMENT, False),
+    ("two-segments", f"{HEADER_SEGMENT}.{PAYLOAD_SEGMENT}", False),
+    ("four-segments-signed", signed(f"{HEADER_SEGMENT}.{PAYLOAD_SEGMENT}.{PAYLOAD_SEGMENT}"), False),
+    ("four-segments", f"{VALID}.{SIGNATURE}", False),
+    ("empty-header", f".{PAYLOAD_SEGMENT}.{SIGNATURE}", False),
+    # Base64 padding and alphabet: skipped, as python-jose does
+    ("padding-appended", VALID + "==", True),
+    ("padding-in-header", signed(f"{HEADER_SEGMENT}==.{PAYLOAD_SEGMENT}"), True),
+    ("trailing-non-ascii", VALID + "é", True),
+    ("non-base64-in-signature", f"{HEADER_SEGMENT}.{PAYLOAD_SEGMENT}.!{SIGNATURE}", False),
+    ("non-base64-pair-in-signature", f"{HEADER_SEGMENT}.{PAYLOAD_SEGMENT}.!!{SIGNATURE}", True),
+    ("extra-base64-char", VALID + "A", False),
+]
+
+
+def outcome(verifier, raw_token: str):
+    try:
+        return verifier.decode(raw_token)
+    except InvalidToken:
+        return None
+
+
+@pytest.mark.parametrize("raw_token, accepted", [case[1:] for case in CASES], ids=[case[0] for case in CASES])
+def test_builtin_matches_jose(raw_token, accepted):
+    builtin = outcome(BuiltinVerifier(KEY, ALGORITHM), raw_token)
+    jose = outcome(JoseVerifier(KEY, ALGORITHM), raw_token)
+    assert builtin == jose
+    assert (builtin is not None) is accepted